@@ -7,7 +7,8 @@ import copy
 import math
 import warnings
 from math import pi
-from typing import Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple, Union
 import logging
 
 import matplotlib.pyplot as plt
@@ -15,11 +16,14 @@ import numpy as np
 import pygfunction as gt
 
 from numpy.typing import ArrayLike
-from scipy.signal import convolve
+from scipy.interpolate import PchipInterpolator
+from scipy.signal import convolve, oaconvolve
 
 from GHEtool.VariableClasses import FluidData, Borehole, GroundConstantTemperature, ResultsMonthly, ResultsHourly
 from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction, GFunction, CalculationSetup, Cluster, \
-    EERCombined
+    EERCombined, ConvolutionKernel, ConvolutionKernelCache, ResponseOperator, SizingCache, stable_hash, \
+    borefield_fingerprint
+from GHEtool.VariableClasses.CustomGFunction import _time_values
 from GHEtool.VariableClasses.LoadData import *
 from GHEtool.VariableClasses.LoadData import _LoadData, _LoadDataBuilding
 from GHEtool.VariableClasses.PipeData import _PipeData
@@ -34,6 +38,8 @@ class Borefield(BaseClass):
 
     UPM: float = 730.0  # number of hours per month
     THRESHOLD_BOREHOLE_LENGTH: float = 0.05  # threshold for iteration
+    # minimal relative difference between the L2 sizings for the prediction of the limiting quadrant
+    THRESHOLD_LIMITING_QUADRANT: float = 0.1
 
     # define default values
     DEFAULT_INVESTMENT: list = [35, 0]  # 35 EUR/m
@@ -110,15 +116,32 @@ class Borefield(BaseClass):
                 'Please use the load classes.')
 
         self.limiting_quadrant: int = 0  # parameter that tells in which quadrant the field is limited
+        # number of temperature calculations needed for the building load to converge in the last temperature profile
+        self.nb_of_iterations_building_load: int = 0
+        # number of temperature calculations in the last L3 or L4 sizing, including the L3 sizing of a cascaded sizing
+        self.nb_of_temperature_evaluations: int = 0
+        # number of temperature calculations in the L3 sizing of the last cascaded sizing
+        self.nb_of_cascaded_temperature_evaluations: int = 0
         # m hereafter one needs to chance to fewer boreholes with more depth, because the calculations are no longer
         # that accurate.
         self.THRESHOLD_WARNING_SHALLOW_FIELD: int = 50
 
         self.custom_gfunction: CustomGFunction = custom_gfunction
         self.gfunction_calculation_object: GFunction = GFunction()
+        self._borefield_fingerprint: str = None
+        self._convolution_kernels: ConvolutionKernelCache = ConvolutionKernelCache()
+        # borehole lengths and limiting quadrants of previous sizings (see sizing_cache in CalculationSetup),
+        # which can be replaced by a cache that is shared with other borefields
+        self.sizing_cache: SizingCache = SizingCache()
+        self._response_operator: ResponseOperator = None
+        # time grid on which the g-functions of the monthly temperature calculation are calculated, if not None
+        self._gfunction_time_grid: np.ndarray = None
+        # initial borehole lengths per quadrant for the L4 sizing, calculated with the L3 method in a cascaded sizing
+        self._cascaded_lengths: dict = {}
+        self._cascaded_quadrant: int = 0
 
         # initialize variables for temperature plotting
-        self.results: ResultsMonthly | ResultsHourly = ResultsMonthly()
+        self._results: ResultsMonthly | ResultsHourly = ResultsMonthly()
 
         # initiate ground parameters
         self._H = 0.0  # borehole length [m]
@@ -221,6 +244,51 @@ class Borefield(BaseClass):
             return borehole_length + buried_depth
         return np.average([bor.H * math.cos(bor.tilt) for bor in self.borefield]) + buried_depth
 
+    @property
+    def results(self) -> Union[ResultsMonthly, ResultsHourly]:
+        """
+        This function returns the calculated temperatures.
+
+        Returns
+        -------
+        ResultsMonthly or ResultsHourly
+            Calculated temperatures
+        """
+        return self._results
+
+    @results.setter
+    def results(self, results: Union[ResultsMonthly, ResultsHourly]) -> None:
+        """
+        This function sets the calculated temperatures.
+
+        Parameters
+        ----------
+        results : ResultsMonthly or ResultsHourly
+            Calculated temperatures
+
+        Returns
+        -------
+        None
+        """
+        self._results = results
+
+    def _store_results(self) -> None:
+        """
+        This function stores the calculated temperatures with the data type and in the (memory-mapped) way that is
+        set in the calculation setup. This is done once, after the sizing or temperature calculation is finished,
+        on a copy of the results, so results objects that are used elsewhere are not changed.
+
+        Returns
+        -------
+        None
+        """
+        setup = self._calculation_setup
+        if setup.results_dtype == np.float64 and not setup.results_memory_map:
+            return
+        results = copy.deepcopy(self._results)
+        results.change_storage(setup.results_dtype, setup.results_memory_map, setup.results_folder)
+        self._results = results
+
     @property
     def H(self) -> float:
         """
@@ -441,6 +509,8 @@ class Borefield(BaseClass):
     def borefield(self, borefield: list[gt.boreholes.Borehole] = None) -> None:
         """
         This function sets the borefield configuration. When no input is given, the borefield variable will be deleted.
+        The fingerprint of the geometry of the borefield is calculated here, so the borefield should be set again
+        when the position, buried depth, radius, tilt or orientation of its boreholes is changed afterwards.
 
         Parameters
         ----------
@@ -455,13 +525,15 @@ class Borefield(BaseClass):
             del self.borefield
             return
         self._borefield = borefield
+        self._borefield_fingerprint = borefield_fingerprint(borefield)
         self.D = np.average([bor.D for bor in borefield])
         self.r_b = np.average([bor.r_b for bor in borefield])
         self._H = np.average([bor.H for bor in borefield])
         self.avg_tilt = np.average([bor.tilt for bor in borefield])
         if not np.isclose(self.avg_tilt, 0):
             self.gfunction_calculation_object.options['method'] = 'similarities'
-        self.gfunction_calculation_object.remove_previous_data()
+        self._remove_previous_gfunction_data()
+        self._convolution_kernels.clear()
         unequal_length = np.any([bor.H != borefield[0].H for bor in borefield])
         if unequal_length:
             self.gfunction_calculation_object._store_previous_values = not unequal_length
@@ -480,9 +552,42 @@ class Borefield(BaseClass):
         None
         """
         self._borefield = None
-        self.gfunction_calculation_object.remove_previous_data()
+        self._borefield_fingerprint = None
+        self._remove_previous_gfunction_data()
+        self._convolution_kernels.clear()
         self.custom_gfunction = None
 
+    def _remove_previous_gfunction_data(self) -> None:
+        """
+        This function removes the previously calculated g-values, so the g-values of a new borefield or ground are
+        calculated from scratch and the result of a sizing does not depend on previous calculations.
+        When keep_gfunction_data is True in the calculation setup, these g-values are stored instead, so they are
+        used again when the g-function of the previous borefield or ground is needed later on.
+
+        Returns
+        -------
+        None
+        """
+        if self._calculation_setup.keep_gfunction_data:
+            self.gfunction_calculation_object.store_previous_data()
+        else:
+            self.gfunction_calculation_object.remove_previous_data()
+
+    @property
+    def borefield_fingerprint(self) -> str:
+        """
+        This function returns the fingerprint of the geometry of the borefield, i.e. a hash of the position, buried
+        depth, radius, tilt and orientation of all the boreholes. The borehole length is not taken into account.
+        Borefields with the same fingerprint have the same g-function for a given borehole length and ground, so it is
+        used to identify the borefield in the g-function calculations.
+
+        Returns
+        -------
+        str
+            Fingerprint of the borefield (None if there is no borefield)
+        """
+        return self._borefield_fingerprint
+
     def load_custom_gfunction(self, location: str) -> None:
         """
         This function loads the custom gfunction.
@@ -649,7 +754,8 @@ class Borefield(BaseClass):
         self.custom_gfunction = None
 
         # the stored gfunction data should be deleted
-        self.gfunction_calculation_object.remove_previous_data()
+        self._remove_previous_gfunction_data()
+        self._convolution_kernels.clear()
 
     def set_ground_parameters(self, data: _GroundData) -> None:
         """
@@ -1038,13 +1144,42 @@ class Borefield(BaseClass):
         if not use_constant_Rb is None:
             self.borehole.use_constant_Rb = use_constant_Rb
 
-        # sizes according to the correct algorithm
-        if self._calculation_setup.L2_sizing:
-            length = self.size_L2(H_init, self._calculation_setup.quadrant_sizing)
-        if self._calculation_setup.L3_sizing:
-            length = self.size_L3(H_init, self._calculation_setup.quadrant_sizing)
-        if self._calculation_setup.L4_sizing:
-            length = self.size_L4(H_init, self._calculation_setup.quadrant_sizing)
+        key = self.sizing_hash if self._calculation_setup.sizing_cache else None
+        entry = self.sizing_cache.get(key) if key is not None else None
+        if entry is not None:
+            # the same sizing is done before
+            length, self.limiting_quadrant = entry
+            self.H = length
+            self.nb_of_temperature_evaluations = 0
+            self.nb_of_cascaded_temperature_evaluations = 0
+            if not self._calculation_setup.L2_sizing:
+                # only the borehole length is stored, so the temperatures (and the results of a building load)
+                # are calculated for this borehole length
+                self._calculate_temperature_profile(length, hourly=self._calculation_setup.L4_sizing)
+                self.nb_of_temperature_evaluations = 1
+        else:
+            self.nb_of_cascaded_temperature_evaluations = 0
+            # sizes according to the correct algorithm
+            if self._calculation_setup.L2_sizing:
+                length = self.size_L2(H_init, self._calculation_setup.quadrant_sizing)
+            if self._calculation_setup.L3_sizing:
+                length = self.size_L3(H_init, self._calculation_setup.quadrant_sizing)
+            if self._calculation_setup.L4_sizing:
+                if self._calculation_setup.cascaded_sizing and self.load._hourly:
+                    # start from the borehole lengths of the cheaper L3 sizing
+                    self._cascaded_sizing(H_init)
+                    self.nb_of_cascaded_temperature_evaluations = self.nb_of_temperature_evaluations
+                try:
+                    length = self.size_L4(H_init, self._calculation_setup.quadrant_sizing)
+                finally:
+                    self._cascaded_lengths = {}
+                    self._cascaded_quadrant = 0
+                # the evaluations of the L3 sizing are part of the cost of the cascaded sizing
+                self.nb_of_temperature_evaluations += self.nb_of_cascaded_temperature_evaluations
+            if key is not None:
+                self.sizing_cache.add(key, (length, self.limiting_quadrant))
+
+        self._store_results()
 
         # reset initial parameters
         self._calculation_setup.restore_backup()
@@ -1061,6 +1196,69 @@ class Borefield(BaseClass):
 
         return length
 
+    @property
+    def sizing_hash(self) -> str:
+        """
+        This function returns a hash of all the inputs of the sizing: the borefield geometry (without the borehole
+        length), the ground data, the pipe and fluid data, the load, the temperature limits, the options of the
+        calculation setup that can influence the result and the g-function settings. This hash is the key of the sizing
+        cache, so it can be used to invalidate the stored result of this borefield with
+        borefield.sizing_cache.invalidate(borefield.sizing_hash). Note that the options
+        that are given to the size function itself, are not part of the current calculation setup.
+
+        Returns
+        -------
+        str
+            Hash of the inputs of the sizing
+        """
+        gfunction = self.gfunction_calculation_object
+        return stable_hash(self._borefield_fingerprint, self.ground_data, self.borehole, self.load, self.Tf_max,
+                           self.Tf_min, self._calculation_setup._options_with_influence(), self.custom_gfunction,
+                           gfunction.options, gfunction.use_cyl_correction_when_negative, gfunction.no_extrapolation)
+
+    def _cascaded_sizing(self, H_init: float = None) -> None:
+        """
+        This function calculates the initial borehole lengths for the L4 sizing with the cheaper L3 method.
+        The L3 sizing is done for the same quadrants as the L4 sizing, so that every quadrant of the L4 sizing can start
+        from the length of the same quadrant in the L3 sizing. During this L3 sizing, the g-functions are calculated on
+        the time grid of the L4 sizing, so that the g-function store contains these borehole lengths when the L4
+        sizing starts. When the L3 method cannot size a quadrant, the L4 sizing of this quadrant starts from the
+        default initial length. When the L3 sizing is clearly limited by the minimum temperature (i.e. the lengths
+        for both temperature limits differ more than THRESHOLD_LIMITING_QUADRANT (relative)), the L4 sizing starts with
+        the minimum temperature as well (see _size_predicted_min_temperature). The number of temperature evaluations
+        of this L3 sizing is stored in nb_of_temperature_evaluations.
+
+        Parameters
+        ----------
+        H_init : float
+            Initial borehole length for the L3 sizing [m]. If None, the default H_init is chosen.
+
+        Returns
+        -------
+        None
+        """
+        self._cascaded_lengths = {}
+        self._cascaded_quadrant = 0
+        self.nb_of_temperature_evaluations = 0
+        self.H = H_init if H_init is not None else self._calculation_setup.H_init
+        quadrant_sizing = self._calculation_setup.quadrant_sizing
+        quadrants = [quadrant_sizing] if quadrant_sizing != 0 else [10, 20]
+        self._gfunction_time_grid = _time_values(t_max=self.load.time_L4[-1])
+        try:
+            for quadrant in quadrants:
+                length, sized = self._size_based_on_temperature_profile(quadrant)
+                if length > 0:
+                    self._cascaded_lengths[quadrant] = length
+                if sized:
+                    if quadrant == 10 or length - self._cascaded_lengths.get(10, 0) > \
+                            self.THRESHOLD_LIMITING_QUADRANT * length:
+                        self._cascaded_quadrant = quadrant
+                    break
+        except (UnsolvableDueToTemperatureGradient, MaximumNumberOfIterations):
+            pass
+        finally:
+            self._gfunction_time_grid = None
+
     def _select_size(self, size_max_temp: float, size_min_temp: float, hourly: bool = False) -> float:
         """
         This function selects the correct size based on a size for the minimum and maximum temperature.
@@ -1098,7 +1296,7 @@ class Borefield(BaseClass):
 
         # check if sizing by the minimum temperature (quadrant 3/4) does not cross the temperature boundary
         self.calculate_temperatures(size_min_temp, hourly=hourly)
-        if np.max(self.results.peak_injection) <= self.Tf_max:
+        if self.results.max_peak_injection <= self.Tf_max:
             return size_min_temp
         raise UnsolvableDueToTemperatureGradient
 
@@ -1140,21 +1338,27 @@ class Borefield(BaseClass):
         # initiate with a given length
         self.H: float = H_init if H_init is not None else self._calculation_setup.H_init
 
-        def size_quadrant1():
-            th, _, tcm, qh, qpm, qm = self.load._calculate_first_year_params(False)  # calculate parameters
-            return self._Carcel(th, tcm, qh, qpm, qm, self.Tf_max)  # size
+        def size_quadrant1(borefield: Borefield = self):
+            th, _, tcm, qh, qpm, qm = borefield.load._calculate_first_year_params(False)  # calculate parameters
+            return borefield._Carcel(th, tcm, qh, qpm, qm, borefield.Tf_max)  # size
 
-        def size_quadrant2():
-            th, qh, qm, qa = self.load._calculate_last_year_params(False)  # calculate parameters
-            return self._Ahmadfard(th, qh, qm, qa, self.Tf_max)  # size
+        def size_quadrant2(borefield: Borefield = self):
+            th, qh, qm, qa = borefield.load._calculate_last_year_params(False)  # calculate parameters
+            return borefield._Ahmadfard(th, qh, qm, qa, borefield.Tf_max)  # size
 
-        def size_quadrant3():
-            th, _, tcm, qh, qpm, qm = self.load._calculate_first_year_params(True)  # calculate parameters
-            return self._Carcel(th, tcm, qh, qpm, qm, self.Tf_min)  # size
+        def size_quadrant3(borefield: Borefield = self):
+            th, _, tcm, qh, qpm, qm = borefield.load._calculate_first_year_params(True)  # calculate parameters
+            return borefield._Carcel(th, tcm, qh, qpm, qm, borefield.Tf_min)  # size
 
-        def size_quadrant4():
-            th, qh, qm, qa = self.load._calculate_last_year_params(True)  # calculate parameters
-            return self._Ahmadfard(th, qh, qm, qa, self.Tf_min)  # size
+        def size_quadrant4(borefield: Borefield = self):
+            th, qh, qm, qa = borefield.load._calculate_last_year_params(True)  # calculate parameters
+            return borefield._Ahmadfard(th, qh, qm, qa, borefield.Tf_min)  # size
+
+        def size_quadrants(size_max_temp: Callable, size_min_temp: Callable) -> Tuple[float, float]:
+            if not self._calculation_setup.parallel_quadrants:
+                return size_max_temp(), size_min_temp()
+            (max_temp, _), (min_temp, _) = self._size_concurrently(size_max_temp, size_min_temp)
+            return max_temp.result(), min_temp.result()
 
         if quadrant_sizing != 0:
             # size according to a specific quadrant
@@ -1172,11 +1376,8 @@ class Borefield(BaseClass):
             # determine which quadrants are relevant
             if self.load.imbalance <= 0:
                 # extraction dominated, so quadrants 1 and 4 are relevant
-                if self.load.max_peak_injection != 0:
-                    quadrant1 = size_quadrant1()
-                else:
-                    quadrant1 = 0
-                quadrant4 = size_quadrant4()
+                quadrant1, quadrant4 = size_quadrants(
+                    size_quadrant1 if self.load.max_peak_injection != 0 else lambda borefield=self: 0, size_quadrant4)
 
                 self.H = self._select_size(quadrant1, quadrant4)
 
@@ -1186,11 +1387,8 @@ class Borefield(BaseClass):
                     self.limiting_quadrant = 4
             else:
                 # injection dominated, so quadrants 2 and 3 are relevant
-                quadrant2 = size_quadrant2()
-                if self.load.max_peak_extraction != 0:
-                    quadrant3 = size_quadrant3()
-                else:
-                    quadrant3 = 0
+                quadrant2, quadrant3 = size_quadrants(
+                    size_quadrant2, size_quadrant3 if self.load.max_peak_extraction != 0 else lambda borefield=self: 0)
 
                 self.H = self._select_size(quadrant2, quadrant3)
 
@@ -1201,6 +1399,246 @@ class Borefield(BaseClass):
 
         return self.H
 
+    def size_L2_vectorized(self, k_s: ArrayLike = None, Tg: ArrayLike = None, Rb: ArrayLike = None,
+                           load_factor: ArrayLike = None, H_init: float = None,
+                           quadrant_sizing: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This function sizes the borefield with the L2 method (cf. size_L2) for many samples of the ground thermal
+        conductivity, the ground temperature, the equivalent borehole thermal resistance and the load at once, e.g. for
+        a Monte Carlo study. The samples are broadcast against each other and all of them are iterated in lockstep.
+        The g-function values are interpolated in a table with the g-functions at a geometric grid of borehole lengths
+        (with a ratio of 1.1 between consecutive lengths), so the number of g-function calculations does not depend on
+        the number of samples. Without samples of the ground thermal conductivity, the g-functions of the table are
+        calculated at the same three time values as in size_L2, so the borehole lengths only differ due to the
+        interpolation between the borehole lengths of the table.
+        The g-function of a sample with another ground thermal conductivity is taken at the time for which the
+        product of the ground thermal diffusivity and the time is the same. These g-functions are interpolated on a
+        finer time grid around the three time values. Since the g-functions of pygfunction depend on the time grid
+        for which they are calculated, the borehole lengths can differ slightly (< 1%) from the ones of size_L2.
+        The table needs about 20 g-function calculations per quadrant (see gfunction), which are most of the
+        calculation time when there are no stored g-values yet.
+        With a temperature gradient, it is checked with the L2 method whether the sizing for the minimum temperature
+        does not cross the maximum temperature limit. Samples for which no borehole length can be found
+        get a borehole length of NaN.
+
+        Parameters
+        ----------
+        k_s : np.ndarray
+            Ground thermal conductivity per sample [W/mK]. If None, the conductivity of the ground data is used.
+        Tg : np.ndarray
+            Ground temperature at the surface per sample [°C]. A temperature gradient of the ground data is kept.
+            If None, the temperature of the ground data is used.
+        Rb : np.ndarray
+            Equivalent borehole thermal resistance per sample [mK/W]. If None, the resistance of the borehole is used.
+        load_factor : np.ndarray
+            Factor with which the load is multiplied per sample [-]. If None, the load is not changed.
+        H_init : float
+            Initial length from where to start the iteration [m]
+        quadrant_sizing : int
+            If a quadrant is given the sizing is performed for this quadrant else for the relevant
+
+        Returns
+        -------
+        Borehole lengths : np.ndarray
+            Required borehole length per sample [m]
+        Limiting quadrants : np.ndarray
+            Limiting quadrant per sample
+
+        Raises
+        ------
+        ValueError
+            ValueError when no ground data is provided, the quadrant is not in range or the load is a building load.
+        """
+        # check ground data
+        if not self.ground_data.check_values():
+            raise ValueError("Please provide ground data.")
+        # check quadrants
+        if not quadrant_sizing in range(0, 5):
+            raise ValueError(f"Quadrant {quadrant_sizing} does not exist.")
+        if isinstance(self.load, _LoadDataBuilding):
+            raise ValueError('The L2 method does not work with building load data.')
+
+        samples = {name: np.asarray(value, dtype=np.float64) for name, value in
+                   (('k_s', k_s), ('Tg', Tg), ('Rb', Rb), ('load_factor', load_factor)) if value is not None}
+        shape = np.broadcast(*samples.values()).shape if samples else ()
+        samples = {name: np.broadcast_to(value, shape).ravel() for name, value in samples.items()}
+        nb_of_samples = int(np.prod(shape))
+        load_factor = samples.get('load_factor', np.ones(nb_of_samples))
+
+        # g-function times, loads (peak, monthly and long term load) and temperature limit per quadrant
+        def parameters(quadrant: int) -> tuple:
+            if quadrant in (1, 3):
+                th, _, tcm, qh, qpm, qm = self.load._calculate_first_year_params(quadrant == 3)
+                times, long_term_load = [th, th + self.load.tm, tcm + th], qpm
+            else:
+                th, qh, qm, qa = self.load._calculate_last_year_params(quadrant == 4)
+                times, long_term_load = [th, th + self.load.tm, self.load.ty + self.load.tm + th], qa
+            return np.array(times), (qh, qm, long_term_load), self.Tf_max if quadrant in (1, 2) else self.Tf_min
+
+        # relevant quadrants, with the quadrant for the maximum temperature first
+        if quadrant_sizing != 0:
+            quadrants = (quadrant_sizing,)
+        elif self.load.imbalance <= 0:
+            quadrants = (1, 4)
+        else:
+            quadrants = (2, 3)
+
+        if 'k_s' in samples:
+            k_layers = [layer.k_s for layer in self.ground_data.layers]
+            scale = np.array([np.min(samples['k_s']) / max(k_layers), np.max(samples['k_s']) / min(k_layers)])
+            nb_of_times = max(2, int(np.ceil(np.log(scale[1] / scale[0]) / np.log(1.25))) + 1)
+            k_s_grid = np.unique([np.min(samples['k_s']), np.max(samples['k_s'])])
+
+        def time_grid(quadrant: int) -> np.ndarray:
+            # time grid of the table, on which the time of a sample is scaled with the ratio between its conductivity
+            # and the conductivity of the ground data
+            times = np.unique(parameters(quadrant)[0])
+            if 'k_s' not in samples:
+                # the same times as in size_L2
+                return times
+            # geometric grid around every time of the L2 method with a ratio of at most 1.25 between consecutive times
+            return np.unique(np.concatenate([np.geomspace(*(time * scale), nb_of_times) for time in times]))
+
+        # geometric grid of borehole lengths with per length the ground conductivity, the difference of the ground
+        # temperature with the surface temperature and the borehole thermal resistance
+        ratio = 1.1
+        nodes = {}
+        # g-values per quadrant and length, since the g-values of pygfunction depend on the whole time grid
+        tables = {}
+
+        def node(index: int) -> tuple:
+            if index not in nodes:
+                length = ratio ** index
+                depth = self.calculate_depth(length, self.D)
+                k_ground = self.ground_data.k_s(depth, self.D)
+                if 'Rb' in samples or self.borehole.use_constant_Rb:
+                    resistances = np.zeros(1)
+                else:
+                    resistances = np.array([self.borehole.calculate_Rb(length, self.D, self.r_b, k) for k in
+                                            (k_s_grid if 'k_s' in samples else [k_ground])])
+                nodes[index] = k_ground, self._Tg(length) - self.ground_data.Tg, resistances
+            return nodes[index]
+
+        def table(quadrant: int, index: int) -> PchipInterpolator:
+            if (quadrant, index) not in tables:
+                times = time_grid(quadrant)
+                # the g-values of the table are calculated and not interpolated between previous borehole lengths
+                interpolate_gfunctions = self._calculation_setup.interpolate_gfunctions
+                self._calculation_setup.interpolate_gfunctions = False
+                try:
+                    gvalues = self.gfunction(times, ratio ** index)
+                finally:
+                    self._calculation_setup.interpolate_gfunctions = interpolate_gfunctions
+                tables[(quadrant, index)] = PchipInterpolator(np.log(times), gvalues)
+            return tables[(quadrant, index)]
+
+        def interpolate(interpolators: list, rows: np.ndarray, time: np.ndarray) -> np.ndarray:
+            # monotone cubic interpolation in the logarithm of time in the given rows of the table
+            log_time = np.log(time)
+            gvalues = np.empty(log_time.shape)
+            for row in np.unique(rows):
+                gvalues[rows == row] = interpolators[row](log_time[rows == row])
+            return gvalues
+
+        def evaluate(quadrant: int, length: np.ndarray, selection: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            # returns the total borehole length times the temperature difference and the ground temperature
+            times, (qh, qm, long_term_load), _ = parameters(quadrant)
+            position = np.log(length) / np.log(ratio)
+            lower = np.floor(position).astype(int)
+            weight = position - lower
+            indices = np.unique(np.concatenate((lower, lower + 1)))
+            rows = [node(index) for index in indices]
+            interpolators = [table(quadrant, index) for index in indices]
+            k_ground = np.array([row[0] for row in rows])
+            delta_Tg = np.array([row[1] for row in rows])
+            resistances = np.array([row[2] for row in rows])
+            lower = np.searchsorted(indices, lower)
+            upper = lower + 1
+
+            def between_nodes(values: np.ndarray) -> np.ndarray:
+                if values.ndim == 1:
+                    return values[lower] * (1 - weight) + values[upper] * weight
+                return values[lower] * (1 - weight)[:, None] + values[upper] * weight[:, None]
+
+            k_sample = samples['k_s'][selection] if 'k_s' in samples else between_nodes(k_ground)
+            # times at which the g-function of the ground data has the same value as the g-function of the sample
+            scale_lower = k_sample / k_ground[lower] if 'k_s' in samples else np.ones(len(length))
+            scale_upper = k_sample / k_ground[upper] if 'k_s' in samples else np.ones(len(length))
+            gvalue = interpolate(interpolators, lower, times * scale_lower[:, None]) * (1 - weight)[:, None] + \
+                     interpolate(interpolators, upper, times * scale_upper[:, None]) * weight[:, None]
+
+            if 'Rb' in samples:
+                Rb_sample = samples['Rb'][selection]
+            elif self.borehole.use_constant_Rb:
+                Rb_sample = np.full(len(length), self.borehole.Rb)
+            elif 'k_s' in samples and len(k_s_grid) > 1:
+                Rb_grid = between_nodes(resistances)
+                fraction = (k_sample - k_s_grid[0]) / (k_s_grid[1] - k_s_grid[0])
+                Rb_sample = Rb_grid[:, 0] * (1 - fraction) + Rb_grid[:, 1] * fraction
+            else:
+                Rb_sample = between_nodes(resistances[:, 0])
+
+            Tg_sample = samples.get('Tg', self.ground_data.Tg)
+            Tg_sample = (Tg_sample[selection] if 'Tg' in samples else Tg_sample) + between_nodes(delta_Tg)
+            numerator = load_factor[selection] * (qh * Rb_sample + (
+                    qh * gvalue[:, 0] + qm * (gvalue[:, 1] - gvalue[:, 0]) + long_term_load * (
+                    gvalue[:, 2] - gvalue[:, 1])) / (2 * pi * k_sample))
+            return numerator, Tg_sample
+
+        def size_quadrant(quadrant: int) -> np.ndarray:
+            if (quadrant == 1 and self.load.max_peak_injection == 0) or \
+                    (quadrant == 3 and self.load.max_peak_extraction == 0):
+                return np.zeros(nb_of_samples)
+            Tf = parameters(quadrant)[2]
+            length = np.full(nb_of_samples, H_init if H_init is not None else self._calculation_setup.H_init,
+                             dtype=np.float64)
+            length[length < 1] = 50
+            length_prev = np.zeros(nb_of_samples)
+            active = np.arange(nb_of_samples)
+            i = 0
+            while active.size:
+                if i > self._calculation_setup.max_nb_of_iterations:
+                    length[active] = np.nan
+                    break
+                numerator, Tg_sample = evaluate(quadrant, np.maximum(1, length[active]), active)
+                length_prev[active] = length[active]
+                # a negative length when the temperature limit is at the wrong side of the ground temperature
+                temperature_difference = Tf - Tg_sample if quadrant in (1, 2) else Tg_sample - Tf
+                length[active] = numerator / temperature_difference / self.number_of_boreholes
+                i += 1
+                # same convergence criteria as _check_convergence
+                difference = np.abs(length[active] - length_prev[active])
+                converged = np.ones(active.size, dtype=bool)
+                if self._calculation_setup.atol != False:
+                    converged &= difference <= self._calculation_setup.atol
+                if self._calculation_setup.rtol != False:
+                    converged &= difference / length_prev[active] <= self._calculation_setup.rtol
+                invalid = ~np.isfinite(length[active]) | (length[active] <= 0)
+                if self.ground_data.variable_Tg:
+                    invalid |= length[active] > Borefield.THRESHOLD_DEPTH_ERROR
+                length[active[invalid]] = np.nan
+                active = active[~(converged | invalid)]
+            return length
+
+        backup = self.H
+        try:
+            sizes = [size_quadrant(quadrant) for quadrant in quadrants]
+            if len(quadrants) == 1:
+                return sizes[0].reshape(shape), np.full(shape, quadrants[0])
+            size_max_temp, size_min_temp = sizes
+            lengths = np.maximum(size_max_temp, size_min_temp)
+            limiting_quadrants = np.where(size_max_temp == lengths, quadrants[0], quadrants[1])
+            if self.ground_data.variable_Tg:
+                # check if the sizing for the minimum temperature does not cross the maximum temperature limit
+                selection = np.flatnonzero(size_min_temp > size_max_temp)
+                if selection.size:
+                    numerator, Tg_sample = evaluate(quadrants[0], size_min_temp[selection], selection)
+                    temperature = Tg_sample + numerator / (self.number_of_boreholes * size_min_temp[selection])
+                    lengths[selection[temperature > self.Tf_max]] = np.nan
+            return lengths.reshape(shape), limiting_quadrants.reshape(shape)
+        finally:
+            self.H = backup
+
     def size_L3(self, H_init: float = None, quadrant_sizing: int = 0) -> float:
         """
         This function sizes the borefield based on a monthly (L3) method.
@@ -1233,21 +1671,22 @@ class Borefield(BaseClass):
 
         # initiate with a given borehole length
         self.H: float = H_init if H_init is not None else self._calculation_setup.H_init
+        self.nb_of_temperature_evaluations = 0
 
         if quadrant_sizing != 0:
             # size according to a specific quadrant
             self.H, _ = self._size_based_on_temperature_profile(quadrant_sizing)
             return self.H
         else:
-            try:
-                max_temp, sized = self._size_based_on_temperature_profile(10,
-                                                                          deep_sizing=self._calculation_setup.force_deep_sizing)
-            except MaximumNumberOfIterations as e:
-                # no convergence with normal method, but perhaps with deep_sizing enabled
-                if self._calculation_setup.deep_sizing and self.ground_data.variable_Tg:
-                    max_temp, sized = self._size_based_on_temperature_profile(10, deep_sizing=True)
-                else:
-                    raise e
+            if self._size_predicted_min_temperature():
+                return self.H
+            if self._calculation_setup.parallel_quadrants:
+                sizing_max_temp, sizing_min_temp = self._size_concurrently(
+                    lambda borefield: borefield._size_max_temperature(),
+                    lambda borefield: borefield._size_based_on_temperature_profile(20))
+                max_temp, sized = self._adopt_concurrent_sizing(*sizing_max_temp)
+            else:
+                max_temp, sized = self._size_max_temperature()
             if sized:
                 # already correct size
                 self.H = max_temp
@@ -1256,7 +1695,10 @@ class Borefield(BaseClass):
                 else:
                     self.limiting_quadrant = 2
                 return max_temp
-            min_temp, sized = self._size_based_on_temperature_profile(20)
+            if self._calculation_setup.parallel_quadrants:
+                min_temp, sized = self._adopt_concurrent_sizing(*sizing_min_temp)
+            else:
+                min_temp, sized = self._size_based_on_temperature_profile(20)
             if sized:
                 self.H = min_temp
                 if self.load.imbalance <= 0:
@@ -1302,28 +1744,25 @@ class Borefield(BaseClass):
 
         # initiate with a given borehole length
         self.H: float = H_init if H_init is not None else self._calculation_setup.H_init
+        self.nb_of_temperature_evaluations = 0
 
         if quadrant_sizing != 0:
             # size according to a specific quadrant
             self.H, _ = self._size_based_on_temperature_profile(quadrant_sizing, hourly=True)
             return self.H
         else:
-            try:
-                max_temp, sized = (
-                    self._size_based_on_temperature_profile(10, hourly=True,
-                                                            deep_sizing=self._calculation_setup.force_deep_sizing)
-                    if np.any(self.load.hourly_injection_load)
-                    else (0, False)
-                )
-            except MaximumNumberOfIterations as e:
-                # no convergence with normal method, but perhaps with deep_sizing enabled
-                if self._calculation_setup.deep_sizing and self.ground_data.variable_Tg:
-                    max_temp, sized = (
-                        self._size_based_on_temperature_profile(10, hourly=True, deep_sizing=True) if np.any(
-                            self.load.hourly_injection_load) else (0, False)
-                    )
-                else:
-                    raise e
+            if np.any(self.load.hourly_extraction_load) and self._size_predicted_min_temperature(hourly=True):
+                return self.H
+            size_max_temp = np.any(self.load.hourly_injection_load)
+            size_min_temp = np.any(self.load.hourly_extraction_load)
+            if self._calculation_setup.parallel_quadrants and size_max_temp and size_min_temp:
+                sizing_max_temp, sizing_min_temp = self._size_concurrently(
+                    lambda borefield: borefield._size_max_temperature(hourly=True),
+                    lambda borefield: borefield._size_based_on_temperature_profile(20, hourly=True))
+                max_temp, sized = self._adopt_concurrent_sizing(*sizing_max_temp)
+            else:
+                sizing_min_temp = None
+                max_temp, sized = self._size_max_temperature(hourly=True) if size_max_temp else (0, False)
             if sized:
                 # already correct size
                 self.H = max_temp
@@ -1332,8 +1771,11 @@ class Borefield(BaseClass):
                 else:
                     self.limiting_quadrant = 2
                 return max_temp
-            min_temp, sized = self._size_based_on_temperature_profile(20, hourly=True) if np.any(
-                self.load.hourly_extraction_load) else (0, False)
+            if sizing_min_temp is not None:
+                min_temp, sized = self._adopt_concurrent_sizing(*sizing_min_temp)
+            else:
+                min_temp, sized = self._size_based_on_temperature_profile(20, hourly=True) if size_min_temp \
+                    else (0, False)
             if sized:
                 if self.load.imbalance <= 0:
                     self.limiting_quadrant = 4
@@ -1343,6 +1785,476 @@ class Borefield(BaseClass):
                 return min_temp
             raise UnsolvableDueToTemperatureGradient
 
+    def size_number_of_boreholes(self, H_fixed: float, layout: str = 'rectangle', spacing: float = 6.,
+                                 N_2: int = None, hourly: bool = False, max_number_of_boreholes: int = 1000,
+                                 D: float = None, r_b: float = None) -> Tuple[int, int]:
+        """
+        This function searches the smallest borefield with a fixed borehole length for which the fluid temperatures
+        stay within the temperature limits. The candidate borefields are ordered by their number of boreholes:
+        if N_2 is given, only N_1 increases, otherwise N_1 and N_2 increase alternately, so the borefield stays
+        (almost) square.
+        Based on the temperatures of the first candidate, the required number of boreholes is estimated with the same
+        proportional rule as in the sizing. Afterwards, the smallest candidate is searched with bisection between a
+        candidate that does not and one that does satisfy the temperature limits. Every candidate is evaluated only
+        once, so its g-functions are never recalculated.
+        This search assumes that a candidate with more boreholes satisfies the temperature limits when a candidate with
+        fewer boreholes does, which holds when the extra boreholes lower the load per borehole. The candidates are not
+        checked one by one, so the returned candidate is only guaranteed to satisfy the temperature limits whereas the
+        previous candidate does not. When the extra boreholes can make the temperatures worse (e.g. due to a changing
+        shape of the borefield), smaller candidates that satisfy the temperature limits can be skipped.
+        At the end, the borefield and its temperatures are set to the smallest candidate. When no candidate is found,
+        the original borefield, its g-function data and its temperatures are restored.
+
+        Parameters
+        ----------
+        H_fixed : float
+            Fixed borehole length [m]
+        layout : str
+            Layout of the borefield ('rectangle', 'L', 'U' or 'box')
+        spacing : float
+            Distance between adjacent boreholes [m]
+        N_2 : int
+            Fixed number of boreholes in the y direction. If None, it is increased together with N_1.
+        hourly : bool
+            True if the temperatures should be calculated on an hourly basis
+        max_number_of_boreholes : int
+            Maximum number of boreholes of the borefield
+        D : float
+            Buried depth of the boreholes [m]. If None, the buried depth of the current borefield is used.
+        r_b : float
+            Borehole radius [m]. If None, the borehole radius of the current borefield is used.
+
+        Returns
+        -------
+        tuple
+            Number of boreholes in the x direction (N_1) and in the y direction (N_2)
+
+        Raises
+        ------
+        ValueError
+            When the layout does not exist, when D or r_b is not given and there is no borefield or when no borefield
+            with at most max_number_of_boreholes boreholes satisfies the temperature limits
+        """
+        create_borefield = {'rectangle': gt.boreholes.rectangle_field, 'L': gt.boreholes.L_shaped_field,
+                            'U': gt.boreholes.U_shaped_field, 'box': gt.boreholes.box_shaped_field}.get(layout)
+        if create_borefield is None:
+            raise ValueError(f'The layout {layout} does not exist. Please choose rectangle, L, U or box.')
+        if (D is None or r_b is None) and self.borefield is None:
+            raise ValueError('There is no borefield, so the buried depth D and borehole radius r_b should be given.')
+        D = self.D if D is None else D
+        r_b = self.r_b if r_b is None else r_b
+
+        def configuration(index: int) -> Tuple[int, int]:
+            if N_2 is not None:
+                return index, N_2
+            return index // 2 + 1, (index + 1) // 2
+
+        def create_candidate(index: int) -> list:
+            return create_borefield(*configuration(index), spacing, spacing, H_fixed, D, r_b)
+
+        # results of the evaluated candidates
+        candidates: dict = {}
+
+        def evaluate(index: int) -> bool:
+            if index not in candidates:
+                self.borefield = create_candidate(index)
+                self._calculate_temperature_profile(H_fixed, hourly=hourly)
+                candidates[index] = self.results
+            results = candidates[index]
+            return results.max_peak_injection <= self.Tf_max and results.min_peak_extraction >= self.Tf_min
+
+        def smallest_index(number_of_boreholes: float) -> int:
+            # the number of boreholes increases with the index and is at least half of the index
+            lower, upper = 0, 2 * math.ceil(number_of_boreholes) + 2
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if len(create_candidate(middle)) < number_of_boreholes:
+                    lower = middle
+                else:
+                    upper = middle
+            return upper
+
+        max_index = smallest_index(max_number_of_boreholes)
+        if len(create_candidate(max_index)) > max_number_of_boreholes:
+            max_index -= 1
+
+        # original borefield, to be restored when the search fails
+        borefield, results, custom_gfunction = self.borefield, self.results, self.custom_gfunction
+        gfunction_calculation_object = copy.deepcopy(self.gfunction_calculation_object)
+        try:
+            # estimate of the required number of boreholes, based on the temperature differences w.r.t. the ground
+            index = min(N_2 if N_2 is not None else smallest_index(9), max_index)
+            evaluate(index)
+            Tg = self._Tg(H_fixed)
+            ratio = max((self.results.max_peak_injection - Tg) / (self.Tf_max - Tg) if self.Tf_max > Tg else 0,
+                        (self.results.min_peak_extraction - Tg) / (self.Tf_min - Tg) if self.Tf_min < Tg else 0)
+            if ratio > 0:
+                index = min(smallest_index(ratio * len(self.borefield)), max_index)
+
+            # bracket the smallest candidate which satisfies the temperature limits
+            step = 1
+            if evaluate(index):
+                upper = index
+                while upper > 1 and evaluate(max(upper - step, 1)):
+                    upper = max(upper - step, 1)
+                    step *= 2
+                lower = max(upper - step, 1) if upper > 1 else 0
+            else:
+                lower = index
+                while True:
+                    if lower == max_index:
+                        raise ValueError(f'There is no borefield with at most {max_number_of_boreholes} boreholes '
+                                         f'which satisfies the temperature limits.')
+                    if evaluate(min(lower + step, max_index)):
+                        break
+                    lower = min(lower + step, max_index)
+                    step *= 2
+                upper = min(lower + step, max_index)
+
+            # bisection between a candidate which does not (lower) and one which does (upper) satisfy the limits,
+            # which assumes that all the candidates after the upper one satisfy the limits as well
+            while upper - lower > 1:
+                middle = (lower + upper) // 2
+                if evaluate(middle):
+                    upper = middle
+                else:
+                    lower = middle
+        except BaseException:
+            if borefield is None:
+                del self.borefield
+            else:
+                self.borefield = borefield
+            self.gfunction_calculation_object = gfunction_calculation_object
+            self.results, self.custom_gfunction = results, custom_gfunction
+            raise
+
+        self.borefield = create_candidate(upper)
+        self.results = candidates[upper]
+        return configuration(upper)
+
+    def _predict_limiting_quadrant(self) -> int:
+        """
+        This function predicts the limiting quadrant with the L2 sizing (Peere et al., 2021) [#PeereBS]_.
+        Based on the imbalance of the load, the borefield is sized for quadrant 1 and 4 or for quadrant 2 and 3, and
+        the quadrant with the largest borehole length is returned. The prediction is ambiguous when these lengths differ
+        less than THRESHOLD_LIMITING_QUADRANT (relative), when the L2 method cannot size the borefield or
+        for building loads, in which case 0 is returned.
+
+        Returns
+        -------
+        int
+            Predicted limiting quadrant, 0 if the prediction is ambiguous
+        """
+        if isinstance(self.load, _LoadDataBuilding):
+            return 0
+        length, limiting_quadrant = self.H, self.limiting_quadrant
+        if self.load.imbalance <= 0:
+            # extraction dominated, so quadrants 1 and 4 are relevant
+            quadrant_max_temp, quadrant_min_temp = 1, 4
+        else:
+            # injection dominated, so quadrants 2 and 3 are relevant
+            quadrant_max_temp, quadrant_min_temp = 2, 3
+        try:
+            size_max_temp = self.size_L2(length, quadrant_max_temp) \
+                if quadrant_max_temp == 2 or self.load.max_peak_injection != 0 else 0
+            size_min_temp = self.size_L2(length, quadrant_min_temp) \
+                if quadrant_min_temp == 4 or self.load.max_peak_extraction != 0 else 0
+        except (UnsolvableDueToTemperatureGradient, MaximumNumberOfIterations, ValueError):
+            return 0
+        finally:
+            self.H, self.limiting_quadrant = length, limiting_quadrant
+        if not np.isfinite(size_max_temp) or not np.isfinite(size_min_temp) or \
+                abs(size_max_temp - size_min_temp) <= self.THRESHOLD_LIMITING_QUADRANT * max(size_max_temp,
+                                                                                              size_min_temp):
+            return 0
+        return quadrant_max_temp if size_max_temp > size_min_temp else quadrant_min_temp
+
+    def _size_predicted_min_temperature(self, hourly: bool = False) -> bool:
+        """
+        This function sizes the borefield for the minimum temperature over all years (quadrant 20) when the
+        minimum temperature is predicted to be limiting (see _predict_limiting_quadrant) and when the prediction of the
+        limiting quadrant is enabled, or when the minimum temperature was limiting in the L3 sizing of the cascaded
+        sizing. When this sizing also satisfies the maximum temperature limit, the sizing for the
+        maximum temperature is not needed anymore. Otherwise, the borehole length is reset, so the full sizing
+        procedure can start.
+
+        Parameters
+        ----------
+        hourly : bool
+            True if an hourly resolution should be used
+
+        Returns
+        -------
+        bool
+            True if the borefield is sized
+        """
+        if self._calculation_setup.parallel_quadrants:
+            return False
+        if not (hourly and self._cascaded_quadrant == 20) and (not self._calculation_setup.predict_limiting_quadrant or
+                                                               self._predict_limiting_quadrant() not in (3, 4)):
+            return False
+        length = self.H
+        try:
+            min_temp, sized = self._size_based_on_temperature_profile(20, hourly=hourly)
+        except MaximumNumberOfIterations:
+            sized = False
+        if not sized:
+            # fall back to the full sizing procedure
+            self.H = length
+            return False
+        self.H = min_temp
+        if self.load.imbalance <= 0:
+            self.limiting_quadrant = 4
+        else:
+            self.limiting_quadrant = 3
+        return True
+
+    def _size_max_temperature(self, hourly: bool = False) -> (float, bool):
+        """
+        This function sizes the borefield for the maximum temperature over all years (quadrant 10).
+        When there is no convergence, the deep sizing is tried if it is enabled and there is a temperature gradient.
+
+        Parameters
+        ----------
+        hourly : bool
+            True if an hourly resolution should be used
+
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the other temperature constraint [m]
+
+        Raises
+        ------
+        MaximumNumberOfIterations
+            MaximumNumberOfIterations if the max number of iterations is crossed
+        """
+        try:
+            if self._calculation_setup.force_deep_sizing:
+                return self._size_deep(hourly)
+            return self._size_based_on_temperature_profile(10, hourly=hourly)
+        except MaximumNumberOfIterations as e:
+            # no convergence with normal method, but perhaps with deep_sizing enabled
+            if self._calculation_setup.deep_sizing and self.ground_data.variable_Tg:
+                return self._size_deep(hourly)
+            raise e
+
+    def _size_deep(self, hourly: bool = False) -> (float, bool):
+        """
+        This function sizes the borefield for the maximum temperature over all years (quadrant 10) with the deep sizing
+        methodology. If bracketed_deep_sizing is False in the calculation setup, the borehole length is iterated with
+        calculate_next_depth_deep_sizing, starting from 20 m.
+
+        Otherwise, the borehole length is found with a bracketing method. Since the ground temperature increases with
+        the borehole length, the margin between the maximum temperature limit and the maximum fluid temperature first
+        increases and afterwards decreases with the borehole length. Starting from 20 m, the borehole length is
+        increased based on calculate_next_depth_deep_sizing until the margin is positive. When the margin decreases
+        before it is positive, the maximum margin is searched for with a golden-section search and when this maximum
+        is negative, the borefield cannot be sized. Once the smallest borehole length with a positive margin is
+        bracketed, it is found with the Illinois variant of regula falsi. Since all the borehole lengths are evaluated
+        for the same borefield and ground, the g-function values of the previous lengths are reused.
+
+        Parameters
+        ----------
+        hourly : bool
+            True if an hourly resolution should be used
+
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the minimum temperature limit
+
+        Raises
+        ------
+        UnsolvableDueToTemperatureGradient
+            When there is no borehole length which satisfies the maximum temperature limit
+        MaximumNumberOfIterations
+            MaximumNumberOfIterations if the max number of iterations is crossed
+        """
+        if not self._calculation_setup.bracketed_deep_sizing:
+            return self._size_based_on_temperature_profile(10, hourly=hourly, deep_sizing=True)
+
+        # last evaluated borehole length
+        evaluated = [0.]
+
+        def margin(length: float) -> float:
+            self._calculate_temperature_profile(length, hourly=hourly)
+            self.nb_of_temperature_evaluations += 1
+            evaluated[0] = length
+            return self.Tf_max - self.results.max_peak_injection
+
+        def sized(length: float) -> (float, bool):
+            if evaluated[0] != length:
+                margin(length)
+            self.H = length
+            return length, self.results.min_peak_extraction >= self.Tf_min - 0.05
+
+        lower = 20.
+        margin_lower = margin(lower)
+        if self.results.max_peak_injection < self._Tg(lower):
+            # the maximum temperature limit is not relevant
+            return 0, False
+
+        # bracket the smallest borehole length with a positive margin between lower and upper
+        if margin_lower >= 0:
+            while margin_lower >= 0:
+                if lower < 1:
+                    return sized(upper)
+                upper, margin_upper = lower, margin_lower
+                lower /= 2
+                margin_lower = margin(lower)
+        else:
+            previous, margin_previous = lower, margin_lower
+            i = 0
+            while True:
+                if self.Tf_max <= self._Tg(lower):
+                    raise UnsolvableDueToTemperatureGradient
+                # the deep sizing estimate approaches the solution from below, so its step is enlarged to bracket it
+                step = max(self.calculate_next_depth_deep_sizing(lower) - lower, 0.02 * lower)
+                upper = min(lower + 1.2 * step, lower * 10)
+                if upper > Borefield.THRESHOLD_DEPTH_ERROR:
+                    raise UnsolvableDueToTemperatureGradient
+                margin_upper = margin(upper)
+                if margin_upper >= 0:
+                    break
+                if margin_upper < margin_lower:
+                    # the maximum margin lies between previous and upper
+                    lower, margin_lower, upper, margin_upper = \
+                        self._golden_section_margin(margin, previous, margin_previous, upper)
+                    break
+                previous, margin_previous, lower, margin_lower = lower, margin_lower, upper, margin_upper
+                i += 1
+                if i > self._calculation_setup.max_nb_of_iterations:
+                    raise MaximumNumberOfIterations(self._calculation_setup.max_nb_of_iterations)
+
+        # Illinois variant of regula falsi, until two consecutive borehole lengths are converged
+        i = 0
+        side = 0
+        length = upper
+        while i == 0 or not self._check_convergence(length, previous_length, i):
+            previous_length = length
+            length = upper - margin_upper * (upper - lower) / (margin_upper - margin_lower)
+            margin_length = margin(length)
+            if margin_length >= 0:
+                upper, margin_upper = length, margin_length
+                if side == 1:
+                    margin_lower /= 2
+                side = 1
+            else:
+                lower, margin_lower = length, margin_length
+                if side == -1:
+                    margin_upper /= 2
+                side = -1
+            i += 1
+        return sized(upper)
+
+    def _golden_section_margin(self, margin: Callable[[float], float], lower: float, margin_lower: float,
+                               upper: float) -> (float, float, float, float):
+        """
+        This function searches for a borehole length with a positive margin w.r.t. the maximum temperature limit
+        between lower and upper with a golden-section search for the maximum margin.
+
+        Parameters
+        ----------
+        margin : Callable
+            Function that returns the margin for a borehole length
+        lower : float
+            Borehole length with a negative margin, smaller than the borehole length with the maximum margin [m]
+        margin_lower : float
+            Margin at lower [K]
+        upper : float
+            Borehole length larger than the borehole length with the maximum margin [m]
+
+        Returns
+        -------
+        float, float, float, float
+            Borehole length with a negative margin, its margin, borehole length with a positive margin, its margin
+
+        Raises
+        ------
+        UnsolvableDueToTemperatureGradient
+            When the maximum margin is negative
+        MaximumNumberOfIterations
+            MaximumNumberOfIterations if the max number of iterations is crossed
+        """
+        ratio = (math.sqrt(5) - 1) / 2
+        length_1, length_2 = upper - ratio * (upper - lower), lower + ratio * (upper - lower)
+        margin_1, margin_2 = margin(length_1), margin(length_2)
+        i = 0
+        while margin_1 < 0 and margin_2 < 0:
+            if self._check_convergence(length_2, length_1, i):
+                raise UnsolvableDueToTemperatureGradient
+            if margin_1 > margin_2:
+                upper, length_2, margin_2 = length_2, length_1, margin_1
+                length_1 = upper - ratio * (upper - lower)
+                margin_1 = margin(length_1)
+            else:
+                lower, margin_lower, length_1, margin_1 = length_1, margin_1, length_2, margin_2
+                length_2 = lower + ratio * (upper - lower)
+                margin_2 = margin(length_2)
+            i += 1
+        if margin_1 >= 0:
+            return lower, margin_lower, length_1, margin_1
+        return length_1, margin_1, length_2, margin_2
+
+    def _size_concurrently(self, *sizing_functions: Callable) -> List[Tuple[Future, Borefield]]:
+        """
+        This function calculates multiple sizings concurrently in a thread pool.
+        Every sizing function gets its own copy of the borefield, so the iterations do not interfere with each other.
+        The function returns when all the sizings are finished. The temperature calculations of all the sizings are
+        added to nb_of_temperature_evaluations.
+
+        Parameters
+        ----------
+        sizing_functions : Callable
+            Functions with the borefield copy as their only argument
+
+        Returns
+        -------
+        list
+            Tuples with the future of every sizing and the borefield copy on which it was calculated.
+            The results (or the exceptions) of the sizings are obtained with future.result().
+        """
+        borefields = [copy.deepcopy(self) for _ in sizing_functions]
+        with ThreadPoolExecutor(max_workers=len(sizing_functions)) as executor:
+            futures = [executor.submit(function, borefield)
+                       for function, borefield in zip(sizing_functions, borefields)]
+        self.nb_of_temperature_evaluations += sum(borefield.nb_of_temperature_evaluations for borefield in borefields)
+        return list(zip(futures, borefields))
+
+    def _adopt_concurrent_sizing(self, future: Future, borefield: Borefield) -> (float, bool):
+        """
+        This function returns the result of a sizing that was calculated on a copy of the borefield
+        (see _size_concurrently) and takes over the temperatures of that copy, as if the sizing was calculated
+        on this borefield.
+
+        Parameters
+        ----------
+        future : Future
+            Future of the sizing
+        borefield : Borefield
+            Borefield copy on which the sizing was calculated
+
+        Returns
+        -------
+        Borehole length : float
+            Required borehole length of the borefield [m]
+        Sized : bool
+            True if the required borehole length also satisfies the other temperature constraint [m]
+
+        Raises
+        ------
+        MaximumNumberOfIterations
+            When the sizing on the copy raised this error
+        """
+        length, sized = future.result()
+        self.results = borefield.results
+        return length, sized
+
     def calculate_next_depth_deep_sizing(self, current_length: float) -> float:
         """
         This method is a slower but more robust way of calculating the next borehole length in the sizing iteration when the
@@ -1409,47 +2321,56 @@ class Borefield(BaseClass):
         if deep_sizing:
             # set borefield to minimal borehole length
             self.H = 20
+        elif hourly and quadrant in self._cascaded_lengths:
+            # start from the length of the L3 sizing
+            self.H = self._cascaded_lengths[quadrant]
+
+        # only the first or last year is needed for the quadrants 1 to 4, so only this window has to be calculated
+        # when the load is the same for every year
+        windowed = self._calculation_setup.windowed_sizing and quadrant in (1, 2, 3, 4) and not deep_sizing and \
+                   not isinstance(self.load, _LoadDataBuilding) and not self.load._multiyear
+
+        # borehole lengths with the deviation of the limiting temperature w.r.t. its limit, for the secant engine
+        evaluations = []
 
         # Iterates as long as there is no convergence
         # (convergence if difference between borehole length in iterations is smaller than THRESHOLD_BOREHOLE_LENGTH)
         i = 0
         while not self._check_convergence(self.H, H_prev, i):
-            if hourly:
-                self._calculate_temperature_profile(self.H, hourly=True)
+            if windowed:
+                results = self._calculate_temperature_window(self.H, hourly=hourly, first_year=quadrant in (1, 3))
             else:
-                self._calculate_temperature_profile(self.H, hourly=False)
+                self._calculate_temperature_profile(self.H, hourly=hourly)
+                results = self.results
+            self.nb_of_temperature_evaluations += 1
             H_prev = self.H
             if not deep_sizing:
                 if quadrant == 1:
                     # maximum temperature
-                    # convert back to required length
-                    self.H = (np.max(self.results.peak_injection[: 8760 if hourly else 12]) - self._Tg()) / (
-                            self.Tf_max - self._Tg()) * H_prev
+                    temperature, limit = results.max_peak_injection_per_year[0], self.Tf_max
                 elif quadrant == 2:
                     # maximum temperature
-                    # convert back to required length
-                    self.H = (np.max(self.results.peak_injection[-8760 if hourly else -12:]) - self._Tg()) / (
-                            self.Tf_max - self._Tg()) * H_prev
+                    temperature, limit = results.max_peak_injection_per_year[-1], self.Tf_max
                 elif quadrant == 3:
                     # minimum temperature
-                    # convert back to required length
-                    self.H = (np.min(self.results.peak_extraction[: 8760 if hourly else 12]) - self._Tg()) / (
-                            self.Tf_min - self._Tg()) * H_prev
+                    temperature, limit = results.min_peak_extraction_per_year[0], self.Tf_min
                 elif quadrant == 4:
                     # minimum temperature
-                    # convert back to required length
-                    self.H = (np.min(self.results.peak_extraction[-8760 if hourly else -12:]) - self._Tg()) / (
-                            self.Tf_min - self._Tg()) * H_prev
+                    temperature, limit = results.min_peak_extraction_per_year[-1], self.Tf_min
                 elif quadrant == 10:
                     # over all years
                     # maximum temperature
-                    # convert back to required length
-                    self.H = (np.max(self.results.peak_injection) - self._Tg()) / (self.Tf_max - self._Tg()) * H_prev
+                    temperature, limit = results.max_peak_injection, self.Tf_max
                 elif quadrant == 20:
                     # over all years
                     # minimum temperature
-                    # convert back to required length
-                    self.H = (np.min(self.results.peak_extraction) - self._Tg()) / (self.Tf_min - self._Tg()) * H_prev
+                    temperature, limit = results.min_peak_extraction, self.Tf_min
+                # convert back to required length
+                self.H = (temperature - self._Tg()) / (limit - self._Tg()) * H_prev
+                if self._calculation_setup.sizing_engine == 'secant' and self.H >= 0:
+                    # positive deviation if the borehole is too short
+                    evaluations.append((H_prev, temperature - limit if quadrant in (1, 2, 10) else limit - temperature))
+                    self.H = self._next_length_secant(evaluations, self.H)
             elif self.ground_data.variable_Tg:
                 # for when the temperature gradient is active and it is injection
                 self.H = self.calculate_next_depth_deep_sizing(H_prev)
@@ -1458,12 +2379,129 @@ class Borefield(BaseClass):
 
             i += 1
 
-        return self.H, (np.max(self.results.peak_injection) <= self.Tf_max + 0.05 or (
+        if windowed:
+            # the full temperature profile is needed to check the other temperature limit
+            self._calculate_temperature_profile(H_prev, hourly=hourly)
+            self.nb_of_temperature_evaluations += 1
+
+        return self.H, (self.results.max_peak_injection <= self.Tf_max + 0.05 or (
                 quadrant == 10 or quadrant == 1 or quadrant == 2)) and (
-                               np.min(self.results.peak_extraction) >= self.Tf_min - 0.05 or (
+                               self.results.min_peak_extraction >= self.Tf_min - 0.05 or (
                                quadrant == 20 or quadrant == 3 or quadrant == 4)
                        )
 
+    @staticmethod
+    def _next_length_secant(evaluations: list, proportional_length: float) -> float:
+        """
+        This function calculates the next borehole length in the sizing iteration with a safeguarded secant method.
+        The deviation of the limiting temperature w.r.t. its limit is a scalar, decreasing function of the borehole
+        length, so its root is the required borehole length. Since the temperature difference with the ground is
+        almost inversely proportional to the borehole length, the secant step is taken in the inverse of the borehole
+        length, through the last two evaluations. This step is used when it lies within the bracket of the
+        evaluations so far and does not change the borehole length by more than a factor two. Otherwise, the
+        proportional step is used if it lies within the bracket, and a bisection of the bracket if not.
+        In this way, previous evaluations are reused and oscillations are avoided.
+
+        Parameters
+        ----------
+        evaluations : list
+            List of tuples with the borehole length [m] and the deviation of the limiting temperature [K], which is
+            positive when the borehole is too short
+        proportional_length : float
+            Next borehole length according to the proportional method [m]
+
+        Returns
+        -------
+        float
+            Next borehole length [m]
+        """
+        length, deviation = evaluations[-1]
+        lower = max([H for H, dev in evaluations if dev > 0], default=0.)
+        upper = min([H for H, dev in evaluations if dev <= 0], default=np.inf)
+        if lower >= upper:
+            # no consistent bracket (e.g. due to interpolated g-functions)
+            return proportional_length
+
+        if len(evaluations) > 1:
+            previous_length, previous_deviation = evaluations[-2]
+            if deviation != previous_deviation:
+                secant_length = 1 / (1 / length - deviation * (1 / length - 1 / previous_length) /
+                                     (deviation - previous_deviation))
+                if lower < secant_length < upper and length / 2 <= secant_length <= length * 2:
+                    return secant_length
+        if lower < proportional_length < upper or np.isinf(upper):
+            return proportional_length
+        return (lower + upper) / 2
+
+    def _calculate_temperature_window(self, H: float, hourly: bool = False, first_year: bool = True) \
+            -> Union[ResultsMonthly, ResultsHourly]:
+        """
+        This function calculates the temperatures in only the first or the last year of the simulation period.
+        The load should be the same for every year, so that the contribution of all the previous years can be folded
+        into a kernel with a length of two years. The cost of the convolution is hence proportional to the length of
+        a single year, and not to the simulation period.
+
+        Parameters
+        ----------
+        H : float
+            Borehole length at which the temperatures should be evaluated [m]
+        hourly : bool
+            True if the temperatures should be calculated on an hourly basis
+        first_year : bool
+            True if the temperatures in the first year are needed, False for the last year
+
+        Returns
+        -------
+        ResultsMonthly or ResultsHourly
+            Temperatures in the requested year
+
+        Raises
+        ------
+        ValueError
+            When hourly is True and there is no hourly load
+        """
+        if hourly and not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+        depth = self.calculate_depth(H, self.D)
+        k_s = self.ground_data.k_s(depth, self.D)
+        Rb = self.borehole.get_Rb(H, self.D, self.r_b, k_s, depth)
+        kernel = self._convolution_kernel(H, hourly=hourly)
+        window = 8760 if hourly else 12
+        window_slice = slice(0, window) if first_year else slice(-window, None)
+
+        # fold the g-value differences per year: row u contains the differences for the loads of u years ago
+        years = kernel.g_value_differences.reshape(-1, window)[:1 if first_year else None]
+        # kernel for a time difference of -window + 1 until window - 1 between the load and the result
+        folded_kernel = np.concatenate((np.sum(years[:-1], axis=0)[1:], np.sum(years, axis=0)))
+
+        if hourly:
+            hourly_load = self.load.hourly_net_resulting_injection_power[window_slice]
+            results = convolve(hourly_load * 1000, folded_kernel)[window - 1: 2 * window - 1]
+            Tb = results / (2 * pi * k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+            temperature_result = Tb + hourly_load * 1000 * (Rb / self.number_of_boreholes / H)
+            return ResultsHourly(borehole_wall_temp=Tb, temperature_fluid=temperature_result)
+
+        results = convolve(self.load.monthly_average_injection_power_simulation_period[window_slice] * 1000,
+                           folded_kernel)[window - 1: 2 * window - 1]
+        Tb = results / (2 * pi * k_s) / (H * self.number_of_boreholes) + self._Tg(H)
+        baseload_injection = self.load.monthly_baseload_injection_power_simulation_period[window_slice]
+        baseload_extraction = self.load.monthly_baseload_extraction_power_simulation_period[window_slice]
+        results_month_injection = Tb + baseload_injection * 1000 * (Rb / self.number_of_boreholes / H)
+        results_month_extraction = Tb - baseload_extraction * 1000 * (Rb / self.number_of_boreholes / H)
+        results_peak_injection = results_month_injection + (
+                self.load.monthly_peak_injection_simulation_period[window_slice] - baseload_injection) * 1000 * (
+                                         kernel.g_value_peak_injection / k_s / 2 / pi + Rb) \
+                                 / self.number_of_boreholes / H
+        results_peak_extraction = results_month_extraction - (
+                self.load.monthly_peak_extraction_simulation_period[window_slice] - baseload_extraction) * 1000 * (
+                                          kernel.g_value_peak_extraction / k_s / 2 / pi + Rb) \
+                                  / self.number_of_boreholes / H
+        return ResultsMonthly(borehole_wall_temp=Tb,
+                              peak_extraction=results_peak_extraction,
+                              peak_injection=results_peak_injection,
+                              monthly_extraction=results_month_extraction,
+                              monthly_injection=results_month_injection)
+
     @property
     def investment_cost(self) -> float:
         """
@@ -1493,6 +2531,381 @@ class Borefield(BaseClass):
         None
         """
         self._calculate_temperature_profile(H=length, hourly=hourly)
+        self._store_results()
+
+    def build_response_operator(self, length: float = None, hourly: bool = False) -> ResponseOperator:
+        """
+        This function returns the response operator of the borefield for a certain borehole length.
+        Since the temperatures are linear in the load, this operator can calculate the temperatures for many load
+        scenarios at once (see ResponseOperator.calculate), instead of doing a full simulation for every scenario.
+        The operator of the last call is stored and reused as long as the borefield, ground and borehole length
+        do not change.
+
+        Parameters
+        ----------
+        length : float
+            Borehole length [m]. If None, the current length is taken.
+        hourly : bool
+            True if the operator should have an hourly resolution
+
+        Returns
+        -------
+        ResponseOperator
+            Response operator
+
+        Raises
+        ------
+        ValueError
+            When hourly is True and there is no hourly load
+        """
+        if hourly and not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+        H = length if length is not None else self.H
+        depth = self.calculate_depth(H, self.D)
+        k_s = self.ground_data.k_s(depth, self.D)
+        Rb = self.borehole.get_Rb(H, self.D, self.r_b, k_s, depth)
+        kernel = self._convolution_kernel(H, hourly=hourly)
+        operator = self._response_operator
+        if operator is None or operator.kernel is not kernel or \
+                (operator.H, operator.number_of_boreholes, operator.k_s, operator.Rb, operator.Tg) != \
+                (H, self.number_of_boreholes, k_s, Rb, self._Tg(H)):
+            operator = ResponseOperator(kernel, H, self.number_of_boreholes, k_s, Rb, self._Tg(H), hourly)
+            self._response_operator = operator
+        return operator
+
+    def calculate_length_sensitivities(self, hourly: bool = False, step: float = 0.01) -> dict:
+        """
+        This function calculates the derivatives of the required borehole length w.r.t. the ground thermal
+        conductivity, the equivalent borehole thermal resistance, the ground temperature and a scaling factor of the
+        load, at the current (sized) borehole length.
+        Instead of sizing the borefield again for every perturbed parameter p, the condition that the limiting
+        temperature equals its limit, T(H, p) = T_lim, is differentiated implicitly, so dH/dp = -(dT/dp) / (dT/dH).
+        Since the temperatures are linear in the ground temperature, the borehole resistance and the load, these
+        derivatives are exact. The derivatives w.r.t. the borehole length and the ground thermal conductivity are
+        calculated with central differences, which requires four extra g-function calculations.
+
+        Parameters
+        ----------
+        hourly : bool
+            True if the limiting temperature should be calculated on an hourly basis (i.e. after an L4 sizing)
+        step : float
+            Relative step for the central differences and the borehole resistance
+
+        Returns
+        -------
+        dict
+            Derivatives of the borehole length [m] w.r.t. k_s [W/mK], Rb [mK/W], Tg [deg C] and a factor with which the
+            whole load is scaled, with the keys 'k_s', 'Rb', 'Tg' and 'load'
+
+        Raises
+        ------
+        ValueError
+            When the borefield is not sized or when the load is a building load
+        """
+        if self.limiting_quadrant == 0:
+            raise ValueError('The borefield should be sized before the sensitivities can be calculated.')
+        if isinstance(self.load, _LoadDataBuilding):
+            raise ValueError('The sensitivities cannot be calculated for a building load, since this load depends on '
+                             'the fluid temperatures.')
+        H = self.H
+        depth = self.calculate_depth(H, self.D)
+        maximum = self.limiting_quadrant in (1, 2)
+
+        def limiting_temperature(length: float = H) -> float:
+            self._calculate_temperature_profile(length, hourly=hourly)
+            return self.results.max_peak_injection if maximum else self.results.min_peak_extraction
+
+        results, borehole, ground_data, gfunction = \
+            self._results, self.borehole, self._ground_data, self.gfunction_calculation_object
+        try:
+            temperature = limiting_temperature()
+            dT_dH = (limiting_temperature(H * (1 + step)) - limiting_temperature(H * (1 - step))) / (2 * step * H)
+
+            # borehole resistance
+            Rb = borehole.get_Rb(H, self.D, self.r_b, ground_data.k_s(depth, self.D), depth)
+            self.borehole = copy.deepcopy(borehole)
+            self.borehole.Rb = Rb * (1 + step)
+            dT_dRb = (limiting_temperature() - temperature) / (step * Rb)
+            self.borehole = borehole
+
+            # ground thermal conductivity, with a copy of the g-function object so its stored g-values are kept
+            self.gfunction_calculation_object = copy.deepcopy(gfunction)
+            temperatures = []
+            for factor in (1 + step, 1 - step):
+                self._ground_data = copy.deepcopy(ground_data)
+                for layer in self._ground_data.layers:
+                    layer.k_s *= factor
+                temperatures.append(limiting_temperature())
+            dT_dk_s = (temperatures[0] - temperatures[1]) / (2 * step * ground_data.k_s(depth, self.D))
+        finally:
+            self._results, self.borehole, self._ground_data, self.gfunction_calculation_object = \
+                results, borehole, ground_data, gfunction
+
+        return {'k_s': -dT_dk_s / dT_dH, 'Rb': -dT_dRb / dT_dH, 'Tg': -1 / dT_dH,
+                'load': -(temperature - self._Tg(H)) / dT_dH}
+
+    def calculate_temperatures_per_year(self, length: float = None) -> Iterator[ResultsHourly]:
+        """
+        This function calculates the hourly temperatures year by year and yields a ResultsHourly object
+        for every year of the simulation period, so the temperatures can be processed or written to disk
+        without keeping the temperature profile of the whole simulation period in memory.
+        The results of the borefield object itself are not changed.
+
+        When the load is the same for every year, the convolution is done with overlap-add over the yearly
+        load blocks. Since all these blocks are identical, their contributions to the current year are accumulated
+        in a kernel of two years, so the memory use does not depend on the simulation period.
+        For a multi-year load, the load of the whole simulation period is already in memory, so the
+        convolution is done once and only the temperatures are created year by year.
+        For a building load, the load depends on the temperatures themselves, so the full temperature profile
+        is calculated first.
+
+        Parameters
+        ----------
+        length : float
+            Borehole length for which the temperatures should be calculated [m]. If None, the current length is taken.
+
+        Yields
+        ------
+        ResultsHourly
+            Temperatures for one year of the simulation period
+
+        Raises
+        ------
+        ValueError
+            When there is no hourly load
+
+        Examples
+        --------
+
+        >>> with open('temperatures.csv', 'w') as file:
+        ...     for results in borefield.calculate_temperatures_per_year(150):
+        ...         np.savetxt(file, results.Tf)
+
+        """
+        if not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+        H = length if length is not None else self.H
+
+        if isinstance(self.load, _LoadDataBuilding):
+            results_backup = self.results
+            self._calculate_temperature_profile(H, hourly=True)
+            results, self.results = self.results, results_backup
+            for year in range(self.simulation_period):
+                yield ResultsHourly(borehole_wall_temp=results.Tb[year * 8760:(year + 1) * 8760],
+                                    temperature_fluid=results.Tf[year * 8760:(year + 1) * 8760])
+            return
+
+        depth = self.calculate_depth(H, self.D)
+        k_s = self.ground_data.k_s(depth, self.D)
+        Rb = self.borehole.get_Rb(H, self.D, self.r_b, k_s, depth)
+        Tg = self._Tg(H)
+        nb = self.number_of_boreholes
+
+        def temperatures(convolution: np.ndarray, hourly_load: np.ndarray) -> ResultsHourly:
+            Tb = convolution / (2 * pi * k_s) / (H * nb) + Tg
+            return ResultsHourly(borehole_wall_temp=Tb, temperature_fluid=Tb + hourly_load * (Rb / nb / H))
+
+        if self.load._multiyear:
+            hourly_load = self.load.hourly_net_resulting_injection_power * 1000
+            convolution = self._convolution_kernel(H, hourly=True).convolve(hourly_load)
+            for year in range(self.simulation_period):
+                yield temperatures(convolution[year * 8760:(year + 1) * 8760], hourly_load[year * 8760:(year + 1) * 8760])
+            return
+
+        # the g-values at every hour are interpolated from the g-values at the default time values, in the same way
+        # as it is done for the full simulation period
+        time_values = _time_values(t_max=3600 * 8760 * self.simulation_period)
+        g_values = self.gfunction(time_values, H)
+
+        hourly_load = (self.load.hourly_injection_load - self.load.hourly_extraction_load) * 1000
+        # kernel for a time difference of -8759 until 8759 hours between the load and the result
+        folded_kernel = np.zeros(2 * 8760 - 1)
+        g_value_differences_previous_year = np.zeros(8760)
+        for year in range(self.simulation_period):
+            g_values_year = np.interp(3600 * np.arange(year * 8760, (year + 1) * 8760 + 1), time_values, g_values)
+            if year == 0:
+                g_values_year[0] = 0
+            g_value_differences = np.diff(g_values_year)
+            folded_kernel[8759:] += g_value_differences
+            folded_kernel[:8759] += g_value_differences_previous_year[1:]
+            g_value_differences_previous_year = g_value_differences
+            yield temperatures(convolve(hourly_load, folded_kernel)[8759: 2 * 8760 - 1], hourly_load)
+
+    def calculate_temperatures_hybrid(self, length: float = None, years: ArrayLike = None) -> ResultsHourly:
+        """
+        This function calculates the hourly temperatures in only some years of the simulation period
+        (by default the first and the last year), with a mixed resolution.
+        The loads in these years and in the year before are convolved hour by hour, whereas all the older loads
+        are aggregated into monthly pulses, as in the L3 method. Since the effect of these older loads changes
+        slowly, it is only calculated at some hours of the year and interpolated in between.
+        This gives the peak temperatures of the L4 method at a cost that hardly depends on the simulation period.
+        The results of the borefield object itself are not changed.
+
+        For a building load, the load depends on the temperatures themselves, so then the full temperature profile
+        is calculated first.
+
+        Parameters
+        ----------
+        length : float
+            Borehole length for which the temperatures should be calculated [m]. If None, the current length is taken.
+        years : list, np.ndarray
+            Years of the simulation period (starting from 0) for which the hourly temperatures are needed.
+            If None, the first and last year are taken.
+
+        Returns
+        -------
+        ResultsHourly
+            Hourly temperatures of the requested years, one year after the other
+
+        Raises
+        ------
+        ValueError
+            When there is no hourly load or when a year is not within the simulation period
+        """
+        if not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+        years = [0, self.simulation_period - 1] if years is None else list(years)
+        if any(year < 0 or year >= self.simulation_period for year in years):
+            raise ValueError(f'The years {years} should be within the simulation period of {self.simulation_period} '
+                             f'years.')
+        H = length if length is not None else self.H
+
+        if isinstance(self.load, _LoadDataBuilding):
+            results_backup = self.results
+            self._calculate_temperature_profile(H, hourly=True)
+            results, self.results = self.results, results_backup
+            return ResultsHourly(
+                borehole_wall_temp=np.concatenate([results.Tb[year * 8760:(year + 1) * 8760] for year in years]),
+                temperature_fluid=np.concatenate([results.Tf[year * 8760:(year + 1) * 8760] for year in years]))
+
+        depth = self.calculate_depth(H, self.D)
+        k_s = self.ground_data.k_s(depth, self.D)
+        Rb = self.borehole.get_Rb(H, self.D, self.r_b, k_s, depth)
+        Tg = self._Tg(H)
+        nb = self.number_of_boreholes
+
+        # the g-values are interpolated from the g-values at the default time values, in the same way
+        # as it is done for the full simulation period
+        time_values = _time_values(t_max=3600 * 8760 * self.simulation_period)
+        g_values = self.gfunction(time_values, H)
+
+        def g_function(hours: np.ndarray) -> np.ndarray:
+            return np.interp(3600 * hours, time_values, g_values)
+
+        hourly_load = self.load.hourly_net_resulting_injection_power * 1000
+        monthly_load = self.load.monthly_average_injection_power_simulation_period * 1000
+        start_of_months = np.concatenate(([0], np.cumsum(np.tile(self.load.UPM, self.simulation_period))))
+        g_value_differences = np.diff(g_function(np.arange(1, 2 * 8760 + 1)), prepend=0)
+
+        Tb, Tf = [], []
+        for year in years:
+            start = year * 8760
+            start_hourly = max(0, start - 8760)
+            # hourly convolution of the loads in this and the previous year
+            load = hourly_load[start_hourly:start + 8760]
+            results = convolve(load, g_value_differences[:load.size])[start - start_hourly:load.size]
+
+            # monthly pulses of the older loads, calculated at some hours and interpolated in between
+            nb_of_months = 12 * (start_hourly // 8760)
+            if nb_of_months:
+                hours = np.linspace(start, start + 8759, 25)
+                g_values_months = g_function(hours[:, np.newaxis] + 1 - start_of_months[np.newaxis, :nb_of_months + 1])
+                results_months = (g_values_months[:, :-1] - g_values_months[:, 1:]) @ monthly_load[:nb_of_months]
+                results += np.interp(np.arange(start, start + 8760), hours, results_months)
+
+            Tb.append(results / (2 * pi * k_s) / (H * nb) + Tg)
+            Tf.append(Tb[-1] + hourly_load[start:start + 8760] * (Rb / nb / H))
+        return ResultsHourly(borehole_wall_temp=np.concatenate(Tb), temperature_fluid=np.concatenate(Tf))
+
+    def calculate_temperatures_for_lengths(self, lengths: ArrayLike, hourly: bool = False) \
+            -> Union[ResultsMonthly, ResultsHourly]:
+        """
+        This function calculates the temperature profiles for multiple borehole lengths at once.
+        The g-values for all the lengths are stacked in a 2D-array, so the load is convolved with all of them in one
+        pass. The temperatures are returned in a single results object where every temperature array has one row
+        per borehole length. The results of the borefield object itself are not changed.
+
+        For a building load, the load depends on the temperatures themselves, so then the temperatures are
+        calculated length per length.
+
+        Parameters
+        ----------
+        lengths : list, np.ndarray
+            Borehole lengths for which the temperature profiles should be calculated [m]
+        hourly : bool
+            True when the temperatures should be calculated based on hourly data
+
+        Returns
+        -------
+        ResultsMonthly or ResultsHourly
+            Results object with one row per borehole length
+
+        Raises
+        ------
+        ValueError
+            When hourly is True and there is no hourly load
+        """
+        lengths = np.asarray(lengths, dtype=np.float64)
+
+        if isinstance(self.load, _LoadDataBuilding):
+            results_backup = self.results
+            results = []
+            for length in lengths:
+                self._calculate_temperature_profile(length, hourly=hourly)
+                results.append(self.results)
+            self.results = results_backup
+            if hourly:
+                return ResultsHourly(borehole_wall_temp=np.array([result.Tb for result in results]),
+                                     temperature_fluid=np.array([result.Tf for result in results]))
+            return ResultsMonthly(borehole_wall_temp=np.array([result.Tb for result in results]),
+                                  peak_extraction=np.array([result.peak_extraction for result in results]),
+                                  peak_injection=np.array([result.peak_injection for result in results]),
+                                  monthly_extraction=np.array([result.monthly_extraction for result in results]),
+                                  monthly_injection=np.array([result.monthly_injection for result in results]))
+
+        if hourly and not self.load._hourly:
+            raise ValueError("There is no hourly resolution available!")
+
+        depths = [self.calculate_depth(length, self.D) for length in lengths]
+        k_s = np.array([self.ground_data.k_s(depth, self.D) for depth in depths])
+        Rb = np.array([self.borehole.get_Rb(length, self.D, self.r_b, k_s_i, depth)
+                       for length, k_s_i, depth in zip(lengths, k_s, depths)])
+        Tg = np.array([self._Tg(length) for length in lengths])
+        # column vectors so that they broadcast over the time axis
+        H, k_s, Rb, Tg = (i[:, np.newaxis] for i in (lengths, k_s, Rb, Tg))
+        nb = self.number_of_boreholes
+
+        kernels = [self._convolution_kernel(length, hourly=hourly) for length in lengths]
+        kernel = ConvolutionKernel(np.array([kernel.g_value_differences for kernel in kernels]))
+
+        if hourly:
+            hourly_load = self.load.hourly_net_resulting_injection_power
+            Tb = kernel.convolve(hourly_load * 1000) / (2 * pi * k_s) / (H * nb) + Tg
+            temperature_result = Tb + hourly_load * 1000 * (Rb / nb / H)
+            return ResultsHourly(borehole_wall_temp=Tb, temperature_fluid=temperature_result)
+
+        g_value_peak_injection = np.array([kernel.g_value_peak_injection for kernel in kernels])[:, np.newaxis]
+        g_value_peak_extraction = np.array([kernel.g_value_peak_extraction for kernel in kernels])[:, np.newaxis]
+
+        Tb = kernel.convolve(self.load.monthly_average_injection_power_simulation_period * 1000) \
+             / (2 * pi * k_s) / (H * nb) + Tg
+        results_month_injection = Tb + self.load.monthly_baseload_injection_power_simulation_period * 1000 * (
+                Rb / nb / H)
+        results_month_extraction = Tb - self.load.monthly_baseload_extraction_power_simulation_period * 1000 * (
+                Rb / nb / H)
+        results_peak_injection = results_month_injection + (
+                self.load.monthly_peak_injection_simulation_period
+                - self.load.monthly_baseload_injection_power_simulation_period) * 1000 * (
+                                         g_value_peak_injection / k_s / 2 / pi + Rb) / nb / H
+        results_peak_extraction = results_month_extraction - (
+                self.load.monthly_peak_extraction_simulation_period
+                - self.load.monthly_baseload_extraction_power_simulation_period) * 1000 * (
+                                          g_value_peak_extraction / k_s / 2 / pi + Rb) / nb / H
+        return ResultsMonthly(borehole_wall_temp=Tb,
+                              peak_extraction=results_peak_extraction,
+                              peak_injection=results_peak_injection,
+                              monthly_extraction=results_month_extraction,
+                              monthly_injection=results_month_injection)
 
     def print_temperature_profile(self, legend: bool = True, plot_hourly: bool = False) -> None:
         """
@@ -1627,8 +3040,12 @@ class Borefield(BaseClass):
         """
 
         def calculate_temperatures(H, hourly=hourly):
+            # set the borehole length, since the convolution kernel can be taken from the cache without calculating
+            # the g-function (which sets the borehole length as well)
+            if H is not None:
+                self.H = H
+            H = self.H
             # set Rb* value
-            H = H if H is not None else self.H
             depth = self.calculate_depth(H, self.D)
             Rb = self.borehole.get_Rb(H, self.D, self.r_b,
                                       self.ground_data.k_s(depth, self.D), depth)
@@ -1636,24 +3053,13 @@ class Borefield(BaseClass):
             results = None
 
             if not hourly:
-                # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
-                # g-function. This dataset is checked over and over again and is correct
-                g_values = self.gfunction(self.load.time_L3, H)
-
-                # the g-function value of the peak with length_peak hours
-                g_value_peak_injection = self.gfunction(self.load.peak_injection_duration, H)[0]
-                if self.load.peak_injection_duration == self.load.peak_extraction_duration:
-                    g_value_peak_extraction = g_value_peak_injection
-                else:
-                    g_value_peak_extraction = self.gfunction(self.load.peak_extraction_duration, H)[0]
-
-                # calculation of needed differences of the g-function values. These are the weight factors in the calculation
-                # of Tb.
-                g_value_differences = np.diff(g_values, prepend=0)
+                kernel = self._convolution_kernel(H, hourly=False)
+                g_value_peak_injection = kernel.g_value_peak_injection
+                g_value_peak_extraction = kernel.g_value_peak_extraction
 
                 # convolution to get the monthly results
                 results = convolve(self.load.monthly_average_injection_power_simulation_period * 1000,
-                                   g_value_differences)[
+                                   kernel.g_value_differences)[
                           : 12 * self.simulation_period]
 
                 # calculation the borehole wall temperature for every month i
@@ -1702,21 +3108,18 @@ class Borefield(BaseClass):
                     raise ValueError("There is no hourly resolution available!")
 
                 hourly_load = self.load.hourly_net_resulting_injection_power
+                k_s = self.ground_data.k_s(self.calculate_depth(H, self.D), self.D)
 
-                # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
-                # g-function. This dataset is checked over and over again and is correct
-                g_values = self.gfunction(self.load.time_L4, H)
-
-                # calculation of needed differences of the g-function values. These are the weight factors in the calculation
-                # of Tb.
-                g_value_differences = np.diff(g_values, prepend=0)
+                kernel = self._convolution_kernel(H, hourly=True)
 
-                # convolution to get the monthly results
-                results = convolve(hourly_load * 1000, g_value_differences)[: len(hourly_load)]
+                # convolution to get the hourly results
+                if self._calculation_setup.load_aggregation:
+                    results = self._convolve_load_aggregation(hourly_load * 1000, kernel)
+                else:
+                    results = kernel.convolve(hourly_load * 1000)
 
                 # calculation the borehole wall temperature for every month i
-                Tb = results / (2 * pi * self.ground_data.k_s(self.calculate_depth(H, self.D), self.D)) / (
-                        H * self.number_of_boreholes) + self._Tg(H)
+                Tb = results / (2 * pi * k_s) / (H * self.number_of_boreholes) + self._Tg(H)
 
                 # now the Tf will be calculated based on
                 # Tf = Tb + Q * R_b
@@ -1746,18 +3149,234 @@ class Borefield(BaseClass):
 
             # safety
             i = 0
-            while calculate_difference(results_old,
-                                       results) > self._calculation_setup.atol and i < self._calculation_setup.max_nb_of_iterations:
-                results_old = results
-                self.load.set_results(results)
-                results = calculate_temperatures(H, hourly=hourly)
-                i += 1
+            if self._calculation_setup.anderson_acceleration:
+                results, i = self._anderson_acceleration(results_old, results,
+                                                         lambda: calculate_temperatures(H, hourly=hourly))
+            else:
+                while calculate_difference(results_old,
+                                           results) > self._calculation_setup.atol and i < self._calculation_setup.max_nb_of_iterations:
+                    results_old = results
+                    self.load.set_results(results)
+                    results = calculate_temperatures(H, hourly=hourly)
+                    i += 1
+            # the two temperature calculations before the iteration and one for every iteration
+            self.nb_of_iterations_building_load = i + 2
             self.results = results
             self.load.set_results(results)
             return
 
+        self.nb_of_iterations_building_load = 0
         self.results = calculate_temperatures(H, hourly=hourly)
 
+    def _anderson_acceleration(self, results_old: Union[ResultsMonthly, ResultsHourly],
+                               results: Union[ResultsMonthly, ResultsHourly],
+                               calculate_temperatures: Callable[[], Union[ResultsMonthly, ResultsHourly]]) \
+            -> Tuple[Union[ResultsMonthly, ResultsHourly], int]:
+        """
+        This function solves the coupling between the building load and the fluid temperatures with Anderson
+        acceleration [#Walker]_. Instead of passing the last calculated temperatures to the load, as in the plain fixed-point
+        iteration, the temperatures that are passed are a combination of the previous iterations which minimises
+        the difference between the temperatures that are set in the load and the temperatures that are calculated with
+        that load. The number of previous iterations that is used, is given by the anderson_memory in the
+        calculation setup.
+
+        Parameters
+        ----------
+        results_old : ResultsMonthly or ResultsHourly
+            Temperatures which are set in the load
+        results : ResultsMonthly or ResultsHourly
+            Temperatures calculated with the load based on results_old
+        calculate_temperatures : Callable
+            Function that returns the temperatures for the current state of the load
+
+        Returns
+        -------
+        ResultsMonthly or ResultsHourly, int
+            Converged temperatures, number of iterations (i.e. the number of calls to calculate_temperatures)
+
+        References
+        ----------
+        .. [#Walker] Walker, H. F., and Ni, P. (2011). Anderson acceleration for fixed-point iterations.
+           SIAM Journal on Numerical Analysis, 49(4), 1715-1735. https://doi.org/10.1137/10078356X
+        """
+        if results.hourly:
+            def to_array(result: ResultsHourly) -> np.ndarray:
+                return np.concatenate((result.Tb, result.Tf))
+
+            def to_results(array: np.ndarray) -> ResultsHourly:
+                Tb, Tf = np.split(array, 2)
+                return ResultsHourly(borehole_wall_temp=Tb, temperature_fluid=Tf)
+        else:
+            def to_array(result: ResultsMonthly) -> np.ndarray:
+                return np.concatenate((result.Tb, result.peak_extraction, result.peak_injection,
+                                       result.monthly_extraction, result.monthly_injection))
+
+            def to_results(array: np.ndarray) -> ResultsMonthly:
+                Tb, peak_extraction, peak_injection, monthly_extraction, monthly_injection = np.split(array, 5)
+                return ResultsMonthly(borehole_wall_temp=Tb, peak_extraction=peak_extraction,
+                                      peak_injection=peak_injection, monthly_extraction=monthly_extraction,
+                                      monthly_injection=monthly_injection)
+
+        x = to_array(results_old)
+        g = to_array(results)
+        residual = g - x
+        # differences in residuals and in calculated temperatures between consecutive iterations
+        delta_residuals: list = []
+        delta_g: list = []
+
+        i = 0
+        while np.max(np.abs(residual)) > self._calculation_setup.atol and \
+                i < self._calculation_setup.max_nb_of_iterations:
+            if delta_residuals:
+                gamma = np.linalg.lstsq(np.column_stack(delta_residuals), residual, rcond=None)[0]
+                x = g - np.column_stack(delta_g) @ gamma
+            else:
+                x = g
+            self.load.set_results(to_results(x))
+            results = calculate_temperatures()
+            g_new = to_array(results)
+            residual_new = g_new - x
+
+            delta_residuals.append(residual_new - residual)
+            delta_g.append(g_new - g)
+            if len(delta_residuals) > self._calculation_setup.anderson_memory:
+                delta_residuals.pop(0)
+                delta_g.pop(0)
+            g, residual = g_new, residual_new
+            i += 1
+        return results, i
+
+    def _convolution_kernel(self, H: float, hourly: bool) -> ConvolutionKernel:
+        """
+        This function returns the convolution kernel, i.e. the g-value differences (and, for a monthly resolution,
+        the g-values for the peak durations), for a certain borehole length.
+        Kernels are stored per borehole length, time grid and ground, so that repeated temperature calculations
+        with the same borehole length (e.g. for building loads) do not need to recalculate them.
+
+        Parameters
+        ----------
+        H : float
+            Borehole length [m]
+        hourly : bool
+            True if the kernel is needed for an hourly resolution
+
+        Returns
+        -------
+        ConvolutionKernel
+            Convolution kernel
+        """
+        depth = self.calculate_depth(H, self.D)
+        key = (H, hourly, self.simulation_period,
+               tuple(self.load.UPM) if not hourly else None,
+               (self.load.peak_injection_duration, self.load.peak_extraction_duration) if not hourly else None,
+               self.ground_data.alpha(depth, self.D), self._borefield_fingerprint,
+               self.custom_gfunction.fingerprint if self.custom_gfunction is not None else None,
+               self._calculation_setup.use_precalculated_dataset, self._calculation_setup.interpolate_gfunctions,
+               self._gfunction_time_grid is not None and not hourly)
+        kernel = self._convolution_kernels.get(key)
+        if kernel is not None:
+            return kernel
+
+        if hourly:
+            # self.g-function is a function that uses the precalculated data to interpolate the correct values of the
+            # g-function. This dataset is checked over and over again and is correct
+            g_values = self.gfunction(self.load.time_L4, H)
+
+            # calculation of needed differences of the g-function values. These are the weight factors in the
+            # calculation of Tb.
+            kernel = ConvolutionKernel(np.diff(g_values, prepend=0))
+        else:
+            if self._gfunction_time_grid is not None:
+                # the g-values are calculated on another time grid, so that they are kept on this grid in the
+                # g-function store (e.g. for the cascaded sizing)
+                g_values = np.interp(self.load.time_L3, self._gfunction_time_grid,
+                                     self.gfunction(self._gfunction_time_grid, H))
+            else:
+                g_values = self.gfunction(self.load.time_L3, H)
+
+            # the g-function value of the peak with length_peak hours
+            g_value_peak_injection = self.gfunction(self.load.peak_injection_duration, H)[0]
+            if self.load.peak_injection_duration == self.load.peak_extraction_duration:
+                g_value_peak_extraction = g_value_peak_injection
+            else:
+                g_value_peak_extraction = self.gfunction(self.load.peak_extraction_duration, H)[0]
+
+            kernel = ConvolutionKernel(np.diff(g_values, prepend=0), g_value_peak_injection, g_value_peak_extraction)
+
+        self._convolution_kernels.add(key, kernel)
+        return kernel
+
+    def _convolve_load_aggregation(self, hourly_load: np.ndarray, kernel: ConvolutionKernel) -> np.ndarray:
+        """
+        This function calculates the convolution of the hourly load with the g-function differences using a two-level
+        load aggregation scheme, based on the multiple load aggregation algorithm of (Bernier et al., 2004)
+        [#BernierEtAl2004]_ and the load aggregation method of (Claesson and Javed, 2012) [#ClaessonJaved2012]_.
+        The loads in the near field (i.e. the load_aggregation_near_field most recent blocks of UPM hours) are
+        convolved hour by hour, whereas the older loads are aggregated in blocks of UPM hours. The response of these
+        aggregated blocks is calculated at the block boundaries and is linearly interpolated in between.
+
+        Note that the deviation w.r.t. the full convolution is not checked, since it depends on the variation of
+        the load within the aggregated blocks. When the near field covers the whole simulation period or the
+        simulation period is not a whole number of blocks, the full convolution is returned.
+
+        Parameters
+        ----------
+        hourly_load : np.ndarray
+            Hourly net injection power for the whole simulation period [W]
+        kernel : ConvolutionKernel
+            Convolution kernel with the hourly g-value differences
+
+        Returns
+        -------
+        np.ndarray
+            Convolution of the hourly load with the g-function differences [W]
+
+        References
+        ----------
+        .. [#BernierEtAl2004] Bernier, M. A., Pinel, P., Labib, R. and Paillot, R. (2004). A multiple load aggregation
+           algorithm for annual hourly simulations of GCHP systems. HVAC&R Research, 10 (4): 471-487.
+        .. [#ClaessonJaved2012] Claesson, J., & Javed, S. (2012). A load-aggregation method to calculate extraction
+           temperatures of borehole heat exchangers. ASHRAE Transactions, 118 (1): 530–539.
+        """
+        block = int(Borefield.UPM)
+        nb_of_hours = hourly_load.size
+        nb_of_blocks = nb_of_hours // block
+        # number of blocks in the near field
+        near = int(self._calculation_setup.load_aggregation_near_field)
+        if near < 1 or near >= nb_of_blocks or nb_of_hours % block != 0:
+            # no aggregation possible
+            return kernel.convolve(hourly_load)
+        near_field = near * block
+        nb_of_anchors = nb_of_blocks - near
+
+        # g-values at the block boundaries, so g_blocks[i] is the g-value after i blocks
+        g_value_differences = kernel.g_value_differences
+        g_blocks = np.concatenate(([0], np.cumsum(g_value_differences)[block - 1::block]))
+
+        blocks = hourly_load.reshape((nb_of_blocks, block))
+        block_average = np.mean(blocks, axis=1)
+
+        # near field, convolved hour by hour
+        results = oaconvolve(hourly_load, g_value_differences[:near_field])[:nb_of_hours]
+
+        # far field of the aggregated blocks at the block boundaries
+        far_field = np.zeros(nb_of_anchors + 1)
+        far_field[1:] = convolve(block_average, np.diff(g_blocks[near:]))[:nb_of_anchors]
+
+        # in between the block boundaries, the response of the older blocks is interpolated linearly and the
+        # loads of the block that enters the far field are added one by one (in place, per aggregated block)
+        response_entering_block = (g_blocks[near + 1] - g_blocks[near]) / block
+        slope = (far_field[1:] - far_field[:-1] - block_average[:nb_of_anchors] * block * response_entering_block) / block
+        far_field_results = results[near_field - 1:-1].reshape((nb_of_anchors, block))
+        entering_load = np.cumsum(blocks[:nb_of_anchors], axis=1)
+        entering_load -= blocks[:nb_of_anchors]
+        entering_load *= response_entering_block
+        far_field_results += entering_load
+        far_field_results += far_field[:-1, np.newaxis]
+        far_field_results += slope[:, np.newaxis] * np.arange(block)
+        results[-1] += far_field[-1]
+        return results
+
     def set_options_gfunction_calculation(self, options: dict) -> None:
         """
         This function sets the options for the gfunction calculation of pygfunction.
@@ -1774,6 +3393,7 @@ class Borefield(BaseClass):
         None
         """
         self.gfunction_calculation_object.set_options_gfunction_calculation(options)
+        self._convolution_kernels.clear()
 
     def gfunction(self, time_value: ArrayLike, H: float = None) -> np.ndarray:
         """
@@ -1816,7 +3436,7 @@ class Borefield(BaseClass):
                 self.H = H
             return self.gfunction_calculation_object.calculate(
                 time_value, self.borefield, self.ground_data.alpha(self.depth, self.D),
-                interpolate=self._calculation_setup.interpolate_gfunctions
+                interpolate=self._calculation_setup.interpolate_gfunctions, fingerprint=self._borefield_fingerprint
             )
 
         ## 1 bypass any possible precalculated g-functions
@@ -1999,8 +3619,8 @@ class Borefield(BaseClass):
             self.calculate_temperatures()
 
         # calculate max/min fluid temperatures
-        max_temp = np.max(self.results.peak_injection)
-        min_temp = np.min(self.results.peak_extraction)
+        max_temp = self.results.max_peak_injection
+        min_temp = self.results.min_peak_extraction
 
         # calculate temperature difference w.r.t. the limits
         DT_max = -self.Tf_max + max_temp + 1000  # + 1000 to have no problems with negative temperatures
@@ -1 +1,2 @@
 from .optimise_load_profile import optimise_load_profile_power, optimise_load_profile_energy
+from .size_many import size_many, SizingResult
@@ -93,11 +93,11 @@ def optimise_load_profile_power(
         borefield.calculate_temperatures(length=borefield.H, hourly=use_hourly_resolution)
 
         # deviation from minimum temperature
-        if abs(min(borefield.results.peak_extraction) - borefield.Tf_min) > temperature_threshold:
+        if abs(borefield.results.min_peak_extraction - borefield.Tf_min) > temperature_threshold:
             # check if it goes below the threshold
-            if min(borefield.results.peak_extraction) < borefield.Tf_min:
+            if borefield.results.min_peak_extraction < borefield.Tf_min:
                 peak_heat_load = max(0.1, peak_heat_load - 1 * max(1, 10 * (
-                        borefield.Tf_min - min(borefield.results.peak_extraction))))
+                        borefield.Tf_min - borefield.results.min_peak_extraction)))
             else:
                 peak_heat_load = min(init_peak_heating, peak_heat_load * 1.01)
                 if peak_heat_load == init_peak_heating:
@@ -106,11 +106,11 @@ def optimise_load_profile_power(
             heat_ok = True
 
         # deviation from maximum temperature
-        if abs(np.max(borefield.results.peak_injection) - borefield.Tf_max) > temperature_threshold:
+        if abs(borefield.results.max_peak_injection - borefield.Tf_max) > temperature_threshold:
             # check if it goes above the threshold
-            if np.max(borefield.results.peak_injection) > borefield.Tf_max:
+            if borefield.results.max_peak_injection > borefield.Tf_max:
                 peak_cool_load = max(0.1, peak_cool_load - 1 * max(1, 10 * (
-                        -borefield.Tf_max + np.max(borefield.results.peak_injection))))
+                        -borefield.Tf_max + borefield.results.max_peak_injection)))
             else:
                 peak_cool_load = min(init_peak_cooling, peak_cool_load * 1.01)
                 if peak_cool_load == init_peak_cooling:
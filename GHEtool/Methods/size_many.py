@@ -0,0 +1,161 @@
+"""
+This file contains the functionality to size many borefields at once in a process pool.
+"""
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Union
+
+from GHEtool.VariableClasses import GFunction, GFunctionDiskCache, GFunctionSharedCache
+
+
+class SizingResult:
+    """
+    This class contains the result of a single sizing of size_many.
+    """
+
+    __slots__ = 'length', 'limiting_quadrant', 'time', 'error'
+
+    def __init__(self, length: float = None, limiting_quadrant: int = None, time: float = 0.,
+                 error: Exception = None):
+        """
+
+        Parameters
+        ----------
+        length : float
+            Required borehole length [m], None if the sizing failed
+        limiting_quadrant : int
+            Limiting quadrant of the sizing, None if the sizing failed
+        time : float
+            Wall time of the sizing [s]
+        error : Exception
+            Error that was raised during the sizing, None if the sizing succeeded
+        """
+        self.length: float = length
+        self.limiting_quadrant: int = limiting_quadrant
+        self.time: float = time
+        self.error: Exception = error
+
+    @property
+    def success(self) -> bool:
+        """
+        This function returns whether or not the sizing succeeded.
+
+        Returns
+        -------
+        bool
+            True if the sizing succeeded
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if not self.success:
+            return f'Sizing failed: {self.error!r} ({self.time:.2f} s)'
+        return f'Borehole length [m]: {self.length}, limiting quadrant: {self.limiting_quadrant} ({self.time:.2f} s)'
+
+
+def _set_gfunction_cache(cache: GFunctionDiskCache) -> None:
+    """
+    This function sets the cache with the g-values calculated with pygfunction in the current (worker) process.
+
+    Parameters
+    ----------
+    cache : GFunctionDiskCache
+        Cache that is shared by all the sizings
+
+    Returns
+    -------
+    None
+    """
+    GFunction.disk_cache = cache
+
+
+def _size(borefield, method: str, kwargs: dict) -> SizingResult:
+    """
+    This function sizes a single borefield for size_many. Every error during the sizing is captured in the result.
+
+    Parameters
+    ----------
+    borefield : Borefield
+        Borefield object
+    method : str
+        Sizing method ('L2', 'L3' or 'L4')
+    kwargs : dict
+        Other options for the sizing (see Borefield.size)
+
+    Returns
+    -------
+    SizingResult
+        Result of the sizing
+    """
+    start = time.perf_counter()
+    try:
+        length = borefield.size(L2_sizing=method == 'L2', L3_sizing=method == 'L3', L4_sizing=method == 'L4', **kwargs)
+    except Exception as error:
+        return SizingResult(time=time.perf_counter() - start, error=error)
+    return SizingResult(length, borefield.limiting_quadrant, time.perf_counter() - start)
+
+
+def size_many(borefields: list, method: str = 'L3', workers: Union[int, None] = None, cache_folder: str = None,
+              **kwargs) -> List[SizingResult]:
+    """
+    This function sizes many borefields (e.g. with different loads, ground data or layouts) in a process pool.
+    The g-values calculated with pygfunction are shared between all the sizings via a GFunctionSharedCache, so
+    sizings of the same borefield layout and ground reuse the g-values that were calculated before in any process.
+    Only these exact g-values are shared and every borefield keeps its own g-function object, so the results do not
+    depend on the number of workers or on which sizings are done in the same process.
+    Errors during a sizing, like UnsolvableDueToTemperatureGradient or MaximumNumberOfIterations, are captured per
+    borefield. The borefields themselves are not changed, since they are sized in the worker processes.
+
+    Parameters
+    ----------
+    borefields : list
+        List of Borefield objects
+    method : str
+        Sizing method ('L2', 'L3' or 'L4')
+    workers : int
+        Number of worker processes. If None, the number of processors is used. If 1, the borefields are sized in the
+        current process, one after the other (and the borefields are changed).
+    cache_folder : str
+        Folder of the shared cache with the g-values. If None, GFunction.disk_cache is used when it is set and
+        otherwise a temporary folder, which is removed afterwards.
+    kwargs : dict
+        Other options for the sizing (see Borefield.size)
+
+    Returns
+    -------
+    list
+        List of SizingResult objects, in the same order as the borefields
+
+    Raises
+    ------
+    ValueError
+        When the method is not 'L2', 'L3' or 'L4'
+    """
+    if method not in ('L2', 'L3', 'L4'):
+        raise ValueError(f'The sizing method {method} does not exist. Please choose L2, L3 or L4.')
+    workers = workers if workers is not None else os.cpu_count()
+    previous_cache = GFunction.disk_cache
+    temporary_folder = None
+    if cache_folder is not None:
+        cache = GFunctionSharedCache(cache_folder)
+    elif previous_cache is not None:
+        cache = previous_cache
+    else:
+        temporary_folder = tempfile.mkdtemp()
+        cache = GFunctionSharedCache(temporary_folder)
+    try:
+        if workers == 1:
+            _set_gfunction_cache(cache)
+            return [_size(borefield, method, kwargs) for borefield in borefields]
+        with ProcessPoolExecutor(max_workers=min(workers, max(len(borefields), 1)), initializer=_set_gfunction_cache,
+                                 initargs=(cache,)) as executor:
+            return list(executor.map(_size, borefields, repeat(method), repeat(kwargs)))
+    finally:
+        GFunction.disk_cache = previous_cache
+        if temporary_folder is not None:
+            # the memory mapped g-values can still be in use on Windows, so errors are ignored
+            shutil.rmtree(temporary_folder, ignore_errors=True)
@@ -53,10 +53,19 @@ class UnsolvableDueToTemperatureGradient(Exception):
     def __init__(self):
         super().__init__('No solution can be found due to the temperature gradient. Please increase the field size.')
 
+    def __reduce__(self):
+        # so the error can be pickled (e.g. to return it from another process)
+        return self.__class__, ()
+
 
 class MaximumNumberOfIterations(RuntimeError):
     """
     This Error occurs when the maximum number of interation is reacted.
     """
     def __init__(self, iter: int):
+        self.iter: int = iter
         super().__init__(f'The maximum number of iterations {iter} is crossed. There is no size convergence.')
+
+    def __reduce__(self):
+        # so the error can be pickled (e.g. to return it from another process)
+        return self.__class__, (self.iter,)
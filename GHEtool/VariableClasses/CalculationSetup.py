@@ -16,14 +16,29 @@ class CalculationSetup(BaseClass):
 
     __slots__ = '_L2_sizing', '_L3_sizing', '_L4_sizing', 'quadrant_sizing', '_backup', \
         'atol', 'rtol', 'max_nb_of_iterations', 'interpolate_gfunctions', 'H_init', \
-        'use_precalculated_dataset', 'deep_sizing', 'force_deep_sizing'
+        'use_precalculated_dataset', 'deep_sizing', 'force_deep_sizing', 'load_aggregation', \
+        'load_aggregation_near_field', 'anderson_acceleration', 'anderson_memory', \
+        'windowed_sizing', 'results_dtype', 'results_memory_map', 'results_folder', 'sizing_engine', \
+        'parallel_quadrants', 'cascaded_sizing', 'predict_limiting_quadrant', 'sizing_cache', \
+        'bracketed_deep_sizing', 'keep_gfunction_data'
+
+    # options that only determine how the sizing is calculated or how its results are stored, but not the results
+    _OPTIONS_WITHOUT_INFLUENCE = ('_backup', 'results_dtype', 'results_memory_map', 'results_folder',
+                                  'parallel_quadrants', 'sizing_cache')
 
     def __init__(self, quadrant_sizing: int = 0,
                  L2_sizing: bool = None, L3_sizing: bool = None, L4_sizing: bool = None,
                  atol: float = 0.05, rtol: float = 0.005, max_nb_of_iterations: int = 40,
                  interpolate_gfunctions: bool = None, H_init: float = 100.,
                  use_precalculated_dataset: bool = True, deep_sizing: bool = False,
-                 force_deep_sizing: bool = False):
+                 force_deep_sizing: bool = False, load_aggregation: bool = False,
+                 load_aggregation_near_field: int = 12, anderson_acceleration: bool = False,
+                 anderson_memory: int = 5, windowed_sizing: bool = False, results_dtype: type = np.float64,
+                 results_memory_map: bool = False, results_folder: str = None,
+                 sizing_engine: str = 'proportional', parallel_quadrants: bool = False,
+                 cascaded_sizing: bool = False, predict_limiting_quadrant: bool = False,
+                 sizing_cache: bool = False, bracketed_deep_sizing: bool = False,
+                 keep_gfunction_data: bool = False):
         """
 
         Parameters
@@ -61,6 +76,64 @@ class CalculationSetup(BaseClass):
             sizing is done again with this other methodology.
         force_deep_sizing : bool
             True when deep_sizing should be done always
+        load_aggregation : bool
+            True if the hourly temperature profile should be calculated with a load aggregation scheme instead of
+            a full convolution of all the hourly loads. The most recent loads are still convolved hour by hour, whereas
+            older loads are aggregated into monthly blocks. This is faster for long simulation periods.
+        load_aggregation_near_field : int
+            Number of months that are convolved hour by hour in the load aggregation scheme. This is a heuristic:
+            the deviation w.r.t. the full hourly convolution depends on the variation of the load within a month
+            (typically in the order of 0.01 K) and is not checked. If the near field covers the whole simulation
+            period, the full convolution is used.
+        anderson_acceleration : bool
+            True if the iteration between a building load and the fluid temperatures should be accelerated with
+            Anderson acceleration instead of a plain fixed-point iteration. This reduces the number of
+            temperature calculations for loads with temperature dependent efficiencies.
+        anderson_memory : int
+            Number of previous iterations that are used in the Anderson acceleration.
+        windowed_sizing : bool
+            True if, for a sizing in quadrant 1 to 4 with the L3 or L4 method, only the temperatures in the first or
+            last year should be calculated during the iteration. This is only used when the load is the same for every
+            year and does not depend on the temperatures.
+        results_dtype : type
+            Data type in which the calculated temperatures are stored after Borefield.size or
+            Borefield.calculate_temperatures. np.float32 halves the memory use of the results w.r.t. the default
+            np.float64. The temperatures are always calculated in np.float64.
+        results_memory_map : bool
+            True if the calculated temperatures should be stored in memory-mapped .npy files instead of in memory,
+            after Borefield.size or Borefield.calculate_temperatures.
+            These files can be opened by other processes and are removed when the results are deleted.
+        results_folder : str
+            Folder for the memory-mapped files. If None, the default temporary folder is used.
+        sizing_engine : str
+            Method to update the borehole length in the L3 and L4 sizing. 'proportional' scales the borehole length
+            with the ratio of the temperature differences w.r.t. the ground temperature. 'secant' solves for the
+            borehole length at which the limiting temperature equals the temperature limit, with a secant method
+            that is safeguarded by bisection as soon as the solution is bracketed.
+        parallel_quadrants : bool
+            True if the sizings for the maximum and the minimum temperature (i.e. the relevant quadrants) should be
+            calculated concurrently in a thread pool, each on its own copy of the borefield.
+        cascaded_sizing : bool
+            True if the L4 sizing should start from the borehole lengths of an L3 sizing. The g-functions of this L3
+            sizing are calculated on the time grid of the L4 sizing, so that they can be reused in the L4 iterations.
+        predict_limiting_quadrant : bool
+            True if the limiting quadrant should be predicted with the L2 method before the L3 or L4 sizing. When the
+            minimum temperature is predicted to be limiting, the sizing for the maximum temperature is skipped if
+            the sizing for the minimum temperature also satisfies the maximum temperature limit.
+        sizing_cache : bool
+            True if the borehole length and limiting quadrant of the sizing should be stored in the sizing cache of
+            the borefield (Borefield.sizing_cache). When the borefield is sized again with exactly the same inputs,
+            the stored borehole length is returned without a new sizing. Only the temperatures for this borehole
+            length are calculated again (except for an L2 sizing).
+        bracketed_deep_sizing : bool
+            True if the deep sizing should first bracket the smallest borehole length that satisfies the maximum
+            temperature limit and afterwards find it with regula falsi, instead of iterating with the deep sizing
+            estimate from 20 m onwards. This limits the number of temperature calculations.
+        keep_gfunction_data : bool
+            True if the previously calculated g-values should be kept when another borefield or ground data is set,
+            so they can be reused when the g-functions of a previous borefield or ground are needed again (e.g. in a
+            loop over different borefields). Note that the result of a sizing can then (slightly) depend on the
+            previous calculations, since the g-values can be interpolated.
 
         References
         ----------
@@ -81,6 +154,21 @@ class CalculationSetup(BaseClass):
         self.use_precalculated_dataset: bool = use_precalculated_dataset
         self.deep_sizing: bool = deep_sizing
         self.force_deep_sizing: bool = force_deep_sizing
+        self.load_aggregation: bool = load_aggregation
+        self.load_aggregation_near_field: int = load_aggregation_near_field
+        self.anderson_acceleration: bool = anderson_acceleration
+        self.anderson_memory: int = anderson_memory
+        self.windowed_sizing: bool = windowed_sizing
+        self.results_dtype: type = results_dtype
+        self.results_memory_map: bool = results_memory_map
+        self.results_folder: str = results_folder
+        self.sizing_engine: str = sizing_engine
+        self.parallel_quadrants: bool = parallel_quadrants
+        self.cascaded_sizing: bool = cascaded_sizing
+        self.predict_limiting_quadrant: bool = predict_limiting_quadrant
+        self.sizing_cache: bool = sizing_cache
+        self.bracketed_deep_sizing: bool = bracketed_deep_sizing
+        self.keep_gfunction_data: bool = keep_gfunction_data
 
         self._backup: CalculationSetup = None
 
@@ -102,6 +190,19 @@ class CalculationSetup(BaseClass):
         """
         self._set_sizing_setup(kwargs)
 
+    def _options_with_influence(self) -> dict:
+        """
+        This function returns all the options that can influence the result of a sizing, i.e. all the options except
+        the ones that only determine how the sizing is calculated or how its results are stored (e.g. the folder of
+        the memory-mapped results or the concurrent sizing of the quadrants).
+
+        Returns
+        -------
+        dict
+            Dictionary with the name and value of the options
+        """
+        return {key: getattr(self, key) for key in self.__slots__ if key not in self._OPTIONS_WITHOUT_INFLUENCE}
+
     def _set_sizing_setup(self, kwargs) -> None:
         """
         This method sets all the variables in the SizingSetup class.
@@ -141,6 +242,8 @@ class CalculationSetup(BaseClass):
                 if val is not None:
                     if key == "quadrant_sizing" and val not in (0, 1, 2, 3, 4):
                         raise ValueError(f'The quadrant {val} does not exist!')
+                    if key == "sizing_engine" and val not in ('proportional', 'secant'):
+                        raise ValueError(f'The sizing engine {val} does not exist!')
                     self.__setattr__(key, val)
             elif key != 'self' and key not in sizing_vars:
                 raise ValueError(f'The variable {key} is not a valid options!')
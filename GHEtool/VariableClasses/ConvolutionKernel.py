@@ -0,0 +1,131 @@
+"""
+This file contains the ConvolutionKernel class and the ConvolutionKernelCache in which these kernels are stored.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable
+
+import numpy as np
+from scipy.fft import next_fast_len, rfft, irfft
+
+
+class ConvolutionKernel:
+    """
+    This class contains the g-value differences for a certain borehole length, time grid and ground,
+    which are the weight factors in the calculation of the borehole wall temperature.
+    The real Fourier transform of these differences is stored as well, so that a convolution with a new load vector
+    only requires the transformation of that load vector.
+    The g-value differences for multiple borehole lengths can be stacked in a 2D-array (one row per borehole length),
+    so that the load is convolved with all of them at once.
+    """
+
+    def __init__(self, g_value_differences: np.ndarray, g_value_peak_injection: float = None,
+                 g_value_peak_extraction: float = None):
+        """
+
+        Parameters
+        ----------
+        g_value_differences : np.ndarray
+            Differences between consecutive g-values (1D) or stacked differences for multiple borehole lengths (2D)
+        g_value_peak_injection : float or np.ndarray
+            g-value for the peak injection duration (only for a monthly resolution)
+        g_value_peak_extraction : float or np.ndarray
+            g-value for the peak extraction duration (only for a monthly resolution)
+        """
+        self.g_value_differences: np.ndarray = g_value_differences
+        self.g_value_peak_injection: float | np.ndarray = g_value_peak_injection
+        self.g_value_peak_extraction: float | np.ndarray = g_value_peak_extraction
+
+        self._fft: np.ndarray = np.array([])
+        self._fft_length: int = 0
+
+    def convolve(self, load: np.ndarray) -> np.ndarray:
+        """
+        This function convolves the load with the g-value differences and returns the values for the
+        time steps of the load.
+        The Fourier transform of the g-value differences is only calculated once for every length of the load.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Load vector [W] or 2D-array with one load vector per row
+
+        Returns
+        -------
+        np.ndarray
+            Convolution of the load with the g-value differences for the time steps of the load
+            (one row per borehole length for stacked g-value differences)
+        """
+        size = np.shape(load)[-1]
+        # the fft should be long enough so the first size values are not polluted by the circular convolution
+        fft_length = next_fast_len(size + self.g_value_differences.shape[-1] - 1, real=True)
+        if fft_length != self._fft_length:
+            self._fft = rfft(self.g_value_differences, fft_length, axis=-1)
+            self._fft_length = fft_length
+        return irfft(rfft(load, fft_length) * self._fft, fft_length, axis=-1)[..., :size]
+
+
+class ConvolutionKernelCache:
+    """
+    This class contains a limited number of previously calculated convolution kernels.
+    If a new kernel is added when the cache is full, the oldest kernel is removed.
+    """
+
+    def __init__(self, length: int = 2):
+        """
+
+        Parameters
+        ----------
+        length : int
+            Maximum number of kernels in the cache
+        """
+        self.length: int = length
+        self._kernels: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable) -> ConvolutionKernel | None:
+        """
+        This function returns the kernel for a given key. If there is no such kernel, None is returned.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the kernel
+
+        Returns
+        -------
+        ConvolutionKernel or None
+        """
+        return self._kernels.get(key)
+
+    def add(self, key: Hashable, kernel: ConvolutionKernel) -> None:
+        """
+        This function adds a kernel to the cache. If the cache is full, the oldest kernel is removed.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the kernel
+        kernel : ConvolutionKernel
+            Kernel to be stored
+
+        Returns
+        -------
+        None
+        """
+        if len(self._kernels) >= self.length:
+            self._kernels.popitem(last=False)
+        self._kernels[key] = kernel
+
+    def clear(self) -> None:
+        """
+        This function removes all the kernels from the cache.
+
+        Returns
+        -------
+        None
+        """
+        self._kernels.clear()
+
+    def __len__(self) -> int:
+        return len(self._kernels)
@@ -11,6 +11,7 @@ import numpy as np
 import pygfunction as gt
 from scipy import interpolate
 from GHEtool.logger.ghe_logger import ghe_logger
+from .SizingCache import borefield_fingerprint, stable_hash
 
 
 def _time_values(dt=3600., t_max=100. * 8760 * 3600.) -> np.array:
@@ -48,6 +49,8 @@ class CustomGFunction:
     DEFAULT_LENGTH_ARRAY: np.ndarray = np.arange(0, 351, 25)  # m
     DEFAULT_LENGTH_ARRAY[0] = 10  # m
     DEFAULT_TIME_ARRAY: np.ndarray = _time_values()  # sec
+    # fingerprint of the borefield of the dataset (empty for datasets that were dumped without one)
+    borefield_fingerprint: str = ''
 
     def __init__(self, time_array: np.ndarray = None, borehole_length_array: np.ndarray = None, options: dict = None):
         """
@@ -107,6 +110,19 @@ class CustomGFunction:
         # initialise gvalue array
         self.gvalues_array = np.zeros((self.borehole_length_array.size, self.time_array.size))
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        This function returns a fingerprint of the dataset, i.e. a hash of the time values, borehole lengths,
+        g-values and options, so that datasets with the same content have the same fingerprint.
+
+        Returns
+        -------
+        str
+            Hexadecimal sha256 hash
+        """
+        return stable_hash(self)
+
     def calculate_gfunction(self, time_value: Union[list, float, np.ndarray], borehole_length: float,
                             check: bool = False) -> np.ndarray:
         """
@@ -215,6 +231,8 @@ class CustomGFunction:
         if not "method" in self.options:
             self.options["method"] = "equivalent"
 
+        self.borefield_fingerprint = borefield_fingerprint(borefield)
+
         for idx, borehole_length in enumerate(self.borehole_length_array):
             ghe_logger.info(f'Start length: {borehole_length}')
 
@@ -283,6 +301,9 @@ class CustomGFunction:
     def __eq__(self, other):
         if not isinstance(other, CustomGFunction):
             return False
+        # datasets of different borefields are unequal, without comparing all the g-values
+        if self.borefield_fingerprint != other.borefield_fingerprint:
+            return False
         for i in iter(self.__dict__):
             if isinstance(getattr(self, i), np.ndarray) or isinstance(getattr(self, i), list):
                 if not np.array_equal(getattr(self, i), getattr(other, i)):
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import warnings
+from collections import OrderedDict
 from typing import List, Tuple, Union
 
 import numpy as np
@@ -8,6 +9,8 @@ import pygfunction as gt
 from scipy import interpolate
 
 from .CustomGFunction import _time_values
+from .GFunctionCache import GFunctionDiskCache
+from .SizingCache import borefield_fingerprint, stable_hash
 
 from GHEtool.VariableClasses.Cylindrical_correction import update_pygfunction
 
@@ -83,11 +86,26 @@ class GFunction:
     Class that contains the functionality to calculate gfunctions and to store
     previously calculated values that can potentially be used for interpolation to save time.
     This is done by storing previously calculated gvalues.
+    The gvalues are stored per borefield and options for the g-function calculation, so switching between
+    borefields does not remove the previously calculated data. When there are more than max_nb_of_entries stores or
+    the stored data exceeds max_memory, the least recently used store is removed.
+    By default, the gvalues are stored per ground thermal diffusivity alpha as well.
+    Since the g-function of a borefield only depends on the time through the dimensionless time 9 alpha t / H²,
+    the stored gvalues can be used for another alpha, by scaling the time values with the ratio of both alphas.
+    This is meant for parametric studies over the ground properties and is only done when alpha_ratio is set larger
+    than one. In that case, the range of the stored time values is extended, so all alphas between
+    alpha / alpha_ratio and alpha * alpha_ratio can be interpolated, as long as the smallest requested time value is
+    large enough (e.g. monthly time values). Note that the interpolated gvalues differ slightly
+    (typically less than 1%) from the calculated ones, so the sizing results can differ slightly as well.
     """
 
     DEFAULT_TIMESTEPS: np.ndarray = _time_values()
     DEFAULT_NUMBER_OF_TIMESTEPS: int = DEFAULT_TIMESTEPS.size
     DEFAULT_STORE_PREVIOUS_VALUES: bool = True
+    DEFAULT_MAX_NB_OF_ENTRIES: int = 8
+    DEFAULT_MAX_MEMORY: float = 200 * 1024 ** 2  # bytes
+    # persistent cache that is consulted before the g-values are calculated with pygfunction (None if not used)
+    disk_cache: GFunctionDiskCache = None
 
     def __init__(self):
         self._store_previous_values: bool = GFunction.DEFAULT_STORE_PREVIOUS_VALUES
@@ -95,6 +113,7 @@ class GFunction:
         self.options: dict = {'method': 'equivalent'}
         self.alpha: float = 0.
         self.borefield: list[gt.boreholes.Borehole] = []
+        self.borefield_fingerprint: str = ''
         self.borehole_length_array: np.ndarray = np.array([])
         self.time_array: np.ndarray = np.array([])
         self.previous_gfunctions: np.ndarray = np.array([])
@@ -103,9 +122,21 @@ class GFunction:
 
         self.no_extrapolation: bool = True
         self.threshold_borehole_length_interpolation: float = .25  # %
+        # ratio by which the range of the stored time values is extended, so the gvalues can be used for other alphas
+        # (only if larger than one)
+        self.alpha_ratio: float = 1.
 
         self.fifo_list: FIFO = FIFO(8)
 
+        # stored data of other borefields and options, with the least recently used first
+        self.max_nb_of_entries: int = GFunction.DEFAULT_MAX_NB_OF_ENTRIES
+        self.max_memory: float = GFunction.DEFAULT_MAX_MEMORY
+        self._entries: OrderedDict = OrderedDict()
+        self._key: str = ''
+        self._options: dict = {}
+        self.nb_of_hits: int = 0
+        self.nb_of_misses: int = 0
+
     @property
     def store_previous_values(self) -> bool:
         """
@@ -136,12 +167,14 @@ class GFunction:
         self._store_previous_values_backup = store
 
     def calculate(self, time_value: Union[list, float, np.ndarray], borefield: List[gt.boreholes.Borehole],
-                  alpha: float, interpolate: bool = None):
+                  alpha: float, interpolate: bool = None, fingerprint: str = None):
         """
         This function returns the gvalues either by interpolation or by calculating them.
         It does so by calling the function gvalues which does this calculation.
         This calculation function also stores the previous calculated data and makes interpolations
         whenever the requested list of time_value are longer then DEFAULT_NUMBER_OF_TIMESTEPS.
+        When the fingerprint of the borefield is given, the borefield is compared with the one of the previous
+        calculated data based on this fingerprint instead of borehole by borehole.
 
         Parameters
         ----------
@@ -153,6 +186,8 @@ class GFunction:
             Thermal diffusivity of the ground [m2/s]
         interpolate : bool
             True if results should be interpolated when possible, False otherwise. If None, the default is chosen.
+        fingerprint : str
+            Fingerprint of the geometry of the borefield (see borefield_fingerprint)
 
         Returns
         -------
@@ -189,10 +224,12 @@ class GFunction:
                 # chances are we are stuck in a loop, so calculate the gfunction and do not iterate
 
                 # calculate the g-values for uniform borehole wall temperature
-                gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options).gFunc
+                gfunc_calculated = self._calculate_pygfunction(time_values, borefield, alpha)
+                self.nb_of_misses += 1
 
                 # store the calculated g-values
-                self.set_new_calculated_data(time_values, borehole_length, gfunc_calculated, borefield, alpha)
+                self.set_new_calculated_data(time_values, borehole_length, gfunc_calculated, borefield, alpha,
+                                             fingerprint)
 
                 self.fifo_list.add(borehole_length)
 
@@ -209,16 +246,30 @@ class GFunction:
                 self.previous_borehole_length = borehole_length
             # do interpolation
             interpolate = interpolate if interpolate is not None else self.store_previous_values
-            gfunc_interpolated = self.interpolate_gfunctions(time_values, borehole_length, alpha, borefield) \
-                if interpolate else np.array([])
+            gfunc_interpolated = self.interpolate_gfunctions(time_values, borehole_length, alpha, borefield,
+                                                             fingerprint) if interpolate else np.array([])
 
             # if there are g-values calculated, return them
             if np.any(gfunc_interpolated):
+                self.nb_of_hits += 1
                 return gfunc_interpolated
+            self.nb_of_misses += 1
+
+            # if there is previous calculated data for another alpha, the gvalues are calculated at the time values
+            # that correspond to the stored time values, so they can be added to the previous calculated data
+            equivalent_time_values = self._equivalent_time_values(time_values, alpha) \
+                if interpolate and self.alpha and self._check_borefield(borefield, fingerprint) else None
+            if equivalent_time_values is not None and self.alpha != alpha and \
+                    self._check_time_values(equivalent_time_values):
+                gfunc_calculated = self._calculate_pygfunction(self.time_array * self.alpha / alpha, borefield, alpha,
+                                                               self.options['method'])
+                if not np.any(gfunc_calculated < 0):
+                    self.set_new_calculated_data(self.time_array, borehole_length, gfunc_calculated, borefield,
+                                                 self.alpha, fingerprint)
+                    return self._interpolate_log_time(equivalent_time_values, self.time_array, gfunc_calculated)
 
             # calculate the g-values for uniform borehole wall temperature
-            gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
-                                                      method=self.options['method']).gFunc
+            gfunc_calculated = self._calculate_pygfunction(time_values, borefield, alpha, self.options['method'])
             if np.any(gfunc_calculated < 0):
                 warnings.warn('There are negative g-values. This can be caused by a large borehole radius.')
                 if self.use_cyl_correction_when_negative:
@@ -230,15 +281,19 @@ class GFunction:
                     backup = self.options.get('Cylindrical_correction')
 
                     self.options["cylindrical_correction"] = True
-                    gfunc_calculated = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options,
-                                                              method=self.options['method']).gFunc
+                    gfunc_calculated = self._calculate_pygfunction(time_values, borefield, alpha,
+                                                                   self.options['method'])
                     self.options["cylindrical_correction"] = backup
 
             # store the calculated g-values
-            self.set_new_calculated_data(time_values, borehole_length, gfunc_calculated, borefield, alpha)
+            self.set_new_calculated_data(time_values, borehole_length, gfunc_calculated, borefield, alpha,
+                                         fingerprint)
 
             return gfunc_calculated
 
+        # use the stored data of this borefield
+        self._select_entry(borefield, alpha, fingerprint)
+
         # get borehole_length from borefield
         borehole_length = borefield[0].H
 
@@ -252,7 +307,19 @@ class GFunction:
             # due to this many requested time values, the calculation will be slow.
             # there will be interpolation
 
-            time_value_new = _time_values(t_max=time_value[-1])
+            time_value_new = _time_values(dt=3600. / self.alpha_ratio, t_max=time_value[-1] * self.alpha_ratio)
+            if interpolate is not False and self.store_previous_values and self.alpha and \
+                    not self._check_alpha(alpha) and self._check_borefield(borefield, fingerprint) and \
+                    self._equivalent_time_values(time_value_np, alpha) is not None:
+                # there is previous calculated data for another alpha, so the time values that correspond to the
+                # stored time values are used if they cover the requested time values
+                equivalent_time_values = self.time_array * self.alpha / alpha
+                if equivalent_time_values[0] <= time_value_np[0] and equivalent_time_values[-1] >= time_value_np[-1]:
+                    # calculate g-function values
+                    gfunc_uniform_T = gvalues(equivalent_time_values, borefield, alpha, borehole_length, interpolate)
+
+                    # return interpolated values
+                    return self._interpolate_log_time(time_value_np, equivalent_time_values, gfunc_uniform_T)
 
             # calculate g-function values
             gfunc_uniform_T = gvalues(time_value_new, borefield, alpha, borehole_length, interpolate)
@@ -272,8 +339,41 @@ class GFunction:
 
         return gfunc_uniform_T
 
+    def _calculate_pygfunction(self, time_values: np.ndarray, borefield: List[gt.boreholes.Borehole], alpha: float,
+                               method: str = 'equivalent') -> np.ndarray:
+        """
+        This function calculates the gvalues with pygfunction. When there is a disk cache, the gvalues are loaded
+        from this cache if they were calculated before, and otherwise stored in it after the calculation.
+
+        Parameters
+        ----------
+        time_values : np.ndarray
+            Array with all the time values [s] for which gvalues should be calculated
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        method : str
+            Method of the gFunction class of pygfunction
+
+        Returns
+        -------
+        gvalues : np.ndarray
+            1D array with all the requested gvalues
+        """
+        if self.disk_cache is None:
+            return gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options, method=method).gFunc
+
+        key = GFunctionDiskCache.key(time_values, borefield, alpha, self.options, method)
+        gvalues = self.disk_cache.get(key, time_values)
+        if gvalues is None:
+            gvalues = gt.gfunction.gFunction(borefield, alpha, time_values, options=self.options, method=method).gFunc
+            self.disk_cache.add(key, time_values, gvalues)
+        return gvalues
+
     def interpolate_gfunctions(self, time_value: Union[list, float, np.ndarray], borehole_length: float,
-                               alpha: float, borefield: List[gt.boreholes.Borehole]) -> np.ndarray:
+                               alpha: float, borefield: List[gt.boreholes.Borehole],
+                               fingerprint: str = None) -> np.ndarray:
         """
         This function returns the gvalues by interpolation them. If interpolation is not possible, an emtpy
         array is returned.
@@ -288,6 +388,8 @@ class GFunction:
             Thermal diffusivity of the ground [m2/s]
         borefield : list[pygfunction.boreholes.Borehole]
             Borefield model for which the gvalues should be calculated
+        fingerprint : str
+            Fingerprint of the geometry of the borefield (see borefield_fingerprint)
 
         Returns
         -------
@@ -297,8 +399,14 @@ class GFunction:
         gvalues: np.ndarray = np.zeros(len(time_value))
 
         # check if interpolation is possible:
-        if not (self._check_alpha(alpha) and self._check_borefield(borefield)):
-            # the alpha and/or borefield is not in line with the precalculated data
+        if self.alpha == 0 or not self._check_borefield(borefield, fingerprint):
+            # the borefield is not in line with the precalculated data
+            return gvalues
+
+        # convert the time values to the alpha of the precalculated data
+        other_alpha = not self._check_alpha(alpha)
+        time_value = self._equivalent_time_values(time_value, alpha)
+        if time_value is None:
             return gvalues
 
         # check if interpolation of all time values can be done based on the available time values
@@ -314,6 +422,14 @@ class GFunction:
                 return gvalues
 
             # do interpolation
+            if other_alpha:
+                # interpolate in time for the nearest borehole lengths and linearly in between
+                gvalues_time = self._interpolate_log_time(time_value, self.time_array,
+                                                          np.atleast_2d(self.previous_gfunctions)[[idx_prev, idx_next]])
+                if idx_prev == idx_next:
+                    return gvalues_time[0]
+                return interpolate.interp1d(self.borehole_length_array[[idx_prev, idx_next]], gvalues_time,
+                                            axis=0)(borehole_length)
             if self.borehole_length_array.size == 1:
                 gvalues = interpolate.interpn([self.time_array], self.previous_gfunctions, time_value)
             else:
@@ -326,6 +442,31 @@ class GFunction:
         # not yet implemented
         return gvalues
 
+    @staticmethod
+    def _interpolate_log_time(time_values: np.ndarray, stored_time_values: np.ndarray,
+                              gvalues: np.ndarray) -> np.ndarray:
+        """
+        This function interpolates gvalues in time, with a monotonic cubic interpolation in the logarithm of time.
+        This is used for the gvalues of another alpha, for which the requested time values are not on the stored
+        time values. Since the stored time values are up to a factor two apart, a linear interpolation in time would
+        give large deviations for the first time values.
+
+        Parameters
+        ----------
+        time_values : np.ndarray
+            Time values [s] at which the gvalues should be interpolated
+        stored_time_values : np.ndarray
+            Time values [s] of the given gvalues
+        gvalues : np.ndarray
+            Gvalues at the stored time values (the last axis corresponds to the time)
+
+        Returns
+        -------
+        np.ndarray
+            Interpolated gvalues
+        """
+        return interpolate.PchipInterpolator(np.log(stored_time_values), gvalues, axis=-1)(np.log(time_values))
+
     @staticmethod
     def _nearest_value(array: np.ndarray, value: float) -> Tuple[int, int]:
         """
@@ -409,6 +550,38 @@ class GFunction:
         # None, None is returned
         return None, None
 
+    def _equivalent_time_values(self, time_values: Union[list, np.ndarray], alpha: float) -> Union[np.ndarray, None]:
+        """
+        This function returns the time values for which the g-function, with the alpha of the previous calculated data,
+        is equal to the g-function at the given time values with the given alpha. Since the g-function only depends on
+        the time through the dimensionless time 9 alpha t / H², these are the time values scaled with alpha / self.alpha.
+        When alpha differs from self.alpha and the gvalues should not be used for other alphas (i.e. alpha_ratio is not
+        larger than one) or the previous calculated data has too few time values to interpolate in between
+        (i.e. two subsequent time values differ more than a factor two), None is returned.
+
+        Parameters
+        ----------
+        time_values : list, np.ndarray
+            Time values [s]
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+
+        Returns
+        -------
+        np.ndarray or None
+            Equivalent time values [s] for the alpha of the previous calculated data
+        """
+        if self._check_alpha(alpha):
+            return np.asarray(time_values)
+
+        if self.alpha_ratio <= 1 or self.time_array.size < 2 or np.any(self.time_array[1:] > 2 * self.time_array[:-1]):
+            return None
+
+        time_values = np.asarray(time_values) * alpha / self.alpha
+        # remove rounding errors at the boundaries of the stored time values
+        time_values = np.where(np.isclose(time_values, self.time_array[0]), self.time_array[0], time_values)
+        return np.where(np.isclose(time_values, self.time_array[-1]), self.time_array[-1], time_values)
+
     def _check_time_values(self, time_array: np.ndarray) -> bool:
         """
         This function checks whether or not the time values are suitable for interpolation.
@@ -468,7 +641,19 @@ class GFunction:
     def remove_previous_data(self) -> None:
         """
         This function removes the previous calculated data by setting the borehole_length_array, time_array and
-        previous_gfunctions back to empty arrays.
+        previous_gfunctions back to empty arrays. The stored data of other borefields is removed as well.
+
+        Returns
+        -------
+        None
+        """
+        self._remove_current_data()
+        self._entries.clear()
+
+    def _remove_current_data(self) -> None:
+        """
+        This function removes the previous calculated data of the current borefield and options by setting the
+        borehole_length_array, time_array and previous_gfunctions back to empty arrays.
 
         Returns
         -------
@@ -479,10 +664,126 @@ class GFunction:
         self.previous_gfunctions = np.array([])
         self.alpha = 0
         self.borefield = []
+        self.borefield_fingerprint = ''
         self.fifo_list.clear()
+        self._key = ''
+        self._options = {}
+
+    def store_previous_data(self) -> None:
+        """
+        This function moves the previous calculated data of the current borefield and options to the store,
+        so it can be used again when the g-function of this borefield is requested later on.
+
+        Returns
+        -------
+        None
+        """
+        if self.previous_gfunctions.size and self._key:
+            self._entries[self._key] = (self.borefield, self.alpha, self.borehole_length_array, self.time_array,
+                                        self.previous_gfunctions, self._options, self.borefield_fingerprint)
+            self._entries.move_to_end(self._key)
+        self._remove_current_data()
+        self._remove_least_recently_used()
+
+    def _remove_least_recently_used(self) -> None:
+        """
+        This function removes the least recently used stores as long as there are more than max_nb_of_entries stores
+        (including the current one) or the previous calculated data exceeds max_memory.
+
+        Returns
+        -------
+        None
+        """
+        while self._entries and (len(self._entries) + (self.previous_gfunctions.size > 0) > self.max_nb_of_entries
+                                 or self.memory > self.max_memory):
+            self._entries.popitem(last=False)
+
+    def _entry_key(self, borefield: List[gt.boreholes.Borehole], alpha: float, fingerprint: str = None) -> str:
+        """
+        This function returns the key of the stored data for a borefield with the current options and alpha.
+        The borehole length is not taken into account, since the data for all borehole lengths is stored together.
+        Alpha is only ignored when alpha_ratio is larger than one, since the data can then be used for other alphas.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        fingerprint : str
+            Fingerprint of the geometry of the borefield. If None, it is calculated.
+
+        Returns
+        -------
+        str
+            Key of the stored data
+        """
+        fingerprint = fingerprint if fingerprint is not None else borefield_fingerprint(borefield)
+        if self.alpha_ratio > 1:
+            return stable_hash(fingerprint, self.options)
+        return stable_hash(fingerprint, alpha, self.options)
+
+    def _select_entry(self, borefield: List[gt.boreholes.Borehole], alpha: float, fingerprint: str = None) -> None:
+        """
+        This function makes sure the current previous calculated data belongs to the given borefield, alpha and to
+        the current options. If not, the current data is moved to the store and the data of the given borefield,
+        alpha and options is taken from the store if it is available.
+
+        Parameters
+        ----------
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the gvalues should be calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        fingerprint : str
+            Fingerprint of the geometry of the borefield (see borefield_fingerprint)
+
+        Returns
+        -------
+        None
+        """
+        if not self.store_previous_values or \
+                (self._check_borefield(borefield, fingerprint) and self.options == self._options and
+                 (self.alpha_ratio > 1 or self._check_alpha(alpha))):
+            return
+        self.store_previous_data()
+        key = self._entry_key(borefield, alpha, fingerprint)
+        if key in self._entries:
+            self.borefield, self.alpha, self.borehole_length_array, self.time_array, self.previous_gfunctions, \
+                self._options, self.borefield_fingerprint = self._entries.pop(key)
+        self._key = key
+        self._remove_least_recently_used()
+
+    @property
+    def memory(self) -> int:
+        """
+        This function returns the memory of all the previous calculated data, including the stored data of other
+        borefields.
+
+        Returns
+        -------
+        int
+            Memory [bytes]
+        """
+        return sum(array.nbytes for entry in self._entries.values() for array in entry[2:5]) + \
+            self.borehole_length_array.nbytes + self.time_array.nbytes + self.previous_gfunctions.nbytes
+
+    def statistics(self) -> dict:
+        """
+        This function returns the statistics of the previous calculated data, i.e. the number of times the gvalues
+        could be interpolated from the previous calculated data (hits) and the number of times they had to be
+        calculated (misses), the number of borefields for which data is stored and the memory of this data.
+
+        Returns
+        -------
+        dict
+            Dictionary with the hits, misses, entries and memory [bytes]
+        """
+        return {'hits': self.nb_of_hits, 'misses': self.nb_of_misses,
+                'entries': len(self._entries) + (self.previous_gfunctions.size > 0), 'memory': self.memory}
 
     def set_new_calculated_data(self, time_values: np.ndarray, borehole_length: float, gvalues: np.ndarray,
-                                borefield, alpha) -> bool:
+                                borefield, alpha, fingerprint: str = None) -> bool:
         """
         This function stores the newly calculated gvalues if this is needed.
 
@@ -498,6 +799,8 @@ class GFunction:
             Borefield model for which the gvalues should be calculated
         alpha : float
             Thermal diffusivity of the ground [m2/s]
+        fingerprint : str
+            Fingerprint of the geometry of the borefield (see borefield_fingerprint)
 
         Returns
         -------
@@ -518,7 +821,7 @@ class GFunction:
             if not self._check_alpha(alpha):
                 return True
 
-            if not self._check_borefield(borefield):
+            if not self._check_borefield(borefield, fingerprint):
                 return True
 
             if not self._check_time_values(time_values):
@@ -553,13 +856,18 @@ class GFunction:
 
             return True
 
+        # use the stored data of this borefield
+        self._select_entry(borefield, alpha, fingerprint)
+
         # check if the newly calculated data should be saved
         if not check_if_data_should_be_saved():
             return False
 
         # check if the previous stored data should be removed
         if check_if_data_should_removed():
-            self.remove_previous_data()
+            key = self._key
+            self._remove_current_data()
+            self._key = key
 
         nearest_idx = 0
 
@@ -581,27 +889,39 @@ class GFunction:
         self.borehole_length_array = np.insert(self.borehole_length_array, nearest_idx, borehole_length)
         self.time_array = time_values
         self.borefield = borefield
+        self.borefield_fingerprint = fingerprint if fingerprint is not None else borefield_fingerprint(borefield)
         self.alpha = alpha
+        if not self._options:
+            self._options = dict(self.options)
+        if not self._key:
+            self._key = self._entry_key(borefield, alpha, self.borefield_fingerprint)
+        self._remove_least_recently_used()
 
         return True
 
-    def _check_borefield(self, borefield: List[gt.boreholes.Borehole]) -> bool:
+    def _check_borefield(self, borefield: List[gt.boreholes.Borehole], fingerprint: str = None) -> bool:
         """
         This function checks whether the new borefield object is equal to the previous one.
         It does so by comparing all the parameters (neglecting the borehole length).
         If the borefield objects are unequal, the borefield variable is set to the new borefield
         and all the previously saved gfunctions are deleted.
+        When the fingerprint of the new borefield is given, only the fingerprints are compared.
 
         Parameters
         ----------
         borefield : list[pygfunction.boreholes.Borehole]
             New borefield for which the gfunctions should be calculated
+        fingerprint : str
+            Fingerprint of the geometry of the new borefield (see borefield_fingerprint)
 
         Returns
         -------
         True
             True if the borefields are the same, False otherwise
         """
+        if fingerprint is not None and self.borefield_fingerprint:
+            return fingerprint == self.borefield_fingerprint
+
         # borefields are unequal if they have different number of boreholes
         if len(borefield) != len(self.borefield):
             return False
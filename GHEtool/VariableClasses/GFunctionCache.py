@@ -0,0 +1,221 @@
+"""
+This file contains the GFunctionDiskCache class, in which g-values calculated with pygfunction are stored on disk,
+so they can be reused in other Python sessions, and the GFunctionSharedCache class, in which these g-values are
+shared between processes with memory mapped files.
+"""
+from __future__ import annotations
+
+import os
+import zipfile
+from typing import List
+
+import numpy as np
+import pygfunction as gt
+
+from .SizingCache import stable_hash
+
+
+class GFunctionDiskCache:
+    """
+    This class contains the g-values of previous pygfunction calculations, stored as compressed numpy files in a folder.
+    The files are addressed by a hash of everything that determines the g-values (i.e. the geometry of all boreholes,
+    the ground thermal diffusivity, the options and method of pygfunction and the time values), so the same folder
+    can be used for different borefields and by different processes at the same time.
+    """
+
+    FILE_EXTENSION: str = '.npz'
+
+    def __init__(self, folder: str):
+        """
+
+        Parameters
+        ----------
+        folder : str
+            Folder in which the g-values are stored
+        """
+        self.folder: str = folder
+
+    @staticmethod
+    def key(time_values: np.ndarray, borefield: List[gt.boreholes.Borehole], alpha: float, options: dict,
+            method: str) -> str:
+        """
+        This function returns the key under which the g-values are stored.
+
+        Parameters
+        ----------
+        time_values : np.ndarray
+            Array with all the time values [s] for which the g-values are calculated
+        borefield : list[pygfunction.boreholes.Borehole]
+            Borefield model for which the g-values are calculated
+        alpha : float
+            Thermal diffusivity of the ground [m2/s]
+        options : dict
+            Options for the gFunction class of pygfunction
+        method : str
+            Method of the gFunction class of pygfunction
+
+        Returns
+        -------
+        str
+            Key of the g-values
+        """
+        return stable_hash(np.asarray(time_values, dtype=np.float64), borefield, alpha, options, method)
+
+    def _path(self, key: str) -> str:
+        """
+        This function returns the path of the file for a given key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+
+        Returns
+        -------
+        str
+            Path to the file
+        """
+        return os.path.join(self.folder, key + self.FILE_EXTENSION)
+
+    def get(self, key: str, time_values: np.ndarray) -> np.ndarray:
+        """
+        This function returns the stored g-values for a given key. If there are no such g-values, None is returned.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+        time_values : np.ndarray
+            Array with all the time values [s] for which the g-values are requested
+
+        Returns
+        -------
+        np.ndarray
+            Stored g-values or None
+        """
+        if not os.path.isfile(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                stored_time_values, gvalues = data['time_values'], data['gvalues']
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        if not np.array_equal(stored_time_values, time_values):
+            return None
+        return gvalues
+
+    def add(self, key: str, time_values: np.ndarray, gvalues: np.ndarray) -> None:
+        """
+        This function stores the g-values for a given key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+        time_values : np.ndarray
+            Array with all the time values [s] for which the g-values are calculated
+        gvalues : np.ndarray
+            Calculated g-values
+
+        Returns
+        -------
+        None
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        # write to a temporary file first, so other processes never read a half written file
+        temporary_path = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.savez_compressed(file, time_values=time_values, gvalues=gvalues)
+        os.replace(temporary_path, self._path(key))
+
+    def clear(self) -> None:
+        """
+        This function removes all the stored g-values from the folder.
+
+        Returns
+        -------
+        None
+        """
+        if not os.path.isdir(self.folder):
+            return
+        for file in os.listdir(self.folder):
+            if file.endswith(self.FILE_EXTENSION):
+                os.remove(os.path.join(self.folder, file))
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def __len__(self) -> int:
+        if not os.path.isdir(self.folder):
+            return 0
+        return sum(file.endswith(self.FILE_EXTENSION) for file in os.listdir(self.folder))
+
+
+class GFunctionSharedCache(GFunctionDiskCache):
+    """
+    This class contains the g-values of previous pygfunction calculations, stored as uncompressed numpy files in a
+    folder that is shared by multiple processes, e.g. the workers of a multiprocessing pool. When this folder is on a
+    memory backed file system (like /dev/shm on Linux), the g-values live in shared memory.
+    The stored g-values are memory mapped, so all processes read the same data without copying it.
+    New g-values are written to a temporary file which is renamed afterwards, so they are published at once and other
+    processes never read a half written file.
+
+    The cache is used by setting GFunction.disk_cache, which should be done in every worker (e.g. in the initializer
+    of the pool) when the processes are not forked.
+    """
+
+    FILE_EXTENSION: str = '.npy'
+
+    def get(self, key: str, time_values: np.ndarray) -> np.ndarray:
+        """
+        This function returns the stored g-values for a given key. If there are no such g-values, None is returned.
+        The g-values are a read-only view on the memory mapped file.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+        time_values : np.ndarray
+            Array with all the time values [s] for which the g-values are requested
+
+        Returns
+        -------
+        np.ndarray
+            Stored g-values or None
+        """
+        try:
+            data = np.load(self._path(key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if data.ndim != 2 or data.shape[0] != 2 or not np.array_equal(data[0], time_values):
+            return None
+        return data[1]
+
+    def add(self, key: str, time_values: np.ndarray, gvalues: np.ndarray) -> None:
+        """
+        This function stores the g-values for a given key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the g-values
+        time_values : np.ndarray
+            Array with all the time values [s] for which the g-values are calculated
+        gvalues : np.ndarray
+            Calculated g-values
+
+        Returns
+        -------
+        None
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        # write to a temporary file first, so other processes never read a half written file
+        temporary_path = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, np.vstack((time_values, gvalues)).astype(np.float64))
+        try:
+            os.replace(temporary_path, self._path(key))
+        except PermissionError:
+            # on Windows, a file that is memory mapped by another process can not be replaced,
+            # but this file already contains the same g-values
+            os.remove(temporary_path)
@@ -0,0 +1,183 @@
+"""
+This file contains the ResponseOperator class, which gives the temperature response of a borefield to a load.
+"""
+from __future__ import annotations
+
+from math import pi
+from typing import List, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.linalg import toeplitz
+
+from GHEtool.VariableClasses.ConvolutionKernel import ConvolutionKernel
+from GHEtool.VariableClasses.LoadData.Baseclasses import _LoadData, _LoadDataBuilding
+from GHEtool.VariableClasses.Result import ResultsMonthly, ResultsHourly
+
+
+class ResponseOperator:
+    """
+    For a fixed borefield and borehole length, the temperatures are linear in the load. This class contains
+    this linear operator, so that the temperatures for many load scenarios can be calculated at once.
+    For an hourly resolution, the operator is a convolution with the g-value differences, which is done with the
+    stored Fourier transform of these differences. For a monthly resolution, the operator is a dense
+    lower-triangular (Toeplitz) matrix, so that all the scenarios are calculated with a single matrix product.
+    """
+
+    def __init__(self, kernel: ConvolutionKernel, H: float, number_of_boreholes: int, k_s: float, Rb: float,
+                 Tg: float, hourly: bool):
+        """
+
+        Parameters
+        ----------
+        kernel : ConvolutionKernel
+            Convolution kernel for the borehole length
+        H : float
+            Borehole length [m]
+        number_of_boreholes : int
+            Number of boreholes
+        k_s : float
+            Ground thermal conductivity [W/mK]
+        Rb : float
+            Effective borehole thermal resistance [mK/W]
+        Tg : float
+            Undisturbed ground temperature [deg C]
+        hourly : bool
+            True if the operator has an hourly resolution
+        """
+        self.kernel: ConvolutionKernel = kernel
+        self.H: float = H
+        self.number_of_boreholes: int = number_of_boreholes
+        self.k_s: float = k_s
+        self.Rb: float = Rb
+        self.Tg: float = Tg
+        self.hourly: bool = hourly
+
+        self._matrix: np.ndarray = None
+
+    @property
+    def length(self) -> int:
+        """
+        This function returns the number of time steps of the operator.
+
+        Returns
+        -------
+        int
+            Number of time steps
+        """
+        return self.kernel.g_value_differences.size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        This function returns the dense matrix which converts a load [W] into the borehole wall temperature
+        difference with the undisturbed ground temperature. It is only calculated once.
+
+        Returns
+        -------
+        np.ndarray
+            Lower-triangular matrix with the g-value differences [K/W]
+        """
+        if self._matrix is None:
+            self._matrix = toeplitz(self.kernel.g_value_differences, np.zeros(self.length)) \
+                           / (2 * pi * self.k_s) / (self.H * self.number_of_boreholes)
+        return self._matrix
+
+    def calculate_borehole_wall_temperature(self, load: ArrayLike) -> np.ndarray:
+        """
+        This function calculates the borehole wall temperature for one or more load scenarios.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            Net injection power [kW] with one value for every time step, or a 2D-array with one scenario per row
+
+        Returns
+        -------
+        np.ndarray
+            Borehole wall temperature [deg C] with the same shape as the load
+
+        Raises
+        ------
+        ValueError
+            When the number of time steps of the load does not match the operator
+        """
+        load = np.asarray(load, dtype=np.float64)
+        if load.shape[-1] != self.length:
+            raise ValueError(f'The load has {load.shape[-1]} time steps whereas the response operator has '
+                             f'{self.length} time steps.')
+        if self.hourly:
+            return self.kernel.convolve(load * 1000) / (2 * pi * self.k_s) / (self.H * self.number_of_boreholes) \
+                + self.Tg
+        return load * 1000 @ self.matrix.T + self.Tg
+
+    def calculate(self, loads: Union[_LoadData, List[_LoadData], ArrayLike]) -> Union[ResultsMonthly, ResultsHourly]:
+        """
+        This function calculates the temperatures for one or more load scenarios.
+        For an hourly operator, the loads can either be load objects or arrays with the hourly net injection power
+        [kW] (one row per scenario). For a monthly operator, the loads should be load objects, since the
+        peak loads are needed as well. The g-values for these peaks are the ones for the peak durations of the load
+        with which the operator was built.
+
+        Parameters
+        ----------
+        loads : _LoadData, list of _LoadData or np.ndarray
+            Load scenario(s)
+
+        Returns
+        -------
+        ResultsMonthly or ResultsHourly
+            Temperatures, with one row per scenario if a list or a 2D-array of loads was given
+
+        Raises
+        ------
+        ValueError
+            When a building load is given, since it depends on the temperatures themselves
+            When load arrays are given for a monthly operator
+            When the number of time steps of the load does not match the operator
+        """
+        single = isinstance(loads, _LoadData)
+        if single:
+            loads = [loads]
+        is_object = isinstance(loads, list) and all(isinstance(load, _LoadData) for load in loads)
+        single = single or (not is_object and np.ndim(loads) == 1)
+        if is_object and any(isinstance(load, _LoadDataBuilding) for load in loads):
+            raise ValueError('The temperatures of a building load cannot be calculated with a response operator, '
+                             'since this load depends on the temperatures.')
+
+        nb_H = self.number_of_boreholes * self.H
+
+        def output(array: np.ndarray) -> np.ndarray:
+            return array[0] if single else array
+
+        if self.hourly:
+            if is_object:
+                hourly_load = np.array([load.hourly_net_resulting_injection_power for load in loads])
+            else:
+                hourly_load = np.atleast_2d(np.asarray(loads, dtype=np.float64))
+            Tb = self.calculate_borehole_wall_temperature(hourly_load)
+            Tf = Tb + hourly_load * 1000 * self.Rb / nb_H
+            return ResultsHourly(borehole_wall_temp=output(Tb), temperature_fluid=output(Tf))
+
+        if not is_object:
+            raise ValueError('For a monthly response operator, the loads should be load objects.')
+
+        def stack(name: str) -> np.ndarray:
+            return np.array([getattr(load, name) for load in loads])
+
+        baseload_injection = stack('monthly_baseload_injection_power_simulation_period')
+        baseload_extraction = stack('monthly_baseload_extraction_power_simulation_period')
+        Tb = self.calculate_borehole_wall_temperature(baseload_injection - baseload_extraction)
+        results_month_injection = Tb + baseload_injection * 1000 * self.Rb / nb_H
+        results_month_extraction = Tb - baseload_extraction * 1000 * self.Rb / nb_H
+        results_peak_injection = results_month_injection + (
+                stack('monthly_peak_injection_simulation_period') - baseload_injection) * 1000 * (
+                                         self.kernel.g_value_peak_injection / self.k_s / 2 / pi + self.Rb) / nb_H
+        results_peak_extraction = results_month_extraction - (
+                stack('monthly_peak_extraction_simulation_period') - baseload_extraction) * 1000 * (
+                                          self.kernel.g_value_peak_extraction / self.k_s / 2 / pi + self.Rb) / nb_H
+        return ResultsMonthly(borehole_wall_temp=output(Tb),
+                              peak_extraction=output(results_peak_extraction),
+                              peak_injection=output(results_peak_injection),
+                              monthly_extraction=output(results_month_extraction),
+                              monthly_injection=output(results_month_injection))
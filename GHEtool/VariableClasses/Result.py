@@ -2,10 +2,36 @@
 This file implements a Result class for temperature profiles.
 """
 import abc
+import copy
+import os
+import tempfile
+import uuid
+import weakref
+from typing import Any, Callable, Union
+
 import numpy as np
 from abc import ABC
 
 
+def _remove_file(path: str) -> None:
+    """
+    This function removes a file, if it still exists.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file
+
+    Returns
+    -------
+    None
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 class _Results(ABC):
 
     def __init__(self, borehole_wall_temp: np.ndarray = np.array([])):
@@ -17,11 +43,167 @@ class _Results(ABC):
         """
         self._Tb = borehole_wall_temp
         self.hourly = None
+        # statistics of the temperatures, which are only calculated when they are needed
+        self._statistics: dict = {}
 
     @property
     def Tb(self) -> np.ndarray:
         return self._Tb
 
+    def _statistic(self, key: tuple, function: Callable[[], Any]) -> Any:
+        """
+        This function returns a statistic of the temperatures. It is only calculated the first time it is requested.
+
+        Parameters
+        ----------
+        key : tuple
+            Name (and arguments) of the statistic
+        function : Callable
+            Function which calculates the statistic
+
+        Returns
+        -------
+        Any
+            Statistic
+        """
+        if key not in self._statistics:
+            self._statistics[key] = function()
+        return self._statistics[key]
+
+    def _per_year(self, array: np.ndarray) -> np.ndarray:
+        """
+        This function reshapes the array so that the last axis contains the time steps of a single year.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Temperature array
+
+        Returns
+        -------
+        np.ndarray
+            Temperature array with an extra axis for the years
+        """
+        return array.reshape(array.shape[:-1] + (-1, 8760 if self.hourly else 12))
+
+    @property
+    def max_peak_injection(self) -> float:
+        """
+        This function returns the maximum fluid temperature.
+
+        Returns
+        -------
+        float
+            Maximum fluid temperature [deg C]
+        """
+        return self._statistic(('max_peak_injection',), lambda: np.max(self.peak_injection, axis=-1))
+
+    @property
+    def min_peak_extraction(self) -> float:
+        """
+        This function returns the minimum fluid temperature.
+
+        Returns
+        -------
+        float
+            Minimum fluid temperature [deg C]
+        """
+        return self._statistic(('min_peak_extraction',), lambda: np.min(self.peak_extraction, axis=-1))
+
+    @property
+    def argmax_peak_injection(self) -> int:
+        """
+        This function returns the time step (month or hour) of the maximum fluid temperature.
+
+        Returns
+        -------
+        int
+            Index of the maximum fluid temperature
+        """
+        return self._statistic(('argmax_peak_injection',), lambda: np.argmax(self.peak_injection, axis=-1))
+
+    @property
+    def argmin_peak_extraction(self) -> int:
+        """
+        This function returns the time step (month or hour) of the minimum fluid temperature.
+
+        Returns
+        -------
+        int
+            Index of the minimum fluid temperature
+        """
+        return self._statistic(('argmin_peak_extraction',), lambda: np.argmin(self.peak_extraction, axis=-1))
+
+    @property
+    def max_peak_injection_per_year(self) -> np.ndarray:
+        """
+        This function returns the maximum fluid temperature for every year of the simulation period.
+
+        Returns
+        -------
+        np.ndarray
+            Maximum fluid temperature per year [deg C]
+        """
+        return self._statistic(('max_peak_injection_per_year',),
+                               lambda: np.max(self._per_year(self.peak_injection), axis=-1))
+
+    @property
+    def min_peak_extraction_per_year(self) -> np.ndarray:
+        """
+        This function returns the minimum fluid temperature for every year of the simulation period.
+
+        Returns
+        -------
+        np.ndarray
+            Minimum fluid temperature per year [deg C]
+        """
+        return self._statistic(('min_peak_extraction_per_year',),
+                               lambda: np.min(self._per_year(self.peak_extraction), axis=-1))
+
+    def violations(self, Tf_min: float, Tf_max: float) -> np.ndarray:
+        """
+        This function returns a mask with the time steps (months or hours) in which the fluid temperature is
+        outside the temperature limits.
+
+        Parameters
+        ----------
+        Tf_min : float
+            Minimum average fluid temperature [deg C]
+        Tf_max : float
+            Maximum average fluid temperature [deg C]
+
+        Returns
+        -------
+        np.ndarray
+            True for every time step that violates one of the limits
+        """
+        return self._statistic(('violations', Tf_min, Tf_max),
+                               lambda: (self.peak_injection > Tf_max) | (self.peak_extraction < Tf_min))
+
+    def first_violation(self, Tf_min: float, Tf_max: float) -> Union[int, None]:
+        """
+        This function returns the first time step (month or hour) in which the fluid temperature is outside the
+        temperature limits. If the limits are never crossed, None is returned.
+
+        Parameters
+        ----------
+        Tf_min : float
+            Minimum average fluid temperature [deg C]
+        Tf_max : float
+            Maximum average fluid temperature [deg C]
+
+        Returns
+        -------
+        int or None
+            Index of the first violation
+        """
+
+        def first() -> Union[int, None]:
+            mask = self.violations(Tf_min, Tf_max)
+            return int(np.argmax(mask)) if np.any(mask) else None
+
+        return self._statistic(('first_violation', Tf_min, Tf_max), first)
+
     @abc.abstractmethod
     def peak_extraction(self) -> np.ndarray:
         """
@@ -40,10 +222,62 @@ class _Results(ABC):
 
         """
 
+    def change_storage(self, dtype: type = np.float64, memory_map: bool = False, folder: str = None) -> None:
+        """
+        This function changes the way the temperatures are stored. They can be stored with a lower precision
+        (e.g. float32) to halve the memory use and/or in memory-mapped .npy files, so they are not kept in memory.
+        The path of these files is available as the filename of the arrays (e.g. results.Tb.filename), so other
+        processes can open them with np.load(path, mmap_mode='r') without pickling.
+        The files are removed when the results object is deleted.
+
+        Parameters
+        ----------
+        dtype : type
+            Data type of the temperatures
+        memory_map : bool
+            True if the temperatures should be stored in memory-mapped files
+        folder : str
+            Folder for the memory-mapped files. If None, the default temporary folder is used.
+
+        Returns
+        -------
+        None
+        """
+        folder = tempfile.gettempdir() if folder is None else folder
+        name = uuid.uuid4().hex
+        for key, value in self.__dict__.items():
+            if not isinstance(value, np.ndarray) or value.size == 0:
+                continue
+            if isinstance(value, np.memmap) == memory_map and value.dtype == dtype:
+                continue
+            if not memory_map:
+                self.__dict__[key] = np.array(value, dtype=dtype)
+                continue
+            path = os.path.join(folder, f'{name}{key}.npy')
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=value.shape)
+            array[:] = value
+            array.flush()
+            self.__dict__[key] = array
+            weakref.finalize(self, _remove_file, path)
+        self._statistics = {}
+
+    def __deepcopy__(self, memo):
+        # memory-mapped temperatures are shared between the copies instead of being loaded in memory
+        result = self.__class__.__new__(self.__class__)
+        memo[id(self)] = result
+        for key, value in self.__dict__.items():
+            result.__dict__[key] = value if isinstance(value, np.memmap) else copy.deepcopy(value, memo)
+        if any(isinstance(value, np.memmap) for value in self.__dict__.values()):
+            # the files should only be removed when both results objects are deleted
+            weakref.finalize(result, lambda original: None, self)
+        return result
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, self.__class__):
             return False
         for key in self.__dict__:
+            if key == '_statistics':
+                continue
             value1 = self.__dict__[key]
             value2 = other.__dict__[key]
             if not np.array_equal(value1, value2):
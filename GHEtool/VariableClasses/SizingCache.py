@@ -0,0 +1,354 @@
+"""
+This file contains the SizingCache class, in which the results of previous sizings are stored,
+the stable_hash function to calculate the keys of this cache and the borefield_fingerprint function
+to identify the geometry of a borefield.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import types
+import zipfile
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from .Result import ResultsHourly, ResultsMonthly
+
+# attributes that contain calculated data or copies of the inputs instead of inputs themselves
+_EXCLUDED_ATTRIBUTES = {'_backup', '_results', 'borehole_internal_model'}
+
+
+def _update_hash(hasher, value: Any, visited: set) -> None:
+    """
+    This function adds the content of a value to the hasher. Objects are added based on their class name and the
+    content of their attributes, so that equal objects lead to the same hash in every Python session.
+
+    Parameters
+    ----------
+    hasher : hashlib object
+        Hasher to which the content is added
+    value : Any
+        Value to be added
+    visited : set
+        Set with the ids of the objects that are already added (to avoid infinite recursion)
+
+    Returns
+    -------
+    None
+    """
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        # equal numbers have the same hash, e.g. 100 and 100.
+        hasher.update(f'number:{float(value)!r};'.encode())
+    elif value is None or isinstance(value, (bool, complex, str, bytes, np.generic)):
+        hasher.update(f'{type(value).__name__}:{value!r};'.encode())
+    elif isinstance(value, np.ndarray):
+        if value.dtype == object:
+            _update_hash(hasher, value.tolist(), visited)
+            return
+        array = np.ascontiguousarray(value)
+        hasher.update(f'ndarray:{array.dtype.str}:{array.shape};'.encode())
+        hasher.update(array.tobytes())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}:{len(value)};'.encode())
+        for item in value:
+            _update_hash(hasher, item, visited)
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(f'set:{sorted(repr(item) for item in value)};'.encode())
+    elif isinstance(value, dict):
+        hasher.update(f'dict:{len(value)};'.encode())
+        for key in sorted(value, key=repr):
+            _update_hash(hasher, key, visited)
+            _update_hash(hasher, value[key], visited)
+    elif isinstance(value, (type, types.FunctionType, types.MethodType, types.BuiltinFunctionType)):
+        hasher.update(f'{getattr(value, "__module__", "")}.{getattr(value, "__qualname__", repr(value))};'.encode())
+        code = getattr(getattr(value, '__func__', value), '__code__', None)
+        if code is not None:
+            # different lambda functions have the same name
+            hasher.update(code.co_code)
+            hasher.update(repr(code.co_consts).encode())
+    elif hasattr(value, '__dict__') or hasattr(value, '__slots__'):
+        if id(value) in visited:
+            hasher.update(b'visited;')
+            return
+        visited.add(id(value))
+        hasher.update(f'{type(value).__module__}.{type(value).__qualname__};'.encode())
+        names = set(getattr(value, '__dict__', {}))
+        for cls in type(value).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            names.update((slots,) if isinstance(slots, str) else slots)
+        for name in sorted(names - _EXCLUDED_ATTRIBUTES - {'__dict__', '__weakref__'}):
+            if hasattr(value, name):
+                hasher.update(f'{name}='.encode())
+                _update_hash(hasher, getattr(value, name), visited)
+    else:
+        hasher.update(f'{type(value).__qualname__}:{value!r};'.encode())
+
+
+def stable_hash(*values: Any) -> str:
+    """
+    This function calculates a hash of the content of the given values. Contrary to the built-in hash function,
+    this hash is the same in every Python session, so it can be used as a key for data that is stored on disk.
+
+    Parameters
+    ----------
+    values : Any
+        Values (e.g. numbers, arrays or GHEtool objects) for which the hash should be calculated
+
+    Returns
+    -------
+    str
+        Hexadecimal sha256 hash
+    """
+    hasher = hashlib.sha256()
+    _update_hash(hasher, values, set())
+    return hasher.hexdigest()
+
+
+def borefield_fingerprint(borefield: list) -> str:
+    """
+    This function calculates a fingerprint of the geometry of a borefield, i.e. a hash of the position (x, y),
+    buried depth, radius, tilt and orientation of all the boreholes. The borehole length is not taken into account,
+    so the fingerprint does not change when the borehole length changes.
+
+    Parameters
+    ----------
+    borefield : list[pygfunction.boreholes.Borehole]
+        Borefield model
+
+    Returns
+    -------
+    str
+        Hexadecimal sha256 hash
+    """
+    geometry = np.array([[borehole.x, borehole.y, borehole.D, borehole.r_b, borehole.tilt, borehole.orientation]
+                         for borehole in borefield], dtype=np.float64)
+    # adding zero makes -0. equal to 0.
+    return hashlib.sha256(np.ascontiguousarray(geometry + 0.).tobytes()).hexdigest()
+
+
+def _entry_to_arrays(entry: tuple) -> dict:
+    """
+    This function converts a result of a sizing to a dictionary with arrays, so it can be stored in a numpy file.
+
+    Parameters
+    ----------
+    entry : tuple
+        Result of a sizing with numbers and temperature results (ResultsMonthly or ResultsHourly)
+
+    Returns
+    -------
+    dict
+        Dictionary with arrays
+
+    Raises
+    ------
+    ValueError
+        When the result contains other values than numbers and temperature results
+    """
+    arrays = {'length': np.array(len(entry))}
+    for index, value in enumerate(entry):
+        if isinstance(value, ResultsMonthly):
+            arrays.update({f'{index}_type': np.array('ResultsMonthly'), f'{index}_Tb': value.Tb,
+                           f'{index}_peak_extraction': value.peak_extraction,
+                           f'{index}_peak_injection': value.peak_injection,
+                           f'{index}_monthly_extraction': value.monthly_extraction,
+                           f'{index}_monthly_injection': value.monthly_injection})
+        elif isinstance(value, ResultsHourly):
+            arrays.update({f'{index}_type': np.array('ResultsHourly'), f'{index}_Tb': value.Tb,
+                           f'{index}_Tf': value.Tf})
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            arrays.update({f'{index}_type': np.array('number'), f'{index}_value': np.array(value)})
+        else:
+            raise ValueError(f'A value of type {type(value).__name__} cannot be stored in the sizing cache on disk.')
+    return arrays
+
+
+def _entry_from_arrays(arrays) -> tuple:
+    """
+    This function converts the arrays of a numpy file back to the result of a sizing (see _entry_to_arrays).
+
+    Parameters
+    ----------
+    arrays : NpzFile or dict
+        Arrays of the result
+
+    Returns
+    -------
+    tuple
+        Result of a sizing
+    """
+    entry = []
+    for index in range(int(arrays['length'])):
+        value_type = str(arrays[f'{index}_type'])
+        if value_type == 'ResultsMonthly':
+            entry.append(ResultsMonthly(arrays[f'{index}_Tb'], arrays[f'{index}_peak_extraction'],
+                                        arrays[f'{index}_peak_injection'], arrays[f'{index}_monthly_extraction'],
+                                        arrays[f'{index}_monthly_injection']))
+        elif value_type == 'ResultsHourly':
+            entry.append(ResultsHourly(arrays[f'{index}_Tb'], arrays[f'{index}_Tf']))
+        else:
+            entry.append(arrays[f'{index}_value'].item())
+    return tuple(entry)
+
+
+class SizingCache:
+    """
+    This class contains the results of previous sizings, stored by a hash of all the inputs of the sizing.
+    The most recent results are kept in memory. If the cache is full, the least recently used result is removed.
+    When a folder is given, the results are also written to this folder as numpy files, so they can be used in other
+    Python sessions. These files are read without pickle, so no code is executed when they are loaded.
+    Therefore, the results that are stored on disk can only contain numbers and temperature results
+    (ResultsMonthly or ResultsHourly).
+    """
+
+    FILE_EXTENSION: str = '.sizing.npz'
+
+    def __init__(self, length: int = 128, folder: str = None):
+        """
+
+        Parameters
+        ----------
+        length : int
+            Maximum number of results in memory
+        folder : str
+            Folder in which the results are stored on disk. If None, the results are only stored in memory.
+        """
+        self.length: int = length
+        self.folder: str = folder
+        self._entries: OrderedDict = OrderedDict()
+
+    def _path(self, key: str) -> str:
+        """
+        This function returns the path of the file for a given key.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        str
+            Path to the file
+        """
+        return os.path.join(self.folder, key + SizingCache.FILE_EXTENSION)
+
+    def get(self, key: str) -> Any:
+        """
+        This function returns the result for a given key. If the result is not in memory, it is searched for on disk.
+        If there is no such result, None is returned.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        Any
+            Stored result or None
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if self.folder is None or not os.path.isfile(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                entry = _entry_from_arrays(data)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        self._add_to_memory(key, entry)
+        return entry
+
+    def _add_to_memory(self, key: str, entry: Any) -> None:
+        """
+        This function adds a result to the memory. If the memory is full, the least recently used result is removed.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+        entry : Any
+            Result to be stored
+
+        Returns
+        -------
+        None
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.length:
+            self._entries.popitem(last=False)
+
+    def add(self, key: str, entry: Any) -> None:
+        """
+        This function adds a result to the cache (and to the folder on disk if there is one).
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+        entry : Any
+            Result to be stored. If there is a folder, this should be a tuple with numbers and temperature results.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            When the result cannot be stored on disk
+        """
+        if self.folder is None:
+            self._add_to_memory(key, entry)
+            return
+        arrays = _entry_to_arrays(entry)
+        self._add_to_memory(key, entry)
+        os.makedirs(self.folder, exist_ok=True)
+        # write to a temporary file first, so other processes never read a half written file
+        temporary_path = f'{self._path(key)}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(temporary_path, self._path(key))
+
+    def invalidate(self, key: str) -> None:
+        """
+        This function removes the result for a given key from the memory and from the disk.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result
+
+        Returns
+        -------
+        None
+        """
+        self._entries.pop(key, None)
+        if self.folder is not None and os.path.isfile(self._path(key)):
+            os.remove(self._path(key))
+
+    def clear(self) -> None:
+        """
+        This function removes all the results from the memory and from the disk.
+
+        Returns
+        -------
+        None
+        """
+        self._entries.clear()
+        if self.folder is None or not os.path.isdir(self.folder):
+            return
+        for file in os.listdir(self.folder):
+            if file.endswith(SizingCache.FILE_EXTENSION):
+                os.remove(os.path.join(self.folder, file))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.folder is not None and os.path.isfile(self._path(key)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
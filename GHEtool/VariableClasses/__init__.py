@@ -5,6 +5,10 @@ from .PipeData import *
 from .Efficiency import *
 from .CustomGFunction import CustomGFunction, load_custom_gfunction, _time_values
 from .GFunction import GFunction, FIFO
+from .GFunctionCache import GFunctionDiskCache, GFunctionSharedCache
+from .ConvolutionKernel import ConvolutionKernel, ConvolutionKernelCache
 from .CalculationSetup import CalculationSetup
 from .Borehole import Borehole
 from .Result import ResultsMonthly, ResultsHourly, _Results
+from .ResponseOperator import ResponseOperator
+from .SizingCache import SizingCache, stable_hash, borefield_fingerprint
@@ -66,6 +66,12 @@ def test_error_quadrant():
     CalculationSetup(quadrant_sizing=0)
 
 
+def test_error_sizing_engine():
+    with pytest.raises(ValueError):
+        CalculationSetup(sizing_engine='newton')
+    CalculationSetup(sizing_engine='secant')
+
+
 def test_equal_unequal():
     setup1 = CalculationSetup(2, False, True, False)
     setup2 = CalculationSetup(2, False, True, False)
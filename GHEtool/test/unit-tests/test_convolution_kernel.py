@@ -0,0 +1,113 @@
+import copy
+
+import numpy as np
+import pygfunction as gt
+from scipy.signal import convolve
+
+from GHEtool import Borefield, GroundConstantTemperature, HourlyBuildingLoad, FOLDER, SCOP, EER
+from GHEtool.VariableClasses import ConvolutionKernel, ConvolutionKernelCache
+
+borefield_gt = gt.boreholes.rectangle_field(10, 12, 6, 6, 110, 4, 0.075)
+
+
+def test_convolve():
+    g_value_differences = np.diff(np.log(np.arange(1, 101)), prepend=0)
+    load = np.sin(np.arange(100))
+    kernel = ConvolutionKernel(g_value_differences)
+    assert np.allclose(kernel.convolve(load), convolve(load, g_value_differences)[:100])
+    # second time with the stored fft
+    fft = kernel._fft
+    assert np.allclose(kernel.convolve(load * 2), convolve(load * 2, g_value_differences)[:100])
+    assert kernel._fft is fft
+    # shorter load
+    assert np.allclose(kernel.convolve(load[:50]), convolve(load[:50], g_value_differences)[:50])
+
+
+def test_convolve_stacked():
+    g_value_differences = np.diff(np.log(np.arange(1, 101)), prepend=0)
+    load = np.sin(np.arange(100))
+    kernel = ConvolutionKernel(np.array([g_value_differences, 2 * g_value_differences]))
+    result = kernel.convolve(load)
+    assert result.shape == (2, 100)
+    assert np.allclose(result[0], convolve(load, g_value_differences)[:100])
+    assert np.allclose(result[1], 2 * convolve(load, g_value_differences)[:100])
+
+
+def test_cache():
+    cache = ConvolutionKernelCache(2)
+    kernel1 = ConvolutionKernel(np.array([1.]))
+    kernel2 = ConvolutionKernel(np.array([2.]))
+    kernel3 = ConvolutionKernel(np.array([3.]))
+    assert cache.get(1) is None
+    cache.add(1, kernel1)
+    cache.add(2, kernel2)
+    assert cache.get(1) is kernel1
+    assert len(cache) == 2
+    cache.add(3, kernel3)
+    assert len(cache) == 2
+    assert cache.get(1) is None
+    assert cache.get(3) is kernel3
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_kernel_reuse_borefield():
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_heating=SCOP(4), efficiency_cooling=EER(np.array([6, 2]), np.array([5, 30])))
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(150, hourly=True)
+    results = borefield.results
+    assert len(borefield._convolution_kernels) == 1
+    kernel = borefield._convolution_kernel(150, True)
+    assert borefield._convolution_kernel(150, True) is kernel
+    assert borefield._convolution_kernel(150, False) is not kernel
+
+    # same results without the cache
+    borefield._convolution_kernels.clear()
+    borefield.calculate_temperatures(150, hourly=True)
+    assert np.allclose(results.Tf, borefield.results.Tf)
+
+    # new ground data removes the kernels
+    borefield.set_ground_parameters(GroundConstantTemperature(2, 10))
+    assert len(borefield._convolution_kernels) == 0
+
+
+def test_kernel_reuse_borehole_length():
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_heating=SCOP(4), efficiency_cooling=EER(np.array([6, 2]), np.array([5, 30])))
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(100)
+    results = borefield.results
+    borefield.calculate_temperatures(150)
+    # the kernel for 100 m is taken from the cache, but the borehole length is still set
+    borefield.calculate_temperatures(100)
+    assert len(borefield._convolution_kernels) == 2
+    assert borefield.H == 100
+    assert all(borehole.H == 100 for borehole in borefield.borefield)
+    assert np.allclose(results.peak_injection, borefield.results.peak_injection)
+
+
+def test_kernel_custom_gfunction():
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield.create_rectangular_borefield(3, 3, 6, 6, 100, 1, 0.075)
+    borefield.create_custom_dataset()
+    kernel = borefield._convolution_kernel(100, False)
+
+    # an equal custom g-function has the same fingerprint, so the kernel is reused
+    borefield.custom_gfunction = copy.deepcopy(borefield.custom_gfunction)
+    assert borefield._convolution_kernel(100, False) is kernel
+
+    # another custom g-function gives another kernel
+    borefield.custom_gfunction.gvalues_array = borefield.custom_gfunction.gvalues_array * 1.1
+    assert borefield._convolution_kernel(100, False) is not kernel
+    assert np.allclose(borefield._convolution_kernel(100, False).g_value_differences,
+                       kernel.g_value_differences * 1.1)
@@ -4,7 +4,7 @@ import numpy as np
 import pygfunction as gt
 import pytest
 
-from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction
+from GHEtool.VariableClasses import CustomGFunction, load_custom_gfunction, borefield_fingerprint
 
 
 @pytest.fixture
@@ -110,6 +110,14 @@ def test_unequal3():
     assert not custom_gfunction == custom_gfunction2
 
 
+def test_unequal_borefield():
+    custom_gfunction = CustomGFunction()
+    custom_gfunction2 = CustomGFunction()
+    custom_gfunction2.borefield_fingerprint = borefield_fingerprint(gt.boreholes.rectangle_field(2, 2, 6, 6, 100, 4,
+                                                                                                 0.075))
+    assert not custom_gfunction == custom_gfunction2
+
+
 def test_within_range_empty():
     custom_gfunction = CustomGFunction()
     assert not custom_gfunction.within_range(np.array([1]), 5)
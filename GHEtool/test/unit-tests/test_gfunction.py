@@ -5,8 +5,8 @@ import numpy as np
 import pygfunction as gt
 from pytest import raises
 
-from GHEtool import Borefield
-from GHEtool.VariableClasses import FIFO, GFunction
+from GHEtool import Borefield, GroundConstantTemperature
+from GHEtool.VariableClasses import FIFO, GFunction, borefield_fingerprint
 
 borehole_length_array = np.array([1, 5, 6])
 borehole_length_array_empty = np.array([])
@@ -56,6 +56,26 @@ def test_unequal_borefields2():
     assert not gfunc._check_borefield(borefield2)
 
 
+def test_borefield_fingerprint():
+    borefield1 = gt.boreholes.rectangle_field(10, 10, 5, 5, 100, 4, 0.075)
+    borefield2 = gt.boreholes.rectangle_field(10, 10, 5, 5, 120, 4, 0.075)
+    borefield3 = gt.boreholes.rectangle_field(10, 10, 6, 5, 100, 4, 0.075)
+    assert borefield_fingerprint(borefield1) == borefield_fingerprint(borefield2)
+    assert borefield_fingerprint(borefield1) != borefield_fingerprint(borefield3)
+    assert borefield_fingerprint(borefield1) != borefield_fingerprint(borefield1[:-1])
+
+    gfunc = GFunction()
+    gfunc.calculate(borefield_ghe.load.time_L3, borefield1, 0.00005, fingerprint=borefield_fingerprint(borefield1))
+    assert gfunc.borefield_fingerprint == borefield_fingerprint(borefield1)
+    # only the fingerprints are compared
+    assert gfunc._check_borefield(borefield3, borefield_fingerprint(borefield2))
+    assert not gfunc._check_borefield(borefield1, borefield_fingerprint(borefield3))
+    assert not gfunc._check_borefield(borefield3)
+
+    gfunc.remove_previous_data()
+    assert gfunc.borefield_fingerprint == ''
+
+
 def test_store_previous_values():
     gfunc = GFunction()
     assert gfunc.store_previous_values
@@ -458,3 +478,136 @@ def test_negative_values():
     g_func = gfunc.calculate(time, field, 1 / 5000 / 1000, interpolate=False)
     assert np.all(g_func > 0)
     assert np.isclose(np.min(g_func), 0.14299471464245733)
+
+
+def test_multiple_borefields():
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3
+    field1 = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 1, 0.075)
+    field2 = gt.boreholes.rectangle_field(4, 3, 6, 6, 100, 1, 0.075)
+    gvalues1 = gfunc.calculate(time_values, field1, alpha)
+    gvalues2 = gfunc.calculate(time_values, field2, alpha)
+    assert gfunc.statistics()['entries'] == 2
+    assert gfunc.nb_of_misses == 2
+
+    # the data of the first borefield is not removed
+    assert np.array_equal(gvalues1, gfunc.calculate(time_values, field1, alpha))
+    assert np.array_equal(gvalues2, gfunc.calculate(time_values, field2, alpha))
+    assert gfunc.nb_of_hits == 2 and gfunc.nb_of_misses == 2
+    assert np.array_equal(gfunc.borehole_length_array, [100])
+
+    # other alpha
+    gfunc.calculate(time_values, field2, alpha * 2)
+    assert gfunc.statistics()['entries'] == 3
+    assert gfunc.memory == gfunc.statistics()['memory'] > 0
+
+    # only two stores, so the least recently used stores are removed
+    gfunc.max_nb_of_entries = 2
+    gfunc.calculate(time_values, field1, alpha)
+    assert gfunc.statistics()['entries'] == 2
+    assert gfunc.nb_of_misses == 4
+    gfunc.calculate(time_values, field2, alpha * 2)
+    assert gfunc.nb_of_misses == 4
+
+    gfunc.remove_previous_data()
+    assert gfunc.statistics()['entries'] == 0
+    assert gfunc.memory == 0
+
+
+def test_other_alpha(monkeypatch):
+    gfunc = GFunction()
+    alpha = 0.00005
+    time_values = borefield_ghe.load.time_L3
+    field = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 1, 0.075)
+    gfunc.calculate(time_values, field, alpha)
+
+    # by default, the gvalues are not used for other alphas
+    gfunc.calculate(time_values, field, alpha / 2)
+    assert gfunc.nb_of_hits == 0 and gfunc.nb_of_misses == 2
+    assert gfunc.alpha == alpha / 2
+
+    gfunc = GFunction()
+    gfunc.alpha_ratio = 1.5
+    gfunc.calculate(time_values, field, alpha)
+
+    # the g-function only depends on alpha * t, so a smaller alpha can be interpolated
+    assert np.allclose(gfunc.calculate(time_values, field, alpha / 2),
+                       GFunction().calculate(time_values, field, alpha / 2), rtol=0.001)
+    assert gfunc.nb_of_hits == 1 and gfunc.nb_of_misses == 1
+    assert gfunc.alpha == alpha
+
+    # another borehole length for another alpha is added to the same data
+    for bor in field:
+        bor.H = 120
+    gvalues = gfunc.calculate(time_values, field, alpha / 2)
+    assert np.allclose(gvalues, GFunction().calculate(time_values, field, alpha / 2), rtol=0.001)
+    assert np.array_equal(gfunc.borehole_length_array, [100, 120])
+    assert gfunc.alpha == alpha
+
+    # no pygfunction calculations for other alphas in between
+    for bor in field:
+        bor.H = 110
+    expected = [GFunction().calculate(time_values, field, alpha / ratio) for ratio in (1.5, 3)]
+
+    def calculate(*args, **kwargs):
+        raise AssertionError('pygfunction should not be called')
+
+    monkeypatch.setattr(gt.gfunction, 'gFunction', calculate)
+    assert np.allclose(gfunc.calculate(time_values, field, alpha / 1.5), expected[0], rtol=0.005)
+    assert np.allclose(gfunc.calculate(time_values, field, alpha / 3), expected[1], rtol=0.005)
+    assert gfunc.nb_of_hits == 3 and gfunc.nb_of_misses == 2
+
+    # the same alpha gives the same results as before
+    for bor in field:
+        bor.H = 120
+    assert np.array_equal(gfunc.calculate(time_values, field, alpha / 2), gvalues)
+
+    # a larger alpha outside of the range of alpha_ratio can not be interpolated
+    with raises(AssertionError):
+        gfunc.calculate(time_values, field, alpha * 2)
+
+
+def test_alpha_ratio(monkeypatch):
+    gfunc = GFunction()
+    gfunc.alpha_ratio = 2
+    alpha = 1e-6
+    time_values = borefield_ghe.load.time_L4
+    field = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 1, 0.075)
+    gfunc.calculate(time_values, field, alpha)
+    expected = {ratio: GFunction().calculate(time_values, field, alpha * ratio) for ratio in (0.5, 0.8, 1.5, 2)}
+
+    # both smaller and larger alphas are interpolated, also for hourly time values
+    def calculate(*args, **kwargs):
+        raise AssertionError('pygfunction should not be called')
+
+    monkeypatch.setattr(gt.gfunction, 'gFunction', calculate)
+    for ratio, gvalues in expected.items():
+        assert np.allclose(gfunc.calculate(time_values, field, alpha * ratio), gvalues, rtol=0.01)
+    assert gfunc.nb_of_hits == 4 and gfunc.nb_of_misses == 1
+
+    # outside of the range of alpha_ratio, the gvalues are calculated
+    with raises(AssertionError):
+        gfunc.calculate(time_values, field, alpha * 2.5)
+
+
+def test_store_previous_data_borefield():
+    borefield = Borefield()
+    borefield.ground_data = GroundConstantTemperature(3, 10)
+    borefield.create_rectangular_borefield(3, 3, 6, 6, 100, 1, 0.075)
+    borefield.gfunction(borefield_ghe.load.time_L3)
+    borefield.create_rectangular_borefield(4, 3, 6, 6, 100, 1, 0.075)
+    borefield.gfunction(borefield_ghe.load.time_L3)
+    borefield.create_rectangular_borefield(3, 3, 6, 6, 100, 1, 0.075)
+    borefield.gfunction(borefield_ghe.load.time_L3)
+    # by default, a new borefield starts from scratch
+    assert borefield.gfunction_calculation_object.statistics() == {'hits': 0, 'misses': 3, 'entries': 1,
+                                                                     'memory': borefield.gfunction_calculation_object.memory}
+
+    borefield.calculation_setup(keep_gfunction_data=True)
+    borefield.create_rectangular_borefield(4, 3, 6, 6, 100, 1, 0.075)
+    borefield.gfunction(borefield_ghe.load.time_L3)
+    borefield.create_rectangular_borefield(3, 3, 6, 6, 100, 1, 0.075)
+    borefield.gfunction(borefield_ghe.load.time_L3)
+    assert borefield.gfunction_calculation_object.statistics()['hits'] == 1
+    assert borefield.gfunction_calculation_object.statistics()['entries'] == 2
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool.VariableClasses import GFunction, GFunctionDiskCache, GFunctionSharedCache
+
+borefield = gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 1, 0.075)
+time_values = np.array([3600., 86400., 8760 * 3600.])
+alpha = 2 / 2.4 / 10 ** 6
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    GFunction.disk_cache = GFunctionDiskCache(os.path.join(tmp_path, 'gfunctions'))
+    yield GFunction.disk_cache
+    GFunction.disk_cache = None
+
+
+def test_key():
+    key = GFunctionDiskCache.key(time_values, borefield, alpha, {'method': 'equivalent'}, 'equivalent')
+    assert key == GFunctionDiskCache.key(list(time_values), gt.boreholes.rectangle_field(3, 3, 6, 6, 100, 1, 0.075),
+                                         alpha, {'method': 'equivalent'}, 'equivalent')
+    assert key != GFunctionDiskCache.key(time_values, borefield, alpha * 1.1, {'method': 'equivalent'}, 'equivalent')
+    assert key != GFunctionDiskCache.key(time_values, gt.boreholes.rectangle_field(3, 3, 6, 6, 110, 1, 0.075),
+                                         alpha, {'method': 'equivalent'}, 'equivalent')
+    assert key != GFunctionDiskCache.key(time_values, borefield, alpha, {'method': 'similarities'}, 'similarities')
+    assert key != GFunctionDiskCache.key(time_values[:2], borefield, alpha, {'method': 'equivalent'}, 'equivalent')
+
+
+def test_disk_cache(tmp_path):
+    cache = GFunctionDiskCache(os.path.join(tmp_path, 'gfunctions'))
+    assert len(cache) == 0
+    assert cache.get('a', time_values) is None
+    cache.add('a', time_values, np.arange(3.))
+    assert 'a' in cache and len(cache) == 1
+    assert np.array_equal(cache.get('a', time_values), np.arange(3.))
+    # other time values
+    assert cache.get('a', time_values[:2]) is None
+    # corrupt file
+    with open(os.path.join(cache.folder, 'b' + GFunctionDiskCache.FILE_EXTENSION), 'w') as file:
+        file.write('no numpy file')
+    assert cache.get('b', time_values) is None
+    cache.clear()
+    assert len(cache) == 0
+    assert os.listdir(cache.folder) == []
+
+
+def test_gfunction_disk_cache(disk_cache, monkeypatch):
+    gvalues = GFunction().calculate(time_values, borefield, alpha)
+    assert len(disk_cache) == 1
+    assert np.allclose(gvalues, gt.gfunction.gFunction(borefield, alpha, time_values).gFunc)
+
+    # a new g-function object does not call pygfunction
+    def calculate(*args, **kwargs):
+        raise AssertionError('pygfunction should not be called')
+
+    monkeypatch.setattr(gt.gfunction, 'gFunction', calculate)
+    assert np.array_equal(GFunction().calculate(time_values, borefield, alpha), gvalues)
+    with pytest.raises(AssertionError):
+        GFunction().calculate(time_values, borefield, alpha * 1.1)
+
+
+def test_shared_cache(tmp_path):
+    cache = GFunctionSharedCache(os.path.join(tmp_path, 'gfunctions'))
+    assert cache.get('a', time_values) is None
+    cache.add('a', time_values, np.arange(3.))
+    assert 'a' in cache and len(cache) == 1
+    gvalues = cache.get('a', time_values)
+    assert np.array_equal(gvalues, np.arange(3.))
+    # the g-values are read from the memory mapped file
+    assert isinstance(gvalues, np.memmap) and not gvalues.flags.writeable
+    assert cache.get('a', time_values[:2]) is None
+    # publish the same g-values again
+    cache.add('a', time_values, np.arange(3.))
+    assert len(cache) == 1 and os.listdir(cache.folder) == ['a' + GFunctionSharedCache.FILE_EXTENSION]
+    del gvalues
+    cache.clear()
+    assert len(cache) == 0
+
+
+def _calculate_gvalues(folder: str) -> np.ndarray:
+    GFunction.disk_cache = GFunctionSharedCache(folder)
+    return np.array(GFunction().calculate(time_values, borefield, alpha))
+
+
+def test_shared_cache_processes(tmp_path):
+    folder = os.path.join(tmp_path, 'gfunctions')
+    gvalues = _calculate_gvalues(folder)
+    GFunction.disk_cache = None
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        results = pool.map(_calculate_gvalues, [folder] * 2)
+    assert all(np.array_equal(result, gvalues) for result in results)
+    assert len(GFunctionSharedCache(folder)) == 1
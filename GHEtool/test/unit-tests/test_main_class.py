@@ -8,12 +8,14 @@ import pygfunction as gt
 import pytest
 
 from GHEtool import GroundConstantTemperature, GroundFluxTemperature, FluidData, DoubleUTube, Borefield, \
-    CalculationSetup, FOLDER, MultipleUTube, EERCombined
+    CalculationSetup, FOLDER, MultipleUTube, EERCombined, COP, EER
 from GHEtool.logger import ghe_logger
 from GHEtool.Validation.cases import load_case
 from GHEtool.VariableClasses.LoadData import MonthlyGeothermalLoadAbsolute, HourlyGeothermalLoad, HourlyBuildingLoad, \
-    HourlyBuildingLoadMultiYear, MonthlyBuildingLoadAbsolute
+    HourlyBuildingLoadMultiYear, MonthlyBuildingLoadAbsolute, HourlyGeothermalLoadMultiYear
 from GHEtool.VariableClasses.BaseClass import UnsolvableDueToTemperatureGradient
+from GHEtool.VariableClasses import ResultsMonthly, ResultsHourly, borefield_fingerprint
+from GHEtool.VariableClasses.CustomGFunction import _time_values
 
 data = GroundConstantTemperature(3, 10)
 ground_data_constant = data
@@ -110,6 +112,21 @@ def test_set_borefield():
     assert borefield.H == 125
 
 
+def test_borefield_fingerprint():
+    borefield = Borefield()
+    assert borefield.borefield_fingerprint is None
+    borefield.create_rectangular_borefield(10, 10, 6, 6, 100, 1, 0.075)
+    fingerprint = borefield.borefield_fingerprint
+    assert fingerprint == borefield_fingerprint(gt.boreholes.rectangle_field(10, 10, 6, 6, 150, 1, 0.075))
+    # the borehole length is not part of the fingerprint
+    borefield.H = 150
+    assert borefield.borefield_fingerprint == fingerprint
+    borefield.create_rectangular_borefield(10, 10, 6, 5, 100, 1, 0.075)
+    assert borefield.borefield_fingerprint != fingerprint
+    borefield.set_borefield(None)
+    assert borefield.borefield_fingerprint is None
+
+
 def test_tilt():
     borefield = Borefield()
     borefield.set_borefield([
@@ -461,6 +478,78 @@ def test_size_L2(quadrant, result):
     assert np.isclose(result, borefield.H)
 
 
+def test_size_L2_vectorized():
+    Tg = np.array([9, 10, 12])
+    Rb = np.array([0.1, 0.12, 0.15])
+    load_factor = np.array([0.8, 1, 1.2])
+
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield.ground_data = GroundConstantTemperature(3, 10)
+    lengths, quadrants = borefield.size_L2_vectorized(Tg=Tg, Rb=Rb, load_factor=load_factor)
+    assert borefield.H == 110
+    for i in range(3):
+        sample = Borefield()
+        sample.borefield = copy.deepcopy(borefield_gt)
+        sample.load = MonthlyGeothermalLoadAbsolute(*[np.array(load) * load_factor[i] for load in load_case(1)])
+        sample.ground_data = GroundConstantTemperature(3, Tg[i])
+        sample.Rb = Rb[i]
+        # the g-values of the table are calculated at the same times as in size_L2, so the borehole length only
+        # differs due to the interpolation between the borehole lengths of the table
+        assert np.isclose(lengths[i], sample.size_L2(lengths[i], quadrants[i]), rtol=0.0001)
+        # size_L2 itself converges with a relative tolerance of 0.005
+        assert np.isclose(lengths[i], sample.size_L2(100), rtol=0.001)
+        assert quadrants[i] == sample.limiting_quadrant
+
+    # samples are broadcast
+    k_s = np.array([2, 3, 3.5])
+    lengths, quadrants = borefield.size_L2_vectorized(k_s=k_s[:, None], Tg=Tg, quadrant_sizing=1)
+    assert lengths.shape == quadrants.shape == (3, 3)
+    assert np.all(quadrants == 1)
+    assert np.all(np.diff(lengths, axis=0) < 0) and np.all(np.diff(lengths, axis=1) > 0)
+
+    # no solution due to the temperature gradient
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    lengths, _ = borefield.size_L2_vectorized(Tg=[10, 17])
+    assert np.isfinite(lengths[0]) and np.isnan(lengths[1])
+
+
+def test_size_L2_vectorized_conductivity():
+    k_s = np.array([2, 2.5, 3.5])
+    Tg = np.array([9, 10, 12])
+    Rb = np.array([0.1, 0.12, 0.15])
+
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield.ground_data = GroundConstantTemperature(3, 10)
+    lengths, quadrants = borefield.size_L2_vectorized(k_s, Tg, Rb)
+    for i in range(3):
+        sample = Borefield()
+        sample.borefield = copy.deepcopy(borefield_gt)
+        sample.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+        sample.ground_data = GroundConstantTemperature(k_s[i], Tg[i])
+        sample.Rb = Rb[i]
+        # the g-values for another conductivity are interpolated on a finer time grid than the one of size_L2 and
+        # the g-values of pygfunction depend on the time grid
+        assert np.isclose(lengths[i], sample.size_L2(lengths[i], quadrants[i]), rtol=0.01)
+        assert quadrants[i] == sample.limiting_quadrant
+
+
+def test_size_L2_vectorized_value_errors():
+    borefield = Borefield()
+    with pytest.raises(ValueError):
+        borefield.size_L2_vectorized()
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.set_ground_parameters(ground_data_constant)
+    with pytest.raises(ValueError):
+        borefield.size_L2_vectorized(quadrant_sizing=5)
+    borefield.load = HourlyBuildingLoad(np.full(8760, 10), np.full(8760, 10))
+    with pytest.raises(ValueError):
+        borefield.size_L2_vectorized()
+
+
 def test_size_L3_value_errors():
     borefield = Borefield()
     with pytest.raises(ValueError):
@@ -485,6 +574,372 @@ def test_size_L3(quadrant, result):
     assert np.isclose(result, borefield.H)
 
 
+def test_size_L3_other_borefield_before():
+    borefield = Borefield()
+    borefield.set_max_avg_fluid_temperature(18)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.create_rectangular_borefield(6, 6, 6, 6, 100, 4, 0.075)
+    borefield.size_L3(100, quadrant_sizing=1)
+
+    # setting the borefield starts from scratch, so the sizing does not depend on the previous one
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(56.37136629360852, borefield.size_L3(100, quadrant_sizing=1))
+    borefield.create_rectangular_borefield(6, 6, 6, 6, 100, 4, 0.075)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert borefield.gfunction_calculation_object.statistics()['entries'] == 0
+    assert np.isclose(56.37136629360852, borefield.size_L3(100, quadrant_sizing=1))
+
+
+@pytest.mark.parametrize("quadrant, result", zip([1, 2, 3, 4],
+                                                 [56.37136629360852, 71.42698877336204, 26.722846792067735,
+                                                  21.333161686968708]))
+def test_size_L3_windowed(quadrant, result):
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.set_max_avg_fluid_temperature(18)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.calculation_setup(windowed_sizing=True)
+
+    assert np.isclose(result, borefield.size_L3(100, quadrant_sizing=quadrant))
+    assert np.isclose(result, borefield.H)
+    assert len(borefield.results.Tb) == 12 * borefield.simulation_period
+
+
+@pytest.mark.parametrize("quadrant", [3, 4])
+def test_size_L3_secant(quadrant):
+    borefield = Borefield()
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.set_ground_parameters(GroundFluxTemperature(2.5, 10, flux=0.07))
+    borefield.set_min_avg_fluid_temperature(3)
+    borefield.calculation_setup(atol=0.01)
+    length = borefield.size_L3(100, quadrant_sizing=quadrant)
+    nb_of_evaluations = borefield.nb_of_temperature_evaluations
+
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.calculation_setup(sizing_engine='secant')
+    assert np.isclose(length, borefield.size_L3(100, quadrant_sizing=quadrant), rtol=0.001)
+    assert borefield.nb_of_temperature_evaluations < nb_of_evaluations
+
+
+@pytest.mark.parametrize("L2_sizing, L3_sizing, L4_sizing", [(True, False, False), (False, True, False),
+                                                               (False, False, True)])
+@pytest.mark.parametrize("imbalance", [0.5, 2])
+def test_size_parallel_quadrants(L2_sizing, L3_sizing, L4_sizing, imbalance):
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    load.hourly_injection_load = load.hourly_injection_load * imbalance
+    borefield.load = load
+    length = borefield.size(100, L2_sizing=L2_sizing, L3_sizing=L3_sizing, L4_sizing=L4_sizing)
+    limiting_quadrant = borefield.limiting_quadrant
+    results = borefield.results
+
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(length, borefield.size(100, L2_sizing=L2_sizing, L3_sizing=L3_sizing, L4_sizing=L4_sizing,
+                                             parallel_quadrants=True), rtol=0.001)
+    assert borefield.limiting_quadrant == limiting_quadrant
+    if not L2_sizing:
+        assert np.allclose(borefield.results.peak_injection, results.peak_injection, atol=0.01)
+        assert np.allclose(borefield.results.peak_extraction, results.peak_extraction, atol=0.01)
+
+
+def test_size_L4_cascaded():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    length = borefield.size_L4(100)
+    nb_of_evaluations = borefield.nb_of_temperature_evaluations
+
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(length, borefield.size(100, L4_sizing=True, cascaded_sizing=True), rtol=0.001)
+    # the total includes the (monthly) temperature evaluations of the L3 sizing
+    assert borefield.nb_of_cascaded_temperature_evaluations > 0
+    assert borefield.nb_of_temperature_evaluations - borefield.nb_of_cascaded_temperature_evaluations < \
+           nb_of_evaluations
+    assert borefield._cascaded_lengths == {}
+    assert borefield._cascaded_quadrant == 0
+    # the g-functions of the L3 sizing are stored on the time grid of the L4 sizing
+    assert np.array_equal(borefield.gfunction_calculation_object.time_array, _time_values(t_max=load.time_L4[-1]))
+    assert borefield.gfunction_calculation_object.borehole_length_array.size > 1
+
+
+def test_size_L4_cascaded_min_temperature():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    load.hourly_injection_load = load.hourly_injection_load * 0.5
+    borefield.load = load
+    length = borefield.size_L4(100)
+    nb_of_evaluations = borefield.nb_of_temperature_evaluations
+    assert borefield.limiting_quadrant == 4
+
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(length, borefield.size(100, L4_sizing=True, cascaded_sizing=True), rtol=0.001)
+    assert borefield.limiting_quadrant == 4
+    # the L4 sizing only sizes for the minimum temperature, which was limiting in the L3 sizing
+    assert borefield.nb_of_temperature_evaluations - borefield.nb_of_cascaded_temperature_evaluations < \
+           nb_of_evaluations / 2
+
+
+@pytest.mark.parametrize("L3_sizing, L4_sizing", [(True, False), (False, True)])
+@pytest.mark.parametrize("imbalance, quadrant", [(0.5, 4), (2, 1)])
+def test_size_predict_limiting_quadrant(L3_sizing, L4_sizing, imbalance, quadrant):
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    load.hourly_injection_load = load.hourly_injection_load * imbalance
+    borefield.load = load
+    length = borefield.size(100, L3_sizing=L3_sizing, L4_sizing=L4_sizing)
+    nb_of_evaluations = borefield.nb_of_temperature_evaluations
+    assert borefield.limiting_quadrant == quadrant
+    assert borefield._predict_limiting_quadrant() == quadrant
+
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(length, borefield.size(100, L3_sizing=L3_sizing, L4_sizing=L4_sizing,
+                                             predict_limiting_quadrant=True), rtol=0.001)
+    assert borefield.limiting_quadrant == quadrant
+    if quadrant == 4:
+        assert borefield.nb_of_temperature_evaluations < nb_of_evaluations
+    else:
+        assert borefield.nb_of_temperature_evaluations == nb_of_evaluations
+
+
+def test_predict_limiting_quadrant_ambiguous():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_heating=5, efficiency_cooling=20)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    assert borefield._predict_limiting_quadrant() == 0
+
+
+def test_size_sizing_cache():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield.calculation_setup(sizing_cache=True, L3_sizing=True)
+    key = borefield.sizing_hash
+    length = borefield.size_L3(100)
+    # size_L3 does not use the cache
+    assert len(borefield.sizing_cache) == 0
+    assert np.isclose(length, borefield.size(100), rtol=0.001)
+    assert len(borefield.sizing_cache) == 1
+    length = borefield.H
+    borefield.calculate_temperatures(length)
+    results = borefield.results
+
+    # other borefield with the same inputs and its own cache
+    borefield2 = Borefield()
+    borefield2.set_ground_parameters(ground_data_constant)
+    borefield2.borefield = copy.deepcopy(borefield_gt)
+    borefield2.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield2.calculation_setup(sizing_cache=True, L3_sizing=True)
+    assert borefield2.sizing_hash == key
+    assert key not in borefield2.sizing_cache
+    # shared cache
+    borefield2.sizing_cache = borefield.sizing_cache
+    assert np.isclose(length, borefield2.size(100))
+    assert borefield2.nb_of_temperature_evaluations == 1
+    assert borefield2.H == length
+    assert borefield2.limiting_quadrant == borefield.limiting_quadrant
+    # the temperatures are calculated for the stored borehole length
+    # (up to the interpolation of the g-values of the first borefield)
+    assert np.allclose(borefield2.results.Tb, results.Tb, atol=0.05) and borefield2.results is not results
+    assert np.allclose(borefield2.results.peak_injection, results.peak_injection, atol=0.05)
+
+    # other inputs
+    borefield2.set_max_avg_fluid_temperature(17)
+    assert borefield2.sizing_hash != key
+    assert not np.isclose(length, borefield2.size(100))
+    assert len(borefield.sizing_cache) == 2
+    borefield2.set_max_avg_fluid_temperature(16)
+    # options that do not influence the result
+    borefield2.calculation_setup(results_folder='folder', parallel_quadrants=True)
+    assert borefield2.sizing_hash == key
+    borefield2.calculation_setup(atol=0.01)
+    assert borefield2.sizing_hash != key
+    # the borehole length is not an input of the sizing
+    borefield.H = 150
+    assert borefield.sizing_hash == key
+
+    borefield.sizing_cache.invalidate(key)
+    assert key not in borefield.sizing_cache
+    borefield.size(100)
+    assert borefield.nb_of_temperature_evaluations > 1
+
+
+def test_size_sizing_cache_L2():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield.calculation_setup(sizing_cache=True, L2_sizing=True)
+    length = borefield.size(100)
+    limiting_quadrant = borefield.limiting_quadrant
+    borefield.calculate_temperatures(150)
+    results = borefield.results
+
+    assert borefield.size(100) == length
+    assert borefield.limiting_quadrant == limiting_quadrant
+    assert borefield.nb_of_temperature_evaluations == 0
+    # an L2 sizing does not calculate temperatures, so the results are not changed
+    assert borefield.results is results
+    assert borefield.H == length
+
+
+def test_size_sizing_cache_building_load():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_heating=COP(np.array([2.5, 5]), np.array([-5, 15])),
+                              efficiency_cooling=EER(np.array([8, 2]), np.array([5, 40])))
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculation_setup(sizing_cache=True, L3_sizing=True)
+    length = borefield.size(100)
+    borefield.calculate_temperatures(length)
+    results = borefield.results
+    load_results = borefield.load.results
+    extraction = borefield.load.monthly_baseload_extraction_simulation_period
+
+    # other borehole length, so the results of the building load change
+    borefield.calculate_temperatures(150)
+    assert not np.allclose(borefield.load.monthly_baseload_extraction_simulation_period, extraction)
+
+    # the results of the building load are calculated again for the stored borehole length
+    assert borefield.size(100) == length
+    assert borefield.results == results
+    assert borefield.load.results == load_results
+    assert np.allclose(borefield.load.monthly_baseload_extraction_simulation_period, extraction)
+
+
+def test_calculate_length_sensitivities():
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.Rb = 0.12
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        borefield.calculate_length_sensitivities()
+    length = borefield.size_L3()
+    results = borefield.results
+    sensitivities = borefield.calculate_length_sensitivities()
+    assert borefield.H == length
+    assert borefield.results is results
+    assert borefield.ground_data == GroundFluxTemperature(3, 10)
+    assert borefield.borehole.Rb == 0.12
+    # compare with a new sizing
+    borefield.ground_data = GroundFluxTemperature(3.06, 10)
+    assert np.isclose(borefield.size_L3() - length, sensitivities['k_s'] * 0.06, rtol=0.1)
+    borefield.ground_data = GroundFluxTemperature(3, 10.2)
+    assert np.isclose(borefield.size_L3() - length, sensitivities['Tg'] * 0.2, rtol=0.1)
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.Rb = 0.1224
+    assert np.isclose(borefield.size_L3() - length, sensitivities['Rb'] * 0.0024, rtol=0.1)
+    borefield.Rb = 0.12
+    borefield.load = MonthlyGeothermalLoadAbsolute(*[np.array(load) * 1.02 for load in load_case(1)])
+    assert np.isclose(borefield.size_L3() - length, sensitivities['load'] * 0.02, rtol=0.1)
+
+    borefield.load = HourlyBuildingLoad(efficiency_heating=5, efficiency_cooling=20)
+    with pytest.raises(ValueError):
+        borefield.calculate_length_sensitivities()
+
+
+@pytest.mark.parametrize("layout, N_2, result, smaller", [('rectangle', None, (11, 10), (10, 10)),
+                                                         ('rectangle', 4, (26, 4), (25, 4)),
+                                                         ('L', None, (45, 45), (44, 45))])
+def test_size_number_of_boreholes(layout, N_2, result, smaller):
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.Rb = 0.12
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    assert borefield.size_number_of_boreholes(110, layout, 6, N_2=N_2, D=1, r_b=0.075) == result
+    assert borefield.H == 110
+    assert borefield.results.max_peak_injection <= borefield.Tf_max
+    assert borefield.results.min_peak_extraction >= borefield.Tf_min
+    number_of_boreholes = borefield.number_of_boreholes
+
+    # the previous candidate does not satisfy the temperature limits
+    create = {'rectangle': gt.boreholes.rectangle_field, 'L': gt.boreholes.L_shaped_field}[layout]
+    borefield.borefield = create(*smaller, 6, 6, 110, 1, 0.075)
+    assert borefield.number_of_boreholes < number_of_boreholes
+    borefield.calculate_temperatures(110)
+    assert borefield.results.max_peak_injection > borefield.Tf_max or \
+           borefield.results.min_peak_extraction < borefield.Tf_min
+
+
+def test_size_number_of_boreholes_errors():
+    borefield = Borefield()
+    borefield.ground_data = ground_data_constant
+    borefield.Rb = 0.12
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    with pytest.raises(ValueError):
+        borefield.size_number_of_boreholes(110, 'circle')
+    # no borefield to take the buried depth and borehole radius from
+    with pytest.raises(ValueError):
+        borefield.size_number_of_boreholes(110)
+    with pytest.raises(ValueError):
+        borefield.size_number_of_boreholes(110, max_number_of_boreholes=50, D=1, r_b=0.075)
+    assert borefield.borefield is None
+    # the buried depth and borehole radius are used for the candidates
+    assert borefield.size_number_of_boreholes(110, N_2=4, D=2, r_b=0.1) == (24, 4)
+    assert np.isclose(borefield.D, 2) and np.isclose(borefield.r_b, 0.1)
+    del borefield.borefield
+
+    # the original borefield and its g-functions are restored
+    original = copy.deepcopy(borefield_gt)
+    borefield.borefield = original
+    borefield.calculate_temperatures(110)
+    results = borefield.results
+    gvalues = borefield.gfunction_calculation_object.previous_gfunctions
+    with pytest.raises(ValueError):
+        borefield.size_number_of_boreholes(110, max_number_of_boreholes=50)
+    assert borefield.borefield is original
+    assert borefield.borefield_fingerprint == borefield_fingerprint(borefield_gt)
+    assert borefield.H == 110
+    assert borefield.results is results
+    assert np.array_equal(borefield.gfunction_calculation_object.previous_gfunctions, gvalues)
+
+
+def test_size_L4_windowed():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculation_setup(windowed_sizing=True)
+
+    assert np.isclose(182.17317343989652, borefield.size_L4(100, quadrant_sizing=1))
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    assert np.isclose(174.23648328808213, borefield.size_L4(100, quadrant_sizing=4))
+    assert len(borefield.results.Tb) == 8760 * borefield.simulation_period
+
+    # the temperatures in the first and last year are the same as in the full temperature profile
+    for first_year in (True, False):
+        results = borefield._calculate_temperature_window(150, hourly=True, first_year=first_year)
+        borefield.calculate_temperatures(150, hourly=True)
+        window = slice(0, 8760) if first_year else slice(-8760, None)
+        assert np.allclose(results.Tb, borefield.results.Tb[window])
+        assert np.allclose(results.Tf, borefield.results.Tf[window])
+
+
 def test_size_L4_value_errors():
     borefield = Borefield()
     with pytest.raises(ValueError):
@@ -1119,6 +1574,54 @@ def test_deep_sizing(case, result):
     assert np.allclose(result, borefield._size_based_on_temperature_profile(10, deep_sizing=False)[0], rtol=0.01)
 
 
+@pytest.mark.parametrize("case, result", zip((1, 3, 4), [132.4920010915831, 140.25177132242135, 132.4920010915831]))
+def test_bracketed_deep_sizing(case, result):
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.create_rectangular_borefield(10, 5, 7, 7, 100, 0.75)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(case))
+    borefield.calculation_setup(bracketed_deep_sizing=True)
+
+    assert np.allclose(result, borefield._size_deep(hourly=False)[0], rtol=0.01)
+
+
+def test_bracketed_deep_sizing_evaluations():
+    def nb_of_evaluations(bracketed: bool) -> (float, int):
+        borefield = Borefield()
+        borefield.ground_data = GroundFluxTemperature(3, 10)
+        borefield.create_rectangular_borefield(10, 5, 7, 7, 100, 0.75)
+        borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+        borefield.set_max_avg_fluid_temperature(17.7)
+        borefield.calculation_setup(max_nb_of_iterations=100, bracketed_deep_sizing=bracketed)
+        length = borefield._size_deep(hourly=False)[0]
+        return length, borefield.nb_of_temperature_evaluations
+
+    length, evaluations = nb_of_evaluations(False)
+    length_bracketed, evaluations_bracketed = nb_of_evaluations(True)
+    assert np.isclose(length, length_bracketed, rtol=0.01)
+    assert evaluations_bracketed < evaluations
+
+    # the maximum temperature limit cannot be reached for any borehole length
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.create_rectangular_borefield(10, 5, 7, 7, 100, 0.75)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+    borefield.set_max_avg_fluid_temperature(16)
+    borefield.calculation_setup(bracketed_deep_sizing=True)
+    with pytest.raises(UnsolvableDueToTemperatureGradient):
+        borefield._size_deep(hourly=False)
+
+
+def test_bracketed_deep_sizing_L3():
+    borefield = Borefield()
+    borefield.ground_data = GroundFluxTemperature(3, 10)
+    borefield.create_rectangular_borefield(10, 5, 7, 7, 100, 0.75)
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    length = borefield.size_L3()
+    borefield.calculation_setup(force_deep_sizing=True, bracketed_deep_sizing=True)
+    assert np.isclose(borefield.size_L3(), length, rtol=0.01)
+
+
 def test_depreciation_warning():
     with pytest.raises(DeprecationWarning):
         Borefield(baseload_heating=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
@@ -1212,3 +1715,227 @@ def test_with_titled_borefield():
     assert np.isclose(borefield.ground_data.calculate_Tg(borefield.depth, borefield.D), 12.157557845032045)
 
     assert np.isclose(borefield.size_L3(), 111.58488656187147)
+
+
+def test_load_aggregation():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad(simulation_period=20)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(120, hourly=True)
+    results_full = borefield.results
+
+    borefield.calculation_setup(load_aggregation=True)
+    borefield.calculate_temperatures(120, hourly=True)
+    assert np.allclose(borefield.results.Tf, results_full.Tf, atol=0.05)
+    assert np.allclose(borefield.results.Tb, results_full.Tb, atol=0.05)
+    assert not np.array_equal(borefield.results.Tf, results_full.Tf)
+
+    # no aggregation if the near field covers the whole simulation period
+    borefield.calculation_setup(load_aggregation_near_field=240)
+    borefield.calculate_temperatures(120, hourly=True)
+    assert np.allclose(borefield.results.Tf, results_full.Tf)
+
+    borefield.calculation_setup(load_aggregation_near_field=12)
+    assert np.isclose(borefield.size_L4(100, quadrant_sizing=1), 182.17317343989652, rtol=0.001)
+
+
+def test_load_aggregation_long_simulation_period():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad(simulation_period=40)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(120, hourly=True)
+    results_full = borefield.results
+
+    # every hour of the simulation period is compared with the full convolution
+    for near_field in (1, 12, 120):
+        borefield.calculation_setup(load_aggregation=True, load_aggregation_near_field=near_field)
+        borefield.calculate_temperatures(120, hourly=True)
+        assert np.max(np.abs(borefield.results.Tb - results_full.Tb)) < 0.02
+        assert np.max(np.abs(borefield.results.Tf - results_full.Tf)) < 0.02
+
+
+def test_anderson_acceleration():
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(2, 10))
+    borefield.borefield = gt.boreholes.rectangle_field(4, 4, 6, 6, 110, 4, 0.075)
+    load = HourlyBuildingLoad(efficiency_heating=COP(np.array([2.5, 5]), np.array([-5, 15])),
+                              efficiency_cooling=EER(np.array([8, 2]), np.array([5, 40])))
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculation_setup(atol=0.001, max_nb_of_iterations=100)
+
+    # every temperature calculation needs one convolution kernel
+    convolution_kernel = borefield._convolution_kernel
+    nb_of_calculations = []
+    borefield._convolution_kernel = lambda *args, **kwargs: nb_of_calculations.append(1) or \
+                                                             convolution_kernel(*args, **kwargs)
+
+    borefield.calculate_temperatures(110)
+    results = borefield.results
+    nb_of_iterations = borefield.nb_of_iterations_building_load
+    assert nb_of_iterations == len(nb_of_calculations)
+
+    nb_of_calculations.clear()
+    borefield.calculation_setup(anderson_acceleration=True)
+    borefield.calculate_temperatures(110)
+    assert borefield.nb_of_iterations_building_load == len(nb_of_calculations)
+    assert borefield.nb_of_iterations_building_load < nb_of_iterations
+    assert np.allclose(borefield.results.peak_injection, results.peak_injection, atol=0.001)
+    assert np.allclose(borefield.results.peak_extraction, results.peak_extraction, atol=0.001)
+
+    # no iterations for a geothermal load
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    borefield.calculate_temperatures(110)
+    assert borefield.nb_of_iterations_building_load == 0
+
+
+@pytest.mark.parametrize("hourly", [False, True])
+def test_calculate_temperatures_for_lengths(hourly):
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    lengths = [90, 110, 150]
+    results = borefield.calculate_temperatures_for_lengths(lengths, hourly=hourly)
+    assert results.Tb.shape == (3, 8760 * 20 if hourly else 12 * 20)
+    for i, length in enumerate(lengths):
+        borefield.calculate_temperatures(length, hourly=hourly)
+        assert np.allclose(results.Tb[i], borefield.results.Tb)
+        assert np.allclose(results.peak_injection[i], borefield.results.peak_injection)
+        assert np.allclose(results.peak_extraction[i], borefield.results.peak_extraction)
+
+
+def test_calculate_temperatures_for_lengths_building_load():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_cooling=EER(np.array([6, 2]), np.array([5, 30])))
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    results = borefield.calculate_temperatures_for_lengths([100, 120])
+    assert borefield.results == ResultsMonthly()
+    borefield.calculate_temperatures(120)
+    assert np.allclose(results.peak_injection[1], borefield.results.peak_injection)
+    assert np.allclose(results.monthly_extraction[1], borefield.results.monthly_extraction)
+
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        borefield.calculate_temperatures_for_lengths([100, 120], hourly=True)
+
+
+def test_calculate_temperatures_per_year():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad(simulation_period=10)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    load.start_month = 3
+    borefield.load = load
+
+    borefield.calculate_temperatures(150, hourly=True)
+    results = list(borefield.calculate_temperatures_per_year(150))
+    assert len(results) == 10
+    assert np.allclose(np.concatenate([result.Tf for result in results]), borefield.results.Tf, atol=0.01)
+    assert np.allclose(np.concatenate([result.Tb for result in results]), borefield.results.Tb, atol=0.01)
+
+    # multi-year load
+    borefield.load = HourlyGeothermalLoadMultiYear(load.hourly_extraction_load_simulation_period * 2,
+                                                   load.hourly_injection_load_simulation_period)
+    borefield.calculate_temperatures(150, hourly=True)
+    results = list(borefield.calculate_temperatures_per_year(150))
+    assert np.allclose(np.concatenate([result.Tf for result in results]), borefield.results.Tf)
+
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        next(borefield.calculate_temperatures_per_year(150))
+
+
+def test_calculate_temperatures_per_year_building_load():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyBuildingLoad(efficiency_cooling=EER(np.array([6, 2]), np.array([5, 30])), simulation_period=5)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    results = list(borefield.calculate_temperatures_per_year(150))
+    assert borefield.results == ResultsMonthly()
+    borefield.calculate_temperatures(150, hourly=True)
+    assert np.allclose(np.concatenate([result.Tf for result in results]), borefield.results.Tf)
+
+
+def test_results_storage(tmp_path, monkeypatch):
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    borefield.calculate_temperatures(150, hourly=True)
+    results = borefield.results
+
+    borefield.calculation_setup(results_dtype=np.float32, results_memory_map=True, results_folder=str(tmp_path))
+    borefield.calculate_temperatures(150, hourly=True)
+    assert isinstance(borefield.results.Tf, np.memmap)
+    assert borefield.results.Tf.dtype == np.float32
+    assert np.allclose(np.load(borefield.results.Tf.filename, mmap_mode='r'), results.Tf, atol=1e-4)
+    assert np.isclose(borefield.size_L4(100), 182.17317343989652, rtol=1e-4)
+
+    # the storage is only changed once, after the sizing, and on a copy of the results
+    nb_of_changes = []
+    change_storage = ResultsHourly.change_storage
+    monkeypatch.setattr(ResultsHourly, 'change_storage',
+                        lambda self, *args: nb_of_changes.append(1) or change_storage(self, *args))
+    borefield.size(100, L4_sizing=True)
+    assert len(nb_of_changes) == 1
+    assert isinstance(borefield.results.Tf, np.memmap)
+    borefield.calculate_temperatures(hourly=True)
+    assert len(nb_of_changes) == 2
+    # a results object that is set is not changed
+    borefield.results = results
+    assert borefield.results is results and not isinstance(results.Tf, np.memmap)
+
+
+def test_calculate_temperatures_hybrid():
+    borefield = Borefield()
+    borefield.set_ground_parameters(ground_data_constant)
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+
+    borefield.calculate_temperatures(150, hourly=True)
+    results = borefield.calculate_temperatures_hybrid(150, years=[0, 5, 19])
+    assert results.Tf.size == 3 * 8760
+    for i, year in enumerate([0, 5, 19]):
+        assert np.allclose(results.Tf[i * 8760:(i + 1) * 8760], borefield.results.Tf[year * 8760:(year + 1) * 8760],
+                           atol=0.01)
+    # first and last year by default
+    assert np.array_equal(borefield.calculate_temperatures_hybrid(150).Tb[-8760:], results.Tb[-8760:])
+
+    with pytest.raises(ValueError):
+        borefield.calculate_temperatures_hybrid(150, years=[20])
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        borefield.calculate_temperatures_hybrid(150)
+
+    # building load
+    load = HourlyBuildingLoad(efficiency_cooling=EER(np.array([6, 2]), np.array([5, 30])), simulation_period=5)
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield.load = load
+    results = borefield.calculate_temperatures_hybrid(150)
+    borefield.calculate_temperatures(150, hourly=True)
+    assert np.allclose(results.Tf[:8760], borefield.results.Tf[:8760])
+    assert np.allclose(results.Tf[8760:], borefield.results.Tf[-8760:])
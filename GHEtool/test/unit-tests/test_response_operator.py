@@ -0,0 +1,70 @@
+import copy
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield, GroundConstantTemperature, HourlyGeothermalLoad, MonthlyGeothermalLoadAbsolute, \
+    HourlyBuildingLoad, FOLDER
+from GHEtool.Validation.cases import load_case
+
+borefield_gt = gt.boreholes.rectangle_field(10, 12, 6, 6, 110, 4, 0.075)
+
+
+def create_borefield(load):
+    borefield = Borefield()
+    borefield.set_ground_parameters(GroundConstantTemperature(3, 10))
+    borefield.borefield = copy.deepcopy(borefield_gt)
+    borefield.load = load
+    return borefield
+
+
+def test_monthly():
+    borefield = create_borefield(MonthlyGeothermalLoadAbsolute(*load_case(1)))
+    operator = borefield.build_response_operator(120)
+    assert borefield.build_response_operator(120) is operator
+    assert borefield.build_response_operator(130) is not operator
+    operator = borefield.build_response_operator(120)
+    assert operator.matrix.shape == (240, 240)
+    assert np.allclose(np.triu(operator.matrix, 1), 0)
+
+    loads = [MonthlyGeothermalLoadAbsolute(*[np.array(values) * factor for values in load_case(1)])
+             for factor in (0.5, 1, 1.5)]
+    results = operator.calculate(loads)
+    assert results.peak_injection.shape == (3, 240)
+    for i, load in enumerate(loads):
+        borefield.load = load
+        borefield.calculate_temperatures(120)
+        assert np.allclose(results.Tb[i], borefield.results.Tb)
+        assert np.allclose(results.peak_injection[i], borefield.results.peak_injection)
+        assert np.allclose(results.peak_extraction[i], borefield.results.peak_extraction)
+        assert np.allclose(results.monthly_injection[i], borefield.results.monthly_injection)
+        assert np.allclose(results.monthly_extraction[i], borefield.results.monthly_extraction)
+    assert np.allclose(operator.calculate(loads[2]).peak_injection, results.peak_injection[2])
+
+    with pytest.raises(ValueError):
+        operator.calculate(np.zeros(240))
+    with pytest.raises(ValueError):
+        operator.calculate_borehole_wall_temperature(np.zeros(120))
+
+
+def test_hourly():
+    load = HourlyGeothermalLoad()
+    load.load_hourly_profile(FOLDER.joinpath("Examples/hourly_profile.csv"))
+    borefield = create_borefield(load)
+    operator = borefield.build_response_operator(120, hourly=True)
+    borefield.calculate_temperatures(120, hourly=True)
+
+    scenarios = np.array([load.hourly_net_resulting_injection_power * factor for factor in (1, 2)])
+    results = operator.calculate(scenarios)
+    assert results.Tf.shape == (2, 175200)
+    assert np.allclose(results.Tf[0], borefield.results.Tf)
+    assert np.allclose(results.Tb[1] - operator.Tg, 2 * (borefield.results.Tb - operator.Tg))
+    assert np.allclose(operator.calculate(load).Tf, borefield.results.Tf)
+    assert np.allclose(operator.calculate(scenarios[0]).Tb, borefield.results.Tb)
+
+    with pytest.raises(ValueError):
+        operator.calculate(HourlyBuildingLoad(np.ones(8760), np.ones(8760)))
+    borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+    with pytest.raises(ValueError):
+        borefield.build_response_operator(120, hourly=True)
@@ -1,3 +1,7 @@
+import copy
+import gc
+import os
+
 import pytest
 
 import numpy as np
@@ -51,3 +55,84 @@ def test_eq():
     assert monthly1 != hourly1
     assert monthly2 == monthly3
     assert hourly2 == hourly3
+
+
+def test_change_storage(tmp_path):
+    results = ResultsHourly(np.array([1., 2, 3]), np.array([1., 5, 6]))
+    results.change_storage(np.float32)
+    assert results.Tb.dtype == np.float32
+    assert not isinstance(results.Tb, np.memmap)
+    assert results == ResultsHourly(np.array([1., 2, 3], dtype=np.float32), np.array([1., 5, 6], dtype=np.float32))
+
+    results.change_storage(np.float32, True, str(tmp_path))
+    assert isinstance(results.Tf, np.memmap)
+    assert results.Tf.dtype == np.float32
+    path = results.Tf.filename
+    assert np.array_equal(np.load(path, mmap_mode='r'), np.array([1, 5, 6]))
+
+    # copies share the same files
+    results_copy = copy.deepcopy(results)
+    assert results_copy.Tf is results.Tf
+    del results
+    gc.collect()
+    assert os.path.exists(path)
+    del results_copy
+    gc.collect()
+    assert not os.path.exists(path)
+
+    # back to memory
+    results = ResultsMonthly(np.array([1., 2]), np.array([1., 2]), np.array([1., 2]), np.array([1., 2]),
+                             np.array([1., 2]))
+    results.change_storage(np.float64, True, str(tmp_path))
+    results.change_storage()
+    assert not isinstance(results.peak_injection, np.memmap)
+    assert np.array_equal(results.peak_injection, np.array([1., 2]))
+
+
+def test_statistics_monthly():
+    results = ResultsMonthly(np.linspace(0, 23, 24),
+                             np.linspace(0, 23, 24) * 2,
+                             np.linspace(0, 23, 24) * 3,
+                             np.linspace(0, 23, 24) * 4,
+                             np.linspace(0, 23, 24) * 5)
+    assert results.max_peak_injection == 69
+    assert results.min_peak_extraction == 0
+    assert results.argmax_peak_injection == 23
+    assert results.argmin_peak_extraction == 0
+    assert np.array_equal(results.max_peak_injection_per_year, np.array([33, 69]))
+    assert np.array_equal(results.min_peak_extraction_per_year, np.array([0, 24]))
+    assert results.first_violation(-1, 30) == 11
+    assert results.first_violation(-1, 100) is None
+    assert np.array_equal(np.where(results.violations(-1, 60))[0], np.array([21, 22, 23]))
+
+    # statistics are only calculated once
+    assert results.max_peak_injection_per_year is results.max_peak_injection_per_year
+    assert results.violations(-1, 60) is results.violations(-1, 60)
+    assert results == ResultsMonthly(np.linspace(0, 23, 24),
+                                     np.linspace(0, 23, 24) * 2,
+                                     np.linspace(0, 23, 24) * 3,
+                                     np.linspace(0, 23, 24) * 4,
+                                     np.linspace(0, 23, 24) * 5)
+
+
+def test_statistics_hourly():
+    Tf = np.tile(np.sin(np.linspace(0, 2 * np.pi, 8760)), 3) + np.repeat(np.arange(3), 8760)
+    results = ResultsHourly(Tf, Tf)
+    assert np.allclose(results.max_peak_injection_per_year, np.max(Tf.reshape(3, 8760), axis=1))
+    assert np.allclose(results.min_peak_extraction_per_year, np.min(Tf.reshape(3, 8760), axis=1))
+    assert results.argmax_peak_injection == np.argmax(Tf)
+    assert results.first_violation(-0.5, 10) == np.argmax(Tf < -0.5)
+
+    # statistics of 2D results are calculated per row
+    results = ResultsHourly(np.array([Tf, Tf + 1]), np.array([Tf, Tf + 1]))
+    assert np.allclose(results.max_peak_injection, np.array([np.max(Tf), np.max(Tf) + 1]))
+    assert results.max_peak_injection_per_year.shape == (2, 3)
+
+
+def test_statistics_change_storage():
+    results = ResultsHourly(np.array([1., 2, 3]), np.array([1., 5, 6]))
+    assert results.max_peak_injection == 6
+    results.Tf[2] = 7
+    assert results.max_peak_injection == 6
+    results.change_storage()
+    assert results.max_peak_injection == 7
@@ -0,0 +1,77 @@
+import copy
+import pickle
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import Borefield, GroundConstantTemperature, GroundFluxTemperature, MonthlyGeothermalLoadAbsolute
+from GHEtool.Methods import size_many, SizingResult
+from GHEtool.Validation.cases import load_case
+from GHEtool.VariableClasses import GFunction
+from GHEtool.VariableClasses.BaseClass import UnsolvableDueToTemperatureGradient, MaximumNumberOfIterations
+
+
+def borefields() -> list:
+    result = []
+    for Tg in (10, 12):
+        borefield = Borefield()
+        borefield.ground_data = GroundConstantTemperature(3, Tg)
+        borefield.Rb = 0.12
+        borefield.load = MonthlyGeothermalLoadAbsolute(*load_case(1))
+        borefield.borefield = gt.boreholes.rectangle_field(6, 6, 6, 6, 110, 1, 0.075)
+        result.append(borefield)
+    borefield = copy.deepcopy(result[0])
+    borefield.ground_data = GroundFluxTemperature(1, 10, flux=0.2)
+    result.append(borefield)
+    return result
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_size_many(workers):
+    results = size_many(borefields(), 'L3', workers=workers)
+    assert len(results) == 3
+    for borefield, result in zip(borefields()[:2], results[:2]):
+        assert result.success
+        assert np.isclose(borefield.size_L3(), result.length)
+        assert borefield.limiting_quadrant == result.limiting_quadrant
+        assert result.time > 0
+    assert not results[2].success
+    assert isinstance(results[2].error, UnsolvableDueToTemperatureGradient)
+    assert results[2].length is None
+
+
+def test_size_many_order(tmp_path):
+    # the results do not depend on which sizings are done in the same process
+    def lengths(order, workers, cache_folder=None):
+        fields = borefields()[:2]
+        fields[1].ground_data = GroundConstantTemperature(3, 10)
+        fields[1].load = MonthlyGeothermalLoadAbsolute(*load_case(2))
+        return [result.length for result in size_many([fields[i] for i in order], 'L3', workers, cache_folder)]
+
+    expected = lengths([0, 1], 1, tmp_path)
+    assert len(list(tmp_path.iterdir())) > 0
+    assert lengths([1, 0], 1) == expected[::-1]
+    assert lengths([0, 1], 2, tmp_path) == expected
+    assert lengths([1, 0], 2) == expected[::-1]
+    assert lengths([0], 1) == expected[:1]
+    assert GFunction.disk_cache is None
+
+
+def test_size_many_errors():
+    with pytest.raises(ValueError):
+        size_many(borefields(), 'L5')
+    assert size_many([], workers=2) == []
+
+
+def test_pickle_errors():
+    error = pickle.loads(pickle.dumps(UnsolvableDueToTemperatureGradient()))
+    assert str(error) == str(UnsolvableDueToTemperatureGradient())
+    error = pickle.loads(pickle.dumps(MaximumNumberOfIterations(40)))
+    assert str(error) == str(MaximumNumberOfIterations(40))
+
+
+def test_sizing_result():
+    assert SizingResult(100, 1, 0.5).success
+    assert not SizingResult(error=ValueError()).success
+    assert 'failed' in repr(SizingResult(error=ValueError()))
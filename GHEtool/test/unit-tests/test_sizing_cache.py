@@ -0,0 +1,108 @@
+import copy
+import os
+
+import numpy as np
+import pygfunction as gt
+import pytest
+
+from GHEtool import GroundConstantTemperature, GroundFluxTemperature, MonthlyGeothermalLoadAbsolute, CalculationSetup
+from GHEtool.VariableClasses import SizingCache, stable_hash, ResultsMonthly, ResultsHourly
+
+
+def test_stable_hash():
+    ground_data = GroundFluxTemperature(3, 10)
+    assert stable_hash(ground_data) == stable_hash(copy.deepcopy(ground_data))
+    assert stable_hash(ground_data) != stable_hash(GroundFluxTemperature(3, 10, flux=0.07))
+    assert stable_hash(ground_data) != stable_hash(GroundConstantTemperature(3, 10))
+    assert stable_hash(np.arange(3)) == stable_hash(np.arange(3))
+    assert stable_hash(np.arange(3)) != stable_hash(np.arange(3.))
+    assert stable_hash(100) == stable_hash(100.) == stable_hash(np.float64(100))
+    assert stable_hash(1) != stable_hash(True)
+    assert stable_hash([1, 2]) != stable_hash((1, 2))
+    assert stable_hash({'a': 1, 'b': 2}) == stable_hash({'b': 2, 'a': 1})
+    assert stable_hash(lambda x: x) != stable_hash(lambda x: 2 * x)
+    # hash is the same in every session
+    assert stable_hash(1.5, 'a') == '62c649c34c72bd540236f29e1ba44bd645f9f26ebb1ff8204b2d001e36b51a5d'
+
+
+def test_stable_hash_objects():
+    load = MonthlyGeothermalLoadAbsolute(*[np.full(12, 1000.)] * 4)
+    load2 = copy.deepcopy(load)
+    assert stable_hash(load) == stable_hash(load2)
+    load2.peak_extraction_duration = 8
+    assert stable_hash(load) != stable_hash(load2)
+    # the backup of the calculation setup is not taken into account
+    setup = CalculationSetup()
+    key = stable_hash(setup)
+    setup.make_backup()
+    assert stable_hash(setup) == key
+    setup.update_variables(atol=0.01)
+    assert stable_hash(setup) != key
+    # geometry
+    field = gt.boreholes.rectangle_field(2, 2, 6, 6, 110, 1, 0.075)
+    assert stable_hash(field) == stable_hash(gt.boreholes.rectangle_field(2, 2, 6, 6, 110, 1, 0.075))
+    assert stable_hash(field) != stable_hash(gt.boreholes.rectangle_field(2, 2, 6, 7, 110, 1, 0.075))
+
+
+def test_sizing_cache_memory():
+    cache = SizingCache(2)
+    cache.add('a', 1)
+    cache.add('b', 2)
+    assert cache.get('a') == 1
+    # b is the least recently used
+    cache.add('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert 'a' in cache and 'c' in cache
+    cache.invalidate('a')
+    assert cache.get('a') is None
+    cache.invalidate('d')
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sizing_cache_disk(tmp_path):
+    folder = os.path.join(tmp_path, 'cache')
+    cache = SizingCache(1, folder)
+    cache.add('a', (100., 1))
+    cache.add('b', (110., 2))
+    assert len(cache) == 1
+    assert 'a' in cache
+    # a is read from disk
+    assert cache.get('a') == (100., 1)
+    assert cache.get('b') == (110., 2)
+    # other cache with the same folder
+    assert SizingCache(folder=folder).get('a') == (100., 1)
+    cache.invalidate('a')
+    assert SizingCache(folder=folder).get('a') is None
+    assert SizingCache(folder=folder).get('b') == (110., 2)
+    cache.clear()
+    assert SizingCache(folder=folder).get('b') is None
+    assert os.listdir(folder) == []
+    # corrupt file
+    with open(os.path.join(folder, 'c' + SizingCache.FILE_EXTENSION), 'w') as file:
+        file.write('no numpy file')
+    assert cache.get('c') is None
+
+
+def test_sizing_cache_disk_results(tmp_path):
+    folder = os.path.join(tmp_path, 'cache')
+    cache = SizingCache(folder=folder)
+    monthly = ResultsMonthly(*[np.arange(240.) + i for i in range(5)])
+    hourly = ResultsHourly(np.arange(8760.), np.arange(8760.) + 1)
+    cache.add('a', (100., 2, monthly))
+    cache.add('b', (110., 3, hourly))
+    length, limiting_quadrant, results = SizingCache(folder=folder).get('a')
+    assert length == 100. and limiting_quadrant == 2
+    assert isinstance(limiting_quadrant, int)
+    assert isinstance(results, ResultsMonthly) and results == monthly
+    length, limiting_quadrant, results = SizingCache(folder=folder).get('b')
+    assert isinstance(results, ResultsHourly) and results == hourly
+    # only numbers and results can be stored on disk
+    with pytest.raises(ValueError):
+        cache.add('c', (100., [1, 2]))
+    assert 'c' not in cache
+    # files with pickled objects are not loaded
+    with open(os.path.join(folder, 'd' + SizingCache.FILE_EXTENSION), 'wb') as file:
+        np.savez(file, length=np.array(1), **{'0_type': np.array('number'), '0_value': np.array([{}], dtype=object)})
+    assert cache.get('d') is None